@@ -0,0 +1,92 @@
+"""
+API-Client: Ein prozessweiter OpenAI-Client fuer einen ganzen Lauf.
+Alle Artikel, Worker-Threads und Hilfsbefehle teilen sich denselben
+HTTP-Verbindungspool (Keep-Alive, kein neuer TLS-Handshake pro Artikel).
+
+Die Factory ist austauschbar: set_client_factory() setzt z.B. einen Client,
+der auf einen lokalen Fake-Endpunkt zeigt.
+"""
+
+import threading
+
+import httpx
+from openai import OpenAI
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_KEEPALIVE_SECONDS = 30
+DEFAULT_TIMEOUT_SECONDS = 120
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10
+
+_lock = threading.Lock()
+_client = None
+_client_key = None
+_factory = None
+
+
+def _settings(config):
+    """Die Client-Einstellungen aus config.json (openai.*) mit Standardwerten."""
+    openai_cfg = config["openai"]
+    return (
+        openai_cfg["api_key"],
+        openai_cfg.get("base_url"),
+        openai_cfg.get("pool_size", DEFAULT_POOL_SIZE),
+        openai_cfg.get("keepalive_seconds", DEFAULT_KEEPALIVE_SECONDS),
+        openai_cfg.get("timeout_seconds", DEFAULT_TIMEOUT_SECONDS),
+        openai_cfg.get("connect_timeout_seconds", DEFAULT_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def default_client_factory(config):
+    """Baut einen OpenAI-Client mit eigenem, konfigurierbarem Verbindungspool."""
+    api_key, base_url, pool_size, keepalive, timeout, connect_timeout = _settings(config)
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=keepalive,
+        ),
+        timeout=httpx.Timeout(timeout, connect=connect_timeout),
+    )
+    # Wiederholungen macht retry_policy - das SDK soll nicht zusaetzlich warten
+    return OpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+
+
+def set_client_factory(factory):
+    """
+    Ersetzt die Factory (factory(config) -> Client), z.B. fuer Tests gegen
+    einen lokalen Endpunkt. None stellt die Standard-Factory wieder her.
+    """
+    global _factory
+    with _lock:
+        _factory = factory
+    reset_client()
+
+
+def get_client(config):
+    """
+    Der gemeinsame Client fuer diesen Prozess. Wird beim ersten Aufruf erzeugt
+    und erst neu gebaut, wenn sich die Einstellungen in config.json aendern.
+    """
+    global _client, _client_key
+    key = _settings(config)
+    with _lock:
+        if _client is None or _client_key != key:
+            _close(_client)
+            _client = (_factory or default_client_factory)(config)
+            _client_key = key
+        return _client
+
+
+def reset_client():
+    """Schliesst den gemeinsamen Client (naechster get_client() baut neu)."""
+    global _client, _client_key
+    with _lock:
+        _close(_client)
+        _client = None
+        _client_key = None
+
+
+def _close(client):
+    close = getattr(client, "close", None)
+    if close is not None:
+        close()
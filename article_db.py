@@ -0,0 +1,190 @@
+"""
+Artikel-Datenbank: Gepackte Ablage aller Artikel in einer SQLite-Datei.
+Die Metadaten liegen in einer indizierten Tabelle, die HTML-Inhalte in einer
+eigenen Tabelle und werden nur geladen, wenn sie wirklich gebraucht werden.
+
+Sobald articles.db existiert, lesen und schreiben Build und Generator nur
+noch dort. Import/Export verbindet die Datenbank mit dem JSON-Layout in
+articles/ (ein Artikel pro Datei).
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+DB_PATH = PROJECT_DIR / "articles.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id       INTEGER PRIMARY KEY,
+    file     TEXT NOT NULL UNIQUE,
+    slug     TEXT,
+    title    TEXT NOT NULL,
+    date     TEXT,
+    category TEXT,
+    tags     TEXT,
+    teaser   TEXT,
+    hash     TEXT NOT NULL,
+    data     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_slug ON articles(slug);
+CREATE INDEX IF NOT EXISTS idx_articles_category ON articles(category);
+CREATE TABLE IF NOT EXISTS bodies (
+    id           INTEGER PRIMARY KEY REFERENCES articles(id) ON DELETE CASCADE,
+    html_content TEXT NOT NULL
+);
+"""
+
+
+def db_enabled(path=None):
+    """True, wenn die gepackte Ablage aktiv ist (articles.db existiert)."""
+    return Path(path or DB_PATH).exists()
+
+
+def content_hash(article):
+    """Stabiler Hash ueber den kompletten Artikel."""
+    data = json.dumps(article, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def article_filename(article):
+    """Dateiname eines Artikels im JSON-Layout: <datum>_<slug>.json"""
+    slug = article.get("meta", {}).get("slug", "artikel")
+    return f"{article.get('date', '')}_{slug}.json"
+
+
+def _row_to_article(row):
+    article = json.loads(row["data"])
+    article["html_content"] = row["html_content"]
+    return article
+
+
+class ArticleDB:
+    """Zugriff auf die SQLite-Artikelablage. Als Context-Manager verwenden."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or DB_PATH)
+        self.conn = sqlite3.connect(str(self.path), timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def save(self, article, filename=None):
+        """Speichert (oder ersetzt) einen Artikel. Gibt den Dateinamen zurueck."""
+        filename = filename or article_filename(article)
+        meta = article.get("meta", {})
+        # Der Inhalt steht in bodies; der Platzhalter erhaelt die Feldreihenfolge
+        data = dict(article, html_content=None)
+        with self.conn:
+            self.conn.execute(
+                """INSERT INTO articles (file, slug, title, date, category, tags, teaser, hash, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(file) DO UPDATE SET
+                       slug=excluded.slug, title=excluded.title, date=excluded.date,
+                       category=excluded.category, tags=excluded.tags, teaser=excluded.teaser,
+                       hash=excluded.hash, data=excluded.data""",
+                (
+                    filename,
+                    meta.get("slug", ""),
+                    article.get("title", ""),
+                    article.get("date", ""),
+                    article.get("category", "Allgemein"),
+                    json.dumps(article.get("tags", []), ensure_ascii=False),
+                    meta.get("teaser", meta.get("meta_description", "")),
+                    content_hash(article),
+                    json.dumps(data, ensure_ascii=False),
+                ),
+            )
+            article_id = self.conn.execute(
+                "SELECT id FROM articles WHERE file = ?", (filename,)
+            ).fetchone()[0]
+            self.conn.execute(
+                "INSERT OR REPLACE INTO bodies (id, html_content) VALUES (?, ?)",
+                (article_id, article.get("html_content", "")),
+            )
+        return filename
+
+    def delete(self, filename):
+        with self.conn:
+            self.conn.execute("DELETE FROM articles WHERE file = ?", (filename,))
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def list_meta(self):
+        """Alle Artikel ohne html_content, neueste zuerst (wie load_all_articles)."""
+        rows = self.conn.execute(
+            "SELECT file, hash, data FROM articles ORDER BY file DESC"
+        )
+        entries = []
+        for row in rows:
+            entry = json.loads(row["data"])
+            entry.pop("html_content", None)
+            entry["file"] = row["file"]
+            entry["hash"] = row["hash"]
+            entries.append(entry)
+        return entries
+
+    def get(self, filename):
+        """Laedt einen kompletten Artikel inklusive HTML-Inhalt."""
+        row = self.conn.execute(
+            """SELECT a.data, b.html_content FROM articles a
+               JOIN bodies b ON b.id = a.id WHERE a.file = ?""",
+            (filename,),
+        ).fetchone()
+        if row is None:
+            return None
+        return _row_to_article(row)
+
+    def iter_articles(self):
+        """Liefert alle kompletten Artikel nacheinander, neueste zuerst."""
+        rows = self.conn.execute(
+            """SELECT a.data, b.html_content FROM articles a
+               JOIN bodies b ON b.id = a.id ORDER BY a.file DESC"""
+        )
+        for row in rows:
+            yield _row_to_article(row)
+
+
+def import_json(articles_dir, path=None):
+    """Uebernimmt alle articles/*.json in die Datenbank. Gibt die Anzahl zurueck."""
+    count = 0
+    with ArticleDB(path) as db:
+        for json_file in sorted(Path(articles_dir).glob("*.json")):
+            if json_file.name.startswith("."):
+                continue
+            try:
+                with open(json_file, "r", encoding="utf-8") as f:
+                    article = json.load(f)
+            except Exception as e:
+                print(f"  Warnung: Konnte {json_file.name} nicht laden: {e}")
+                continue
+            db.save(article, json_file.name)
+            count += 1
+    return count
+
+
+def export_json(articles_dir, path=None):
+    """Schreibt alle Artikel der Datenbank als einzelne JSON-Dateien zurueck."""
+    articles_dir = Path(articles_dir)
+    articles_dir.mkdir(exist_ok=True)
+    count = 0
+    with ArticleDB(path) as db:
+        for entry in db.list_meta():
+            article = db.get(entry["file"])
+            with open(articles_dir / entry["file"], "w", encoding="utf-8") as f:
+                json.dump(article, f, indent=2, ensure_ascii=False)
+            count += 1
+    return count
@@ -0,0 +1,268 @@
+"""
+Batch-Generierung: Schreibt die Artikel- und Meta-Anfragen fuer viele Themen
+als JSONL-Datei im Format der OpenAI Batch API, verfolgt den Batch-Job und
+uebernimmt die Ergebnisse spaeter mit derselben Nachbearbeitung wie
+generate_article().
+
+Jeder Job liegt in batches/<job-id>/:
+  input.jsonl   - die Anfragen (eine pro Zeile, custom_id = <thema>-article/-meta)
+  output.jsonl  - die Ergebnisse (von OpenAI oder vom lokalen Stand-in)
+  job.json      - Status, Themen und bereits uebernommene Artikel
+"""
+
+import json
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from content_generator import (
+    META_MARKER,
+    _article_request,
+    _assemble_article,
+    _meta_request,
+    _parse_meta,
+)
+from response_cache import completion_from_dict, completion_to_dict
+from usage_ledger import BATCH_PRICE_FACTOR, UsageMeter, record_usage
+
+PROJECT_DIR = Path(__file__).parent
+BATCHES_DIR = PROJECT_DIR / "batches"
+# Wird bei jedem save_job() neu geschrieben - PendingTitles erkennt daran Aenderungen
+STAMP_FILE = ".stamp"
+ENDPOINT = "/v1/chat/completions"
+
+# Status, in denen die Themen eines Jobs noch nicht uebernommen sind
+PENDING_STATES = ("prepared", "submitted", "completed")
+
+
+# ============================================================
+# Job-Verwaltung
+# ============================================================
+
+def _job_dir(job_id):
+    return BATCHES_DIR / job_id
+
+
+def save_job(job):
+    path = _job_dir(job["id"]) / "job.json"
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+    with open(BATCHES_DIR / STAMP_FILE, "w", encoding="utf-8") as f:
+        f.write(uuid.uuid4().hex)
+
+
+def load_job(job_id):
+    with open(_job_dir(job_id) / "job.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_jobs():
+    """Alle Batch-Jobs, aelteste zuerst."""
+    if not BATCHES_DIR.exists():
+        return []
+    return [load_job(p.parent.name) for p in sorted(BATCHES_DIR.glob("*/job.json"))]
+
+
+def pending_titles():
+    """Titel aller Themen, die in einem noch offenen Batch stecken."""
+    titles = set()
+    for job in list_jobs():
+        if job["status"] in PENDING_STATES:
+            titles.update(
+                topic["title"] for key, topic in job["topics"].items()
+                if key not in job["ingested"]
+            )
+    return titles
+
+
+class PendingTitles:
+    """
+    pending_titles() mit Zwischenspeicher fuer die Themenauswahl: Die
+    Job-Ordner werden nur neu gelesen, wenn sich die Stempeldatei seit dem
+    letzten Aufruf geaendert hat (auch durch andere Prozesse).
+    """
+
+    def __init__(self):
+        self._stamp = object()
+        self._titles = set()
+
+    def refresh(self):
+        try:
+            stamp = (BATCHES_DIR / STAMP_FILE).read_text(encoding="utf-8")
+        except OSError:
+            stamp = None
+        if stamp != self._stamp:
+            # Stempel vor dem Lesen merken - eine Aenderung waehrenddessen faellt beim naechsten Mal auf
+            self._stamp = stamp
+            self._titles = pending_titles()
+
+    def __contains__(self, title):
+        return title in self._titles
+
+    def __len__(self):
+        return len(self._titles)
+
+
+# ============================================================
+# Vorbereiten, Einreichen, Abholen
+# ============================================================
+
+def prepare_batch(topics, config):
+    """Schreibt input.jsonl fuer die Themen und legt den Job an."""
+    job_id = datetime.now().strftime("batch-%Y%m%d-%H%M%S-%f")
+    _job_dir(job_id).mkdir(parents=True)
+    combined = config["openai"].get("meta_mode", "parallel") == "combined"
+
+    job = {
+        "id": job_id,
+        "created": datetime.now().isoformat(),
+        "status": "prepared",
+        "remote_id": None,
+        "combined": combined,
+        "topics": {},
+        "ingested": [],
+    }
+    with open(_job_dir(job_id) / "input.jsonl", "w", encoding="utf-8") as f:
+        for number, topic in enumerate(topics):
+            key = f"{number:04d}"
+            job["topics"][key] = topic
+            requests = [("article", _article_request(topic, config, combined=combined))]
+            if not combined:
+                requests.append(("meta", _meta_request(topic, config)))
+            for kind, body in requests:
+                line = {"custom_id": f"{key}-{kind}", "method": "POST", "url": ENDPOINT, "body": body}
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+    save_job(job)
+    return job
+
+
+def submit_batch(job, client):
+    """Laedt input.jsonl hoch und startet den Batch bei OpenAI."""
+    with open(_job_dir(job["id"]) / "input.jsonl", "rb") as f:
+        uploaded = client.files.create(file=f, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=ENDPOINT,
+        completion_window="24h",
+    )
+    job["remote_id"] = batch.id
+    job["status"] = "submitted"
+    save_job(job)
+    return job
+
+
+def refresh_batch(job, client):
+    """
+    Fragt den Status eines eingereichten Batches ab und laedt bei Erfolg
+    die Ergebnisdatei nach output.jsonl. Gibt den Remote-Status zurueck.
+    """
+    batch = client.batches.retrieve(job["remote_id"])
+    if batch.status == "completed" and batch.output_file_id:
+        content = client.files.content(batch.output_file_id)
+        (_job_dir(job["id"]) / "output.jsonl").write_bytes(content.content)
+        job["status"] = "completed"
+        save_job(job)
+    elif batch.status in ("failed", "expired", "cancelled"):
+        job["status"] = batch.status
+        save_job(job)
+    return batch.status
+
+
+def run_local_batch(input_path, output_path, client):
+    """
+    Lokaler Stand-in fuer die Batch API: arbeitet input.jsonl Zeile fuer Zeile
+    mit einem Chat-Completions-Client ab (echt oder Fake) und schreibt die
+    Ergebnisse im Format der Batch-Ausgabedatei.
+    """
+    with open(input_path, "r", encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as dst:
+        for number, line in enumerate(src):
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            result = {"id": f"batch_req_{number:06d}", "custom_id": request["custom_id"], "response": None, "error": None}
+            try:
+                response = client.chat.completions.create(**request["body"])
+                result["response"] = {"status_code": 200, "body": completion_to_dict(response)}
+            except Exception as e:
+                result["error"] = {"code": type(e).__name__, "message": str(e)}
+            dst.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+
+def run_local(job, client):
+    """Fuehrt einen vorbereiteten Job mit dem lokalen Stand-in aus."""
+    job_dir = _job_dir(job["id"])
+    run_local_batch(job_dir / "input.jsonl", job_dir / "output.jsonl", client)
+    job["status"] = "completed"
+    save_job(job)
+    return job
+
+
+# ============================================================
+# Ergebnisse uebernehmen
+# ============================================================
+
+def _read_results(output_path):
+    """Liest output.jsonl -> {custom_id: antwort-body}; fehlerhafte Zeilen fehlen."""
+    results = {}
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                continue
+            results[entry["custom_id"]] = response["body"]
+    return results
+
+
+def _text(body):
+    return body["choices"][0]["message"]["content"]
+
+
+def ingest_results(job, save_article, mark_used, config=None):
+    """
+    Uebernimmt alle fertigen Artikel eines Jobs: gleiche Nachbearbeitung wie
+    generate_article(), dann save_article() und mark_used(titel).
+    Der usage-Block der Ergebnisse wird zum Batch-Preis im Artikel ("usage")
+    und in usage_ledger.jsonl verbucht.
+    Bereits uebernommene Themen werden uebersprungen (wiederholbar); Themen
+    ohne Ergebnis werden als fehlgeschlagen vermerkt und wieder freigegeben.
+    Gibt (uebernommen, fehlgeschlagen) zurueck.
+    """
+    results = _read_results(_job_dir(job["id"]) / "output.jsonl")
+    ingested = 0
+    job["failed"] = []
+    for key, topic in job["topics"].items():
+        if key in job["ingested"]:
+            continue
+        body = results.get(f"{key}-article")
+        if body is None:
+            job["failed"].append(key)
+            continue
+        meta_body = results.get(f"{key}-meta")
+        if job["combined"]:
+            html_content, _, meta_text = _text(body).strip().partition(META_MARKER)
+        else:
+            html_content, meta_text = _text(body), _text(meta_body) if meta_body else ""
+
+        meter = UsageMeter(config or {}, price_factor=BATCH_PRICE_FACTOR)
+        model = body.get("model")
+        for result in (body, meta_body):
+            if result is not None:
+                meter.add(completion_from_dict(result), result.get("model"))
+        article = _assemble_article(topic, html_content, _parse_meta(meta_text, topic))
+        article["usage"] = meter.totals()
+        save_article(article)
+        record_usage("batch", topic["title"], article["usage"], model)
+        mark_used(topic["title"])
+        job["ingested"].append(key)
+        save_job(job)
+        ingested += 1
+
+    job["status"] = "ingested"
+    save_job(job)
+    return ingested, len(job["failed"])
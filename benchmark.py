@@ -0,0 +1,364 @@
+"""
+Benchmark fuer den Website-Build mit kuenstlichem Artikelbestand.
+
+Erzeugt (einmalig, dann aus .cache/benchmark/) synthetische Artikel im
+Format von content_generator._assemble_article - realistische Textlaengen,
+Kategorien, Tags und Meta-Daten - und misst build_site() fuer jede Groesse
+in einem eigenen Prozess:
+
+  cold         erster Build (Metadaten-Index und Seiten neu)
+  warm         kompletter Build mit vorhandenem Index
+  incremental  inkrementeller Build ohne Aenderungen
+
+Je Durchlauf werden die Phasen (Laden, Planen, Rendern, Aufraeumen), die
+Seitenarten (Artikel, Startseite, Kategorien, Sitemap, Assets) und der
+Spitzen-Speicher (RSS) als JSON geschrieben. Laeuft komplett offline, ohne
+OpenAI-Key; articles/ und site/ bleiben unberuehrt.
+
+  python benchmark.py                          # 100, 1000, 10000, 100000 Artikel
+  python benchmark.py --sizes 100,1000 --jobs 0
+  python benchmark.py --compare alt.json       # Mit frueherem Ergebnis vergleichen
+
+Hinweis: 100000 Artikel brauchen etwa 3 GB Plattenplatz (Artikel + Seiten).
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+BENCH_DIR = PROJECT_DIR / ".cache" / "benchmark"
+RESULTS_DIR = BENCH_DIR / "results"
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+MODES = ("cold", "warm", "incremental")
+DEFAULT_SEED = 42
+CORPUS_VERSION = 1
+
+# Gewichtung wie im echten Bestand: ueberwiegend Whisky und Reise
+CATEGORY_WEIGHTS = {"Whisky": 5, "Reise": 3, "Lifestyle": 1, "Natur": 1, "Urlaub": 1}
+TYPES = ("guide", "article", "review", "list", "travel")
+
+PLACES = [
+    "Islay", "Speyside", "Highlands", "Lowlands", "Campbeltown", "Orkney", "Skye",
+    "Mull", "Jura", "Arran", "Edinburgh", "Glasgow", "Inverness", "Aberdeen",
+    "Fort William", "Oban", "Pitlochry", "Dufftown", "Loch Ness", "Glencoe",
+]
+SUBJECTS = [
+    "Destillerien", "Single Malts", "Torfige Whiskys", "Sherry-Fass-Reifung",
+    "Wanderwege", "Roadtrip", "Wohnmobil-Tour", "Faehrverbindungen", "Pubs",
+    "Whisky-Festivals", "Fotospots", "Unterkuenfte", "Tasting-Notizen",
+    "Fassstaerke", "Blends", "Geheimtipps", "Kuestenwege", "Schloesser",
+]
+TITLE_PATTERNS = [
+    "Die besten {subject} in {place}",
+    "{place}: {subject} fuer Einsteiger",
+    "{subject} rund um {place} - ein Guide",
+    "Unterwegs in {place}: {subject} entdecken",
+    "{place} im Herbst: {subject} und mehr",
+]
+TAG_POOL = [
+    "Islay", "Speyside", "Single Malt", "Schottland", "Torf", "Sherry", "Bourbon-Fass",
+    "Roadtrip", "Wandern", "Highlands", "Reisetipps", "Genuss", "Tasting", "Destillerie",
+    "Natur", "Kueste", "Familie", "Budget", "Luxus", "Winter", "Sommer", "Fotografie",
+    "Geschichte", "Kultur", "Essen", "Hotels", "Camping", "Faehre", "Insel", "Festival",
+]
+WORDS = (
+    "Whisky Destillerie Fass Reifung Torf Rauch Malz Gerste Quellwasser Brennblase "
+    "Aroma Abgang Nase Gaumen Vanille Honig Karamell Trockenfruechte Meersalz Jod "
+    "Landschaft Kueste Hochland Insel Faehre Strasse Dorf Hafen Nebel Heide Moor "
+    "Besuch Fuehrung Verkostung Tasting Abfuellung Jahrgang Fassstaerke Sherry "
+    "Bourbon Eiche Lagerhaus Tradition Handwerk Familie Geschichte Region Reise "
+    "die der das und mit einem einer nicht auch sehr besonders wirklich vielleicht "
+    "immer oft gerne direkt kurz lange dort hier heute morgen frueh spaet ruhig "
+    "ist sind wird werden hat haben kann koennen sollte bietet zeigt liegt fuehrt"
+).split()
+
+PARAGRAPH_POOL = 400
+
+
+# ============================================================
+# Synthetischer Artikelbestand
+# ============================================================
+
+def _slugify(text):
+    text = text.lower()
+    for src, dst in (("ä", "ae"), ("ö", "oe"), ("ü", "ue"), ("ß", "ss")):
+        text = text.replace(src, dst)
+    return re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+
+
+def _sentence(rng):
+    words = rng.choices(WORDS, k=rng.randint(8, 22))
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraphs(rng):
+    """Ein fester Vorrat an Absaetzen - Artikel werden daraus zusammengesetzt."""
+    return [
+        " ".join(_sentence(rng) for _ in range(rng.randint(3, 7)))
+        for _ in range(PARAGRAPH_POOL)
+    ]
+
+
+def _html_content(rng, title, pool, words_target):
+    """HTML wie von der API: h2-Abschnitte mit Absaetzen, ab und zu eine Liste."""
+    parts = [f"<h2>{title}</h2>"]
+    words = 0
+    section = 1
+    while words < words_target:
+        parts.append(f"<h2>Abschnitt {section}: {rng.choice(SUBJECTS)} in {rng.choice(PLACES)}</h2>")
+        for _ in range(rng.randint(2, 4)):
+            paragraph = pool[rng.randrange(len(pool))]
+            parts.append(f"<p>{paragraph}</p>")
+            words += paragraph.count(" ") + 1
+        if rng.random() < 0.3:
+            items = "".join(f"<li>{rng.choice(SUBJECTS)}: {_sentence(rng)}</li>" for _ in range(rng.randint(3, 6)))
+            parts.append(f"<ul>{items}</ul>")
+        section += 1
+    return "\n\n".join(parts)
+
+
+def synthetic_article(rng, number, pool, start=date(2020, 1, 1)):
+    """Ein Artikel-Dict im gespeicherten Format; `number` macht Titel und Slug eindeutig."""
+    categories = list(CATEGORY_WEIGHTS)
+    category = rng.choices(categories, weights=list(CATEGORY_WEIGHTS.values()))[0]
+    place, subject = rng.choice(PLACES), rng.choice(SUBJECTS)
+    title = rng.choice(TITLE_PATTERNS).format(place=place, subject=subject) + f" ({number})"
+    tags = sorted(set(rng.sample(TAG_POOL, rng.randint(3, 6)) + [place]))
+    day = start + timedelta(days=number // 3)
+    summary = " ".join(rng.choices(WORDS, k=24))
+    return {
+        "title": title,
+        "html_content": _html_content(rng, title, pool, rng.randint(900, 2200)),
+        "category": category,
+        "tags": tags,
+        "type": rng.choice(TYPES),
+        "meta": {
+            "meta_description": summary[:155],
+            "teaser": " ".join(rng.choices(WORDS, k=20)),
+            "slug": _slugify(title),
+            "keywords": ", ".join(tags),
+            "og_description": summary[:200],
+        },
+        "date": day.isoformat(),
+        "date_display": day.strftime("%d. %B %Y"),
+    }
+
+
+def generate_corpus(count, seed=DEFAULT_SEED):
+    """
+    Legt `count` Artikel unter .cache/benchmark/corpus-<count>-<seed>/ an
+    (nur beim ersten Mal - eine Markierungsdatei zeigt den fertigen Bestand).
+    Gibt das Verzeichnis zurueck.
+    """
+    directory = BENCH_DIR / f"corpus-{count}-{seed}"
+    marker = directory / ".complete"
+    if marker.exists() and marker.read_text().strip() == str(CORPUS_VERSION):
+        return directory
+    if directory.exists():
+        shutil.rmtree(directory)
+    directory.mkdir(parents=True)
+
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    pool = _paragraphs(rng)
+    for number in range(count):
+        article = synthetic_article(rng, number, pool)
+        filename = f"{article['date']}_{article['meta']['slug']}.json"
+        with open(directory / filename, "w", encoding="utf-8") as f:
+            json.dump(article, f, indent=2, ensure_ascii=False)
+    marker.write_text(str(CORPUS_VERSION))
+    print(f"  Bestand mit {count} Artikeln erzeugt ({time.perf_counter() - start:.1f}s)")
+    return directory
+
+
+# ============================================================
+# Messung (im Kindprozess)
+# ============================================================
+
+def _peak_rss_kb(who=None):
+    """Spitzen-RSS in KB (ru_maxrss ist auf macOS in Bytes); None ohne resource-Modul."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who is None else who)
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+def _run_child(corpus_dir, site_dir, jobs):
+    """
+    Baut die Website aus `corpus_dir` nach `site_dir` in allen MODES und gibt
+    die Messwerte zurueck. Laeuft in einem eigenen Prozess, damit RSS und
+    Modul-Caches jeder Groesse unabhaengig sind.
+    """
+    import article_db
+    import site_builder
+
+    site_builder.ARTICLES_DIR = Path(corpus_dir)
+    site_builder.SITE_DIR = Path(site_dir)
+    # Eine vorhandene articles.db des Projekts darf den Bestand nicht ersetzen
+    article_db.DB_PATH = Path(corpus_dir) / "articles.db"
+
+    with open(PROJECT_DIR / "config.example.json", "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    index_file = Path(corpus_dir) / site_builder.INDEX_FILE
+    if index_file.exists():
+        index_file.unlink()
+    if Path(site_dir).exists():
+        shutil.rmtree(site_dir)
+
+    runs = {}
+    for mode in MODES:
+        stats = {}
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            site_builder.build_site(config, incremental=(mode == "incremental"), jobs=jobs, stats=stats)
+        runs[mode] = {
+            "wall": time.perf_counter() - start,
+            "phases": stats["phases"],
+            "pages": {kind: {"count": count, "seconds": seconds} for kind, (count, seconds) in stats["pages"].items()},
+            "peak_rss_kb": _peak_rss_kb(),
+        }
+    try:
+        import resource
+        runs["workers_peak_rss_kb"] = _peak_rss_kb(resource.RUSAGE_CHILDREN) if jobs > 1 else None
+    except ImportError:
+        runs["workers_peak_rss_kb"] = None
+    runs["articles"] = stats["articles"]
+    return runs
+
+
+def run_size(count, seed, jobs, keep_site=False):
+    """Misst eine Groesse in einem frischen Python-Prozess."""
+    corpus_dir = generate_corpus(count, seed)
+    site_dir = BENCH_DIR / f"site-{count}"
+    print(f"  Messe {count} Artikel...")
+    proc = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--child", str(corpus_dir), str(site_dir), str(jobs)],
+        capture_output=True, text=True, cwd=str(PROJECT_DIR),
+    )
+    if not keep_site and site_dir.exists():
+        shutil.rmtree(site_dir)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark fuer {count} Artikel fehlgeschlagen:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# ============================================================
+# Ergebnisse
+# ============================================================
+
+def _git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=str(PROJECT_DIR),
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True, cwd=str(PROJECT_DIR),
+        ).stdout.strip()
+    except OSError:
+        return None
+    return f"{commit}-dirty" if commit and dirty else commit or None
+
+
+def _metrics(run):
+    """Flache Kennzahlen eines Durchlaufs fuer Tabelle und Vergleich."""
+    metrics = {"wall": run["wall"]}
+    metrics.update(run["phases"])
+    metrics.update({kind: page["seconds"] for kind, page in run["pages"].items()})
+    return metrics
+
+
+def print_results(results):
+    for size, runs in results["sizes"].items():
+        print(f"\n  {size} Artikel")
+        for mode in MODES:
+            run = runs[mode]
+            parts = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in _metrics(run).items())
+            rss = run["peak_rss_kb"]
+            print(f"    {mode:<12} {parts}" + (f", RSS {rss / 1024:.0f} MB" if rss else ""))
+
+
+def compare(old, new):
+    """Druckt die relative Aenderung aller Kennzahlen gegenueber `old`."""
+    print(f"\n  Vergleich {old.get('commit')} -> {new.get('commit')}")
+    for size, runs in new["sizes"].items():
+        old_runs = old["sizes"].get(size)
+        if not old_runs:
+            continue
+        print(f"\n  {size} Artikel")
+        for mode in MODES:
+            before, after = _metrics(old_runs[mode]), _metrics(runs[mode])
+            parts = []
+            for name, seconds in after.items():
+                if before.get(name):
+                    parts.append(f"{name} {(seconds - before[name]) / before[name] * 100:+.0f}%")
+            old_rss, new_rss = old_runs[mode].get("peak_rss_kb"), runs[mode].get("peak_rss_kb")
+            if old_rss and new_rss:
+                parts.append(f"RSS {(new_rss - old_rss) / old_rss * 100:+.0f}%")
+            print(f"    {mode:<12} " + ", ".join(parts))
+
+
+def run_benchmark(sizes=DEFAULT_SIZES, seed=DEFAULT_SEED, jobs=1, keep_site=False):
+    results = {
+        "version": 1,
+        "commit": _git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "jobs": jobs,
+        "seed": seed,
+        "sizes": {},
+    }
+    for count in sizes:
+        results["sizes"][str(count)] = run_size(count, seed, jobs, keep_site)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark fuer den Website-Build (offline)")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Artikelzahlen, kommagetrennt")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed fuer den synthetischen Bestand")
+    parser.add_argument("--jobs", type=int, default=1, help="Prozesse beim Rendern (0 = alle Kerne)")
+    parser.add_argument("--output", help="Ergebnis-Datei (Standard: .cache/benchmark/results/)")
+    parser.add_argument("--compare", help="Frueheres Ergebnis zum Vergleich")
+    parser.add_argument("--keep-site", action="store_true", help="Gebaute Seiten nicht loeschen")
+    parser.add_argument("--child", nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        corpus_dir, site_dir, jobs = args.child
+        print(json.dumps(_run_child(corpus_dir, site_dir, int(jobs))))
+        return
+
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+    results = run_benchmark(sizes, args.seed, args.jobs, args.keep_site)
+    print_results(results)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}_{results['commit'] or 'nogit'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n  Ergebnis gespeichert: {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,251 @@ Content-Generator: Erstellt SEO-optimierte Whisky- und Reise-Artikel
 mithilfe der OpenAI API. Gibt strukturierte Artikel-Daten zurueck.
 """
 
+import hashlib
 import json
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from openai import OpenAI
+from pathlib import Path
 
+from api_client import get_client
+from hedging import HedgeCancelled, hedger_from_config
+from rate_limiter import estimate_tokens
+from response_cache import ResponseCache, cache_from_config, completion_from_dict
+from retry_policy import RetryPolicy, policy_from_config
+from usage_ledger import UsageMeter, usage_of
 
-def _call_openai_with_retry(client, max_retries=3, **kwargs):
-    """Ruft die OpenAI API auf mit automatischer Wiederholung bei Fehlern."""
-    for attempt in range(max_retries):
+PARTIAL_DIR = Path(__file__).parent / "articles" / ".partial"
+
+CONTINUE_PROMPT = (
+    "Der Text oben ist mitten im Satz abgebrochen. Setze ihn exakt an dieser "
+    "Stelle fort. Wiederhole nichts und antworte nur mit der Fortsetzung."
+)
+# So oft wird ein wegen max_tokens abgeschnittener Artikel hoechstens
+# fortgesetzt - unabhaengig von den Fehler-Wiederholungen der RetryPolicy
+MAX_CONTINUATIONS = 4
+
+
+def _prompt_tokens(request):
+    """Geschaetzte Prompt-Tokens einer Anfrage (ca. 4 Zeichen pro Token)."""
+    return estimate_tokens(dict(request, max_tokens=0))
+
+
+def _cancellable_completion(client, cancel, limiter=None, **kwargs):
+    """
+    Eine Completion als Stream, der abgebrochen wird, sobald `cancel` gesetzt
+    ist (verlorene Hedge-Anfrage): Der Stream wird sofort geschlossen, auch
+    vor dem ersten Chunk. Der Abbruch meldet den geschaetzten Verbrauch
+    bis dahin. Gibt eine normale Completion zurueck.
+    """
+    if limiter is not None:
+        limiter.acquire(estimate_tokens(kwargs))
+    stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs)
+    close = getattr(stream, "close", None) or (lambda: None)
+    cancel.on_cancel(close)
+    parts, usage = [], None
+
+    def cancelled():
+        # Ohne usage-Chunk: Prompt voll, Antwort bis hierher (ca. 4 Zeichen pro Token)
+        return HedgeCancelled(usage or {
+            "prompt_tokens": _prompt_tokens(kwargs),
+            "completion_tokens": len("".join(parts)) // 4,
+        })
+
+    try:
+        for chunk in stream:
+            if cancel.is_set():
+                raise cancelled()
+            usage = usage_of(chunk) or usage
+            if chunk.choices:
+                parts.append(chunk.choices[0].delta.content or "")
+    except HedgeCancelled:
+        raise
+    except Exception:
+        # Der geschlossene Stream bricht das Lesen mit einem Fehler ab
+        if cancel.is_set():
+            raise cancelled()
+        raise
+    finally:
+        close()
+    if cancel.is_set() and usage is None:
+        raise cancelled()
+    if usage is not None:
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    return completion_from_dict({
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(parts)}}],
+        "usage": usage,
+    })
+
+
+def _call_openai_with_retry(client, limiter=None, cache=None, policy=None, hedger=None, meter=None, **kwargs):
+    """
+    Ruft die OpenAI API auf mit automatischer Wiederholung bei Fehlern
+    (RetryPolicy: Fehlertyp, Retry-After, Jitter, Circuit Breaker).
+    Ein optionaler RateLimiter wird vor jedem Versuch befragt; mit einem
+    ResponseCache werden identische Anfragen aus dem Cache beantwortet.
+    Mit einem Hedger geht bei langsamen Antworten eine zweite Anfrage raus.
+    Der Verbrauch (usage) wird auf einen optionalen UsageMeter gebucht.
+    """
+    if cache is not None:
+        cache_key = ResponseCache.key(kwargs)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print("    (Antwort aus dem Cache)")
+            if meter is not None:
+                meter.add(cached, kwargs.get("model"), cached=True)
+            return cached
+
+    def book_loser(usage):
+        # Auch die abgebrochene Anfrage hat gekostet - mindestens ihren Prompt
+        if meter is not None:
+            meter.add_usage(usage or {"prompt_tokens": _prompt_tokens(kwargs), "completion_tokens": 0},
+                            kwargs.get("model"))
+
+    def attempt():
+        if hedger is not None:
+            latency_key = f"{kwargs.get('model')}/{kwargs.get('max_tokens')}"
+            return hedger.call(
+                latency_key,
+                lambda cancel: _cancellable_completion(client, cancel, limiter=limiter, **kwargs),
+                on_loser=book_loser,
+            )
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(kwargs))
+        return client.chat.completions.create(**kwargs)
+
+    response = (policy or RetryPolicy()).call(attempt)
+    if meter is not None:
+        meter.add(response, kwargs.get("model"))
+    if cache is not None:
+        cache.put(cache_key, response)
+    return response
+
+
+# ============================================================
+# Streaming mit Checkpoint auf der Platte
+# ============================================================
+
+def _partial_paths(topic):
+    """Checkpoint-Dateien eines Themas: (Text bisher, Thema als JSON)."""
+    key = hashlib.sha1(topic["title"].encode("utf-8")).hexdigest()[:16]
+    return PARTIAL_DIR / f"{key}.html", PARTIAL_DIR / f"{key}.json"
+
+
+def partial_topics():
+    """Themen mit einem abgebrochenen, fortsetzbaren Artikel."""
+    topics = []
+    for path in sorted(PARTIAL_DIR.glob("*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                topics.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return topics
+
+
+def _stream_with_checkpoint(client, topic, limiter=None, cache=None, policy=None, meter=None, **kwargs):
+    """
+    Streamt eine Completion und haengt jeden Chunk sofort an
+    articles/.partial/<hash>.html an. Bricht die Verbindung ab (oder endet die
+    Antwort wegen max_tokens), wird der Checkpoint als Assistant-Nachricht
+    mitgeschickt und nur um die Fortsetzung gebeten - auch im naechsten Lauf.
+    Fortsetzungen wegen max_tokens zaehlen nicht als Fehlversuch, sind aber
+    auf MAX_CONTINUATIONS begrenzt.
+    Gibt eine Completion mit dem vollstaendigen Text zurueck.
+    """
+    if cache is not None:
+        cache_key = ResponseCache.key(kwargs)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print("    (Antwort aus dem Cache)")
+            if meter is not None:
+                meter.add(cached, kwargs.get("model"), cached=True)
+            return cached
+
+    text_path, topic_path = _partial_paths(topic)
+    PARTIAL_DIR.mkdir(parents=True, exist_ok=True)
+    text = text_path.read_text(encoding="utf-8") if text_path.exists() else ""
+    with open(topic_path, "w", encoding="utf-8") as f:
+        json.dump(topic, f, ensure_ascii=False)
+    if text:
+        print(f"    Setze abgebrochenen Artikel fort ({len(text)} Zeichen gesichert)...")
+
+    policy = policy or RetryPolicy()
+    usage = {"prompt_tokens": 0, "completion_tokens": 0}
+    attempt = 0
+    continuations = 0
+    while True:
+        policy.breaker.check()
+        request = dict(kwargs)
+        if text:
+            request["messages"] = kwargs["messages"] + [
+                {"role": "assistant", "content": text},
+                {"role": "user", "content": CONTINUE_PROMPT},
+            ]
+            request["max_tokens"] = max(256, kwargs.get("max_tokens", 4000) - len(text) // 4)
+        if limiter is not None:
+            limiter.acquire(estimate_tokens(request))
+
+        finish_reason = None
+        chunks, started, last_report = 0, time.monotonic(), 0.0
         try:
-            return client.chat.completions.create(**kwargs)
+            stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **request)
+            with open(text_path, "a", encoding="utf-8") as f:
+                for chunk in stream:
+                    # Der letzte Chunk traegt nur den Verbrauch dieses Versuchs
+                    chunk_usage = usage_of(chunk)
+                    if chunk_usage is not None:
+                        for field in usage:
+                            usage[field] += chunk_usage[field]
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    delta = choice.delta.content or ""
+                    if delta:
+                        f.write(delta)
+                        f.flush()
+                        text += delta
+                        chunks += 1
+                    finish_reason = choice.finish_reason or finish_reason
+                    elapsed = time.monotonic() - started
+                    if elapsed - last_report >= 0.5:
+                        last_report = elapsed
+                        print(f"\r    {chunks} Tokens, {chunks / elapsed:.1f} Tokens/s", end="", flush=True)
+            elapsed = max(time.monotonic() - started, 1e-6)
+            print(f"\r    {chunks} Tokens in {elapsed:.1f}s ({chunks / elapsed:.1f} Tokens/s)")
         except Exception as e:
-            error_str = str(e).lower()
-            if any(kw in error_str for kw in ["rate_limit", "429", "500", "502", "503", "timeout", "overloaded"]):
-                wait_time = (2 ** attempt) * 5
-                print(f"    API-Fehler (Versuch {attempt + 1}/{max_retries}): {e}")
-                print(f"    Warte {wait_time} Sekunden...")
-                time.sleep(wait_time)
-            else:
-                raise
-    raise Exception(f"OpenAI API nach {max_retries} Versuchen fehlgeschlagen.")
+            print()
+            attempt += 1
+            wait_time = policy.on_error(e, attempt)
+            print(f"    Stream abgebrochen (Versuch {attempt}/{policy.max_attempts}): {e}")
+            print(f"    Checkpoint: {len(text)} Zeichen. Warte {wait_time:.1f} Sekunden...")
+            policy.sleep(wait_time)
+            continue
+        policy.breaker.record_success()
+
+        if finish_reason == "length":
+            # Ausgabe wegen max_tokens abgeschnitten - Fortsetzung anfordern
+            continuations += 1
+            if continuations > MAX_CONTINUATIONS:
+                raise Exception(
+                    f"Artikel nach {MAX_CONTINUATIONS} Fortsetzungen nicht fertig - "
+                    f"Fortsetzung beim naechsten Lauf."
+                )
+            print(f"    Ausgabe bei max_tokens abgeschnitten - Fortsetzung {continuations}/{MAX_CONTINUATIONS}...")
+            continue
+        break
+
+    usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    response = completion_from_dict({"choices": [{"index": 0, "message": {"role": "assistant", "content": text}}], "usage": usage})
+    if meter is not None:
+        meter.add(response, kwargs.get("model"))
+    if cache is not None:
+        cache.put(cache_key, response)
+    text_path.unlink(missing_ok=True)
+    topic_path.unlink(missing_ok=True)
+    return response
 
 
 def _build_article_prompt(topic, affiliate_links, content_settings):
@@ -99,66 +322,69 @@ Antworte EXAKT in diesem JSON-Format:
 NUR JSON, kein anderer Text."""
 
 
-def generate_article(topic, config):
-    """
-    Generiert einen vollstaendigen Artikel mit Meta-Daten.
-    Gibt ein Dict mit allen Artikeldaten zurueck.
-    """
-    client = OpenAI(api_key=config["openai"]["api_key"])
-    model = config["openai"].get("model", "gpt-4o")
-    temperature = config["openai"].get("temperature", 0.7)
+META_MARKER = "---META---"
+
 
-    # --- Schritt 1: Artikel generieren ---
-    print(f"  [1/2] Generiere Artikel: {topic['title']}...")
+def _build_combined_suffix(topic):
+    """Zusatz zum Artikel-Prompt, wenn Artikel und Meta-Daten in einer Anfrage kommen."""
+    return f"""
 
+ZUSAETZLICH: Schreibe nach dem HTML-Inhalt eine einzelne Zeile {META_MARKER}
+und danach die SEO-Meta-Daten fuer den Artikel.
+{_build_meta_prompt(topic)}"""
+
+
+def _article_request(topic, config, combined=False):
+    """Die Parameter der Chat-Anfrage fuer den Artikel-Inhalt."""
     prompt = _build_article_prompt(
         topic,
         config["affiliate_links"],
         config["content_settings"],
     )
-
-    response = _call_openai_with_retry(
-        client,
-        model=model,
-        temperature=temperature,
-        max_tokens=config["openai"].get("max_tokens", 4000),
-        messages=[
+    max_tokens = config["openai"].get("max_tokens", 4000)
+    if combined:
+        prompt += _build_combined_suffix(topic)
+        max_tokens += 500
+    return {
+        "model": config["openai"].get("model", "gpt-4o"),
+        "temperature": config["openai"].get("temperature", 0.7),
+        "max_tokens": max_tokens,
+        "messages": [
             {"role": "system", "content": "Du bist ein professioneller Blog-Autor. Antworte nur mit HTML-Inhalt."},
             {"role": "user", "content": prompt},
         ],
-    )
-
-    html_content = response.choices[0].message.content.strip()
-
-    # Code-Block-Wrapper entfernen
-    if html_content.startswith("```"):
-        html_content = re.sub(r"^```(?:html)?\s*\n?", "", html_content)
-        html_content = re.sub(r"\n?```\s*$", "", html_content)
+    }
 
-    # --- Schritt 2: Meta-Daten generieren ---
-    print(f"  [2/2] Generiere Meta-Daten...")
 
-    meta_response = _call_openai_with_retry(
-        client,
-        model=model,
-        temperature=0.3,
-        max_tokens=500,
-        messages=[
+def _meta_request(topic, config):
+    """Die Parameter der Chat-Anfrage fuer die SEO-Meta-Daten."""
+    return {
+        "model": config["openai"].get("model", "gpt-4o"),
+        "temperature": 0.3,
+        "max_tokens": 500,
+        "messages": [
             {"role": "system", "content": "Du bist ein SEO-Experte. Antworte nur mit validem JSON."},
             {"role": "user", "content": _build_meta_prompt(topic)},
         ],
-    )
+    }
+
+
+def _strip_code_fence(text, lang):
+    """Entfernt einen ```html / ```json Code-Block-Wrapper."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = re.sub(rf"^```(?:{lang})?\s*\n?", "", text)
+        text = re.sub(r"\n?```\s*$", "", text)
+    return text
 
-    meta_text = meta_response.choices[0].message.content.strip()
-    if meta_text.startswith("```"):
-        meta_text = re.sub(r"^```(?:json)?\s*\n?", "", meta_text)
-        meta_text = re.sub(r"\n?```\s*$", "", meta_text)
 
+def _parse_meta(meta_text, topic):
+    """Liest die Meta-Daten; bei kaputtem JSON werden sie aus dem Titel abgeleitet."""
     try:
-        meta = json.loads(meta_text)
+        return json.loads(_strip_code_fence(meta_text, "json"))
     except json.JSONDecodeError:
         slug = re.sub(r"[^a-z0-9\-]", "", topic["title"].lower().replace(" ", "-").replace(":", "").replace("ue", "ue").replace("ae", "ae").replace("oe", "oe"))
-        meta = {
+        return {
             "meta_description": topic["title"],
             "teaser": topic["title"],
             "slug": slug,
@@ -166,9 +392,12 @@ def generate_article(topic, config):
             "og_description": topic["title"],
         }
 
+
+def _assemble_article(topic, html_content, meta):
+    """Baut das gespeicherte Artikel-Dict aus Inhalt und Meta-Daten."""
     return {
         "title": topic["title"],
-        "html_content": html_content,
+        "html_content": _strip_code_fence(html_content, "html"),
         "category": topic.get("category", "Allgemein"),
         "tags": topic.get("tags", []),
         "type": topic.get("type", "article"),
@@ -176,3 +405,58 @@ def generate_article(topic, config):
         "date": datetime.now().strftime("%Y-%m-%d"),
         "date_display": datetime.now().strftime("%d. %B %Y"),
     }
+
+
+def generate_article(topic, config, limiter=None, meter=None):
+    """
+    Generiert einen vollstaendigen Artikel mit Meta-Daten.
+    Gibt ein Dict mit allen Artikeldaten zurueck. `limiter` ist ein von
+    allen Workern geteilter RateLimiter (optional). Der Verbrauch aller
+    Aufrufe steht danach in article["usage"] und in `meter` (falls uebergeben).
+
+    openai.meta_mode in config.json:
+      "parallel" (Standard) - Meta-Daten laufen gleichzeitig zum Artikel
+      "combined"            - eine einzige Anfrage liefert beides
+    openai.stream = true streamt den Artikel mit Checkpoint (fortsetzbar).
+    openai.hedge = true sichert nicht gestreamte Anfragen mit Hedging ab.
+    """
+    client = get_client(config)
+    cache = cache_from_config(config)
+    policy = policy_from_config(config)
+    hedger = hedger_from_config(config)
+    meter = meter or UsageMeter(config)
+
+    # Der lange Artikel-Aufruf wird auf Wunsch gestreamt und mitgeschrieben
+    if config["openai"].get("stream", False):
+        call_article = lambda request: _stream_with_checkpoint(
+            client, topic, limiter=limiter, cache=cache, policy=policy, meter=meter, **request
+        )
+    else:
+        call_article = lambda request: _call_openai_with_retry(
+            client, limiter=limiter, cache=cache, policy=policy, hedger=hedger, meter=meter, **request
+        )
+
+    if config["openai"].get("meta_mode", "parallel") == "combined":
+        print(f"  Generiere Artikel + Meta-Daten: {topic['title']}...")
+        response = call_article(_article_request(topic, config, combined=True))
+        text = response.choices[0].message.content.strip()
+        html_content, _, meta_text = text.partition(META_MARKER)
+        article = _assemble_article(topic, html_content, _parse_meta(meta_text, topic))
+        article["usage"] = meter.totals()
+        return article
+
+    # Die Meta-Anfrage haengt nur vom Titel ab und laeuft parallel zum Artikel
+    print(f"  Generiere Artikel + Meta-Daten (parallel): {topic['title']}...")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        meta_future = pool.submit(
+            _call_openai_with_retry, client, limiter=limiter, cache=cache, policy=policy, hedger=hedger,
+            meter=meter, **_meta_request(topic, config),
+        )
+        response = call_article(_article_request(topic, config))
+        meta_response = meta_future.result()
+
+    html_content = response.choices[0].message.content
+    meta_text = meta_response.choices[0].message.content
+    article = _assemble_article(topic, html_content, _parse_meta(meta_text, topic))
+    article["usage"] = meter.totals()
+    return article
@@ -0,0 +1,435 @@
+"""
+Lokaler Ersatz fuer die OpenAI Chat-Completions-API - fuer Lasttests der
+Artikel-Generierung ohne Kosten und ohne Internet.
+
+Der Server beantwortet POST /v1/chat/completions mit vorgefertigtem HTML
+(Artikel) bzw. Meta-JSON, mit einstellbarer Antwortzeit, zufaelligen
+429/5xx-Fehlern (mit Retry-After), Streaming (SSE) und usage-Angaben.
+
+  python fake_openai_server.py --serve --port 8765
+      -> in config.json "base_url": "http://127.0.0.1:8765/v1" setzen,
+         dann laeuft main.py komplett gegen den Fake
+
+  python fake_openai_server.py --bench -n 50 --concurrency 8 --error-rate 0.05
+      -> startet den Server, generiert 50 Artikel ueber generate_article()
+         (nichts wird gespeichert) und meldet Durchsatz und Latenz-Perzentile
+
+Antwortzeiten (--latency, Sekunden):
+  fixed:0.5             immer 0.5 s
+  uniform:0.2:1.5       gleichverteilt
+  normal:1.0:0.3        Mittelwert, Standardabweichung
+  lognormal:0.8:0.5     Median, Sigma (Standard - langer Schwanz wie bei der API)
+"""
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+FAKE_DIR = PROJECT_DIR / ".cache" / "fake-api"
+
+DEFAULT_PORT = 8765
+DEFAULT_LATENCY = "lognormal:0.8:0.5"
+STREAM_CHUNK_WORDS = 20
+
+PARAGRAPHS = [
+    "Wer zum ersten Mal nach Schottland reist, merkt schnell: Whisky ist hier mehr als ein Getraenk. "
+    "In jeder Region schmeckt er anders, und hinter jeder Destillerie steht eine eigene Geschichte.",
+    "Die Fuehrungen dauern meist eine Stunde und enden mit einem kleinen Tasting. Plane genug Zeit ein, "
+    "denn gerade im Sommer sind die Touren schnell ausgebucht.",
+    "Torfiger Rauch, Meersalz und ein Hauch von Jod - so beschreiben viele Kenner den typischen Charakter. "
+    "Wer es milder mag, greift zu einem Whisky aus dem Sherry-Fass.",
+    "Zwischen den Destillerien liegen oft nur wenige Kilometer, doch die Strassen sind schmal und kurvig. "
+    "Ein Mietwagen oder Wohnmobil ist deshalb die beste Wahl fuer die Rundreise.",
+    "Abends lohnt sich ein Besuch im Dorfpub: Dort gibt es oft seltene Abfuellungen, die man sonst nur "
+    "direkt bei der Brennerei bekommt.",
+]
+
+
+# ============================================================
+# Antworten
+# ============================================================
+
+def parse_latency(spec):
+    """Baut aus z.B. "lognormal:0.8:0.5" eine Funktion, die Sekunden liefert."""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "normal":
+        return lambda rng: max(0.0, rng.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    raise ValueError(f"Unbekannte Latenz-Verteilung: {spec}")
+
+
+def _title_of(messages):
+    prompt = messages[-1].get("content", "") if messages else ""
+    match = re.search(r'(?:Thema: |Titel )"([^"]+)"', prompt)
+    return match.group(1) if match else "Whisky-Artikel"
+
+
+def _slug(title):
+    return re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+
+
+def _meta_json(title):
+    return json.dumps({
+        "meta_description": f"{title} - alles Wichtige kompakt zusammengefasst.",
+        "teaser": f"Unser Guide zu {title}: Tipps, Routen und Empfehlungen.",
+        "slug": _slug(title),
+        "keywords": "Whisky, Schottland, Reise",
+        "og_description": f"{title} - Tipps und Empfehlungen aus erster Hand.",
+    }, ensure_ascii=False)
+
+
+def _article_html(title, words):
+    parts = [f"<h2>{title}</h2>"]
+    count = 0
+    section = 1
+    while count < words:
+        parts.append(f"<h2>Teil {section}</h2>")
+        for paragraph in PARAGRAPHS:
+            parts.append(f"<p>{paragraph}</p>")
+            count += len(paragraph.split())
+        section += 1
+    return "\n\n".join(parts)
+
+
+def completion_text(request, words):
+    """Der Antworttext passend zur Anfrage: Meta-JSON, Artikel oder beides (combined)."""
+    messages = request.get("messages", [])
+    title = _title_of(messages)
+    system = messages[0].get("content", "") if messages else ""
+    if "JSON" in system:
+        return _meta_json(title)
+    # Nicht mehr Woerter als max_tokens hergibt (ca. 0.7 Woerter pro Token)
+    words = min(words, int(request.get("max_tokens") or 4000) * 7 // 10)
+    html = _article_html(title, words)
+    if "---META---" in (messages[-1].get("content", "") if messages else ""):
+        html += "\n---META---\n" + _meta_json(title)
+    return html
+
+
+def _tokens(text):
+    return max(1, len(text) // 4)
+
+
+# ============================================================
+# Server
+# ============================================================
+
+class FakeOpenAIServer:
+    """
+    ThreadingHTTPServer mit Chat-Completions-Endpunkt. Zaehlt Anfragen je
+    Statuscode in self.stats (thread-sicher).
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, latency=DEFAULT_LATENCY,
+                 error_rate=0.0, rate_limit_rate=0.0, retry_after=1.0, words=1500, seed=None):
+        self.latency = parse_latency(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.words = words
+        self.rng = random.Random(seed)
+        self.stats = {}
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, status):
+        with self._lock:
+            self.stats[status] = self.stats.get(status, 0) + 1
+
+    def draw(self):
+        """(Latenz, Fehlerstatus oder None) fuer eine Anfrage."""
+        with self._lock:
+            latency = self.latency(self.rng)
+            roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return latency * 0.1, 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return latency * 0.5, self.rng.choice((500, 502, 503))
+        return latency, None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body, headers=()):
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+            server.count(status)
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json(200, {"object": "list", "data": [{"id": "gpt-4o", "object": "model", "owned_by": "fake"}]})
+            else:
+                self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": {"message": "Invalid JSON", "type": "invalid_request_error"}})
+                return
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+                return
+
+            latency, error = server.draw()
+            if error == 429:
+                time.sleep(latency)
+                self._send_json(429, {"error": {
+                    "message": "Rate limit reached (fake)", "type": "requests", "code": "rate_limit_exceeded",
+                }}, headers=[("Retry-After", f"{server.retry_after:g}")])
+                return
+            if error:
+                time.sleep(latency)
+                self._send_json(error, {"error": {"message": "Upstream error (fake)", "type": "server_error"}})
+                return
+
+            text = completion_text(request, server.words)
+            usage = {
+                "prompt_tokens": _tokens(json.dumps(request.get("messages", []), ensure_ascii=False)),
+                "completion_tokens": _tokens(text),
+            }
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            base = {
+                "id": f"chatcmpl-fake-{uuid.uuid4().hex[:16]}",
+                "created": int(time.time()),
+                "model": request.get("model", "gpt-4o"),
+            }
+            if request.get("stream"):
+                include_usage = (request.get("stream_options") or {}).get("include_usage", False)
+                self._stream(base, text, usage if include_usage else None, latency)
+            else:
+                time.sleep(latency)
+                self._send_json(200, dict(base, object="chat.completion", usage=usage, choices=[{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop",
+                }]))
+
+        def _stream(self, base, text, usage, latency):
+            """SSE wie die API: erster Chunk nach ~30 % der Latenz, der Rest verteilt."""
+            words = text.split(" ")
+            pieces = [" ".join(words[i:i + STREAM_CHUNK_WORDS]) + " " for i in range(0, len(words), STREAM_CHUNK_WORDS)]
+            pieces[-1] = pieces[-1][:-1]
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            time.sleep(latency * 0.3)
+            pause = latency * 0.7 / len(pieces)
+
+            def send(chunk):
+                self.wfile.write(b"data: " + json.dumps(chunk, ensure_ascii=False).encode("utf-8") + b"\n\n")
+                self.wfile.flush()
+
+            try:
+                for index, piece in enumerate(pieces):
+                    delta = {"content": piece} if index else {"role": "assistant", "content": piece}
+                    send(dict(base, object="chat.completion.chunk", choices=[{"index": 0, "delta": delta, "finish_reason": None}]))
+                    time.sleep(pause)
+                send(dict(base, object="chat.completion.chunk", choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+                if usage is not None:
+                    send(dict(base, object="chat.completion.chunk", choices=[], usage=usage))
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                # Client hat abgebrochen (z.B. verlorener Hedge)
+                pass
+            server.count(200)
+
+    return Handler
+
+
+# ============================================================
+# Lasttest
+# ============================================================
+
+def _percentile(values, p):
+    """Perzentil per naechstem Rang (values muss sortiert sein)."""
+    if not values:
+        return None
+    return values[min(len(values) - 1, max(0, math.ceil(p / 100 * len(values)) - 1))]
+
+
+def _bench_config(args, url):
+    config_path = Path(args.config) if args.config else PROJECT_DIR / "config.example.json"
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    config["openai"].update({
+        "api_key": "sk-fake",
+        "base_url": url,
+        "cache": False,
+        "stream": args.stream,
+        "hedge": args.hedge,
+        "meta_mode": "combined" if args.combined else "parallel",
+    })
+    return config
+
+
+def run_bench(args):
+    """Generiert args.count Artikel gegen den Fake und misst Durchsatz und Latenz."""
+    import content_generator
+    import hedging
+    from content_generator import generate_article
+    from rate_limiter import RateLimiter
+    from topic_library import WHISKY_TOPICS
+    from usage_ledger import UsageMeter
+
+    # Checkpoints und Latenz-Historie nicht mit echten Laeufen vermischen
+    content_generator.PARTIAL_DIR = FAKE_DIR / "partial"
+    hedging.LATENCY_FILE = FAKE_DIR / "latency.json"
+
+    server = FakeOpenAIServer(
+        port=args.port, latency=args.latency, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, words=args.words, seed=args.seed,
+    ).start()
+    config = _bench_config(args, server.url)
+    limiter = RateLimiter(args.rpm, args.tpm) if args.rpm or args.tpm else None
+    topics = [WHISKY_TOPICS[i % len(WHISKY_TOPICS)] for i in range(args.count)]
+
+    def one(topic):
+        meter = UsageMeter(config)
+        start = time.perf_counter()
+        try:
+            generate_article(topic, config, limiter=limiter, meter=meter)
+            return True, time.perf_counter() - start, meter.total_tokens, None
+        except Exception as e:
+            return False, time.perf_counter() - start, meter.total_tokens, f"{type(e).__name__}: {e}"
+
+    print(f"\n  Lasttest: {args.count} Artikel, {args.concurrency} parallel gegen {server.url}")
+    started = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(one, topics))
+    wall = time.perf_counter() - started
+    server.stop()
+
+    latencies = sorted(seconds for ok, seconds, _, _ in results if ok)
+    errors = [error for ok, _, _, error in results if not ok]
+    requests = sum(server.stats.values())
+    report = {
+        "articles": args.count,
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 3),
+        "articles_per_minute": round(len(latencies) / wall * 60, 2),
+        "requests": requests,
+        "requests_per_second": round(requests / wall, 2),
+        "status_counts": {str(status): n for status, n in sorted(server.stats.items())},
+        "tokens": sum(tokens for _, _, tokens, _ in results),
+        "latency_seconds": {
+            f"p{p}": round(_percentile(latencies, p), 3) if latencies else None for p in (50, 90, 99)
+        },
+        "errors": sorted(set(errors))[:10],
+        "settings": {
+            "latency": args.latency, "error_rate": args.error_rate, "rate_limit_rate": args.rate_limit_rate,
+            "stream": args.stream, "hedge": args.hedge, "combined": args.combined,
+        },
+    }
+
+    latency = report["latency_seconds"]
+    print(f"  Erfolgreich: {report['succeeded']}/{args.count} in {wall:.1f}s "
+          f"({report['articles_per_minute']} Artikel/min, {report['requests_per_second']} Anfragen/s)")
+    if latencies:
+        print(f"  Latenz pro Artikel: p50 {latency['p50']}s, p90 {latency['p90']}s, p99 {latency['p99']}s")
+    print(f"  HTTP-Status: " + ", ".join(f"{s}: {n}" for s, n in report["status_counts"].items()))
+    for error in report["errors"]:
+        print(f"  Fehler: {error}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"  Ergebnis gespeichert: {args.output}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokaler Fake der OpenAI Chat-Completions-API")
+    parser.add_argument("--serve", action="store_true", help="Nur den Server starten")
+    parser.add_argument("--bench", action="store_true", help="Lasttest der Artikel-Generierung")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port (0 = frei waehlen)")
+    parser.add_argument("--latency", default=DEFAULT_LATENCY, help="Antwortzeit-Verteilung, z.B. lognormal:0.8:0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil 5xx-Antworten (0..1)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Anteil 429-Antworten (0..1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After bei 429 (Sekunden)")
+    parser.add_argument("--words", type=int, default=1500, help="Woerter pro Artikel")
+    parser.add_argument("--seed", type=int, help="Seed fuer Latenzen und Fehler")
+    parser.add_argument("-n", "--count", type=int, default=20, help="Artikel im Lasttest")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallele Artikel im Lasttest")
+    parser.add_argument("--stream", action="store_true", help="Artikel streamen")
+    parser.add_argument("--hedge", action="store_true", help="Hedging einschalten")
+    parser.add_argument("--combined", action="store_true", help="Artikel und Meta in einer Anfrage")
+    parser.add_argument("--rpm", type=int, help="Rate-Limiter: Anfragen pro Minute")
+    parser.add_argument("--tpm", type=int, help="Rate-Limiter: Tokens pro Minute")
+    parser.add_argument("--config", help="Basis-Config (Standard: config.example.json)")
+    parser.add_argument("--output", help="Ergebnis als JSON speichern")
+    args = parser.parse_args()
+
+    if args.bench:
+        if args.port == DEFAULT_PORT:
+            args.port = 0
+        run_bench(args)
+        return
+
+    server = FakeOpenAIServer(
+        port=args.port, latency=args.latency, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, retry_after=args.retry_after, words=args.words, seed=args.seed,
+    )
+    print(f"\n  Fake-OpenAI laeuft unter {server.url}")
+    print(f'  In config.json unter "openai": "base_url": "{server.url}"')
+    print("  Druecke Strg+C zum Beenden.\n")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n  Beendet. Anfragen: {server.stats}")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
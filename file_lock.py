@@ -0,0 +1,42 @@
+"""
+Datei-Sperre ueber Prozessgrenzen hinweg (Windows und Linux/macOS).
+Mehrere Worker-Prozesse koennen damit dieselben Dateien (Job-Queue,
+verwendete Themen) abwechselnd lesen und schreiben.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def file_lock(path):
+    """
+    Exklusive Sperre auf `path` (wird bei Bedarf angelegt). Blockiert, bis
+    die Sperre frei ist. Auch Threads desselben Prozesses schliessen sich aus,
+    weil jeder Aufruf die Datei neu oeffnet.
+    """
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
@@ -0,0 +1,254 @@
+"""
+Hedged Requests: Dauert eine Anfrage laenger als ein Perzentil der zuletzt
+beobachteten Antwortzeiten, geht eine zweite, identische Anfrage raus. Die
+erste fertige Antwort gewinnt, die andere wird abgebrochen (ihr Stream wird
+sofort geschlossen, OpenAI hoert auf zu generieren). Was die abgebrochene
+Anfrage bis dahin verbraucht hat, wird trotzdem verbucht.
+
+Die Antwortzeiten werden in .cache/latency.json gespeichert, damit sich die
+Schwelle ueber mehrere Laeufe anpasst. Ein Budget begrenzt die Zusatzkosten
+hart: hoechstens hedge_max_ratio zusaetzliche Anfragen pro Anfrage.
+"""
+
+import json
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from usage_ledger import usage_of
+
+PROJECT_DIR = Path(__file__).parent
+LATENCY_FILE = PROJECT_DIR / ".cache" / "latency.json"
+
+DEFAULT_PERCENTILE = 90
+DEFAULT_MAX_RATIO = 0.1
+WINDOW = 200
+MIN_SAMPLES = 20
+# So lange wartet der Gewinner hoechstens auf die Verbrauchsmeldung der Verlierer
+LOSER_GRACE = 2.0
+
+
+class HedgeCancelled(Exception):
+    """
+    Die Anfrage hat verloren und wurde abgebrochen. `usage` ist der bis
+    dahin angefallene Verbrauch (prompt_tokens, completion_tokens), soweit bekannt.
+    """
+
+    def __init__(self, usage=None):
+        super().__init__("Hedge-Anfrage abgebrochen")
+        self.usage = usage
+
+
+class CancelToken:
+    """
+    Abbruchsignal einer Ausfuehrung. Wie threading.Event (is_set, set), dazu
+    on_cancel(): Beim Abbruch wird z.B. der HTTP-Stream sofort geschlossen -
+    auch wenn die Anfrage noch auf das erste Byte wartet.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def is_set(self):
+        return self._event.is_set()
+
+    def set(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback):
+        """Ruft callback() beim Abbruch auf - sofort, wenn schon abgebrochen."""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+# ============================================================
+# Beobachtete Antwortzeiten
+# ============================================================
+
+class LatencyTracker:
+    """Die letzten WINDOW Antwortzeiten je Anfrageart, auf der Platte gesichert."""
+
+    def __init__(self, path=None, window=WINDOW):
+        self.path = Path(path or LATENCY_FILE)
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for key, values in json.load(f).items():
+                    self._samples[key] = deque(values, maxlen=window)
+        except (OSError, ValueError):
+            pass
+
+    def record(self, key, seconds):
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(round(seconds, 3))
+            data = {k: list(v) for k, v in self._samples.items()}
+        self._save(data)
+
+    def _save(self, data):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def percentile(self, key, p):
+        """Das p-Perzentil in Sekunden - None, solange zu wenige Werte vorliegen."""
+        with self._lock:
+            values = sorted(self._samples.get(key, ()))
+        if len(values) < MIN_SAMPLES:
+            return None
+        index = min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1)
+        return values[max(0, index)]
+
+
+# ============================================================
+# Budget und Hedging
+# ============================================================
+
+class HedgeBudget:
+    """Erlaubt eine Zusatzanfrage nur, solange hedges < max_ratio * anfragen."""
+
+    def __init__(self, max_ratio=DEFAULT_MAX_RATIO):
+        self.max_ratio = max_ratio
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def try_spend(self):
+        with self._lock:
+            if self.hedges < self.max_ratio * self.calls:
+                self.hedges += 1
+                return True
+            return False
+
+
+class Hedger:
+    """
+    Fuehrt start(cancel) aus und startet nach der Perzentil-Schwelle eine
+    zweite Ausfuehrung, sofern das Budget reicht. start() bekommt ein
+    CancelToken, schliesst darueber seine Verbindung und hoert mit
+    HedgeCancelled(usage) auf, wenn es verloren hat.
+    """
+
+    def __init__(self, tracker, budget, percentile=DEFAULT_PERCENTILE, grace=LOSER_GRACE):
+        self.tracker = tracker
+        self.budget = budget
+        self.percentile = percentile
+        self.grace = grace
+
+    def call(self, key, start, on_loser=None):
+        """
+        Das Ergebnis der schnellsten Ausfuehrung. Fuer jede abgebrochene
+        Ausfuehrung wird on_loser(usage) aufgerufen, bevor call() zurueckkehrt -
+        mit usage=None, wenn sie sich nicht innerhalb von `grace` meldet.
+        """
+        threshold = self.tracker.percentile(key, self.percentile)
+        self.budget.record_call()
+        results = queue.Queue()
+        cancels = []
+
+        def launch():
+            cancel = CancelToken()
+            cancels.append(cancel)
+            launched = time.monotonic()
+
+            def run():
+                try:
+                    results.put((cancel, start(cancel), None, time.monotonic() - launched))
+                except Exception as e:
+                    results.put((cancel, None, e, None))
+
+            threading.Thread(target=run, daemon=True).start()
+
+        started = time.monotonic()
+        launch()
+        running, hedged = 1, False
+        while True:
+            timeout = None
+            if not hedged and threshold is not None:
+                timeout = max(0.0, threshold - (time.monotonic() - started))
+            try:
+                cancel, result, error, seconds = results.get(timeout=timeout)
+            except queue.Empty:
+                hedged = True
+                if self.budget.try_spend():
+                    print(f"    Keine Antwort nach {threshold:.1f}s - zweite Anfrage gestartet")
+                    launch()
+                    running += 1
+                continue
+
+            running -= 1
+            if error is None:
+                for other in cancels:
+                    if other is not cancel:
+                        other.set()
+                self.tracker.record(key, seconds)
+                self._settle_losers(results, running, on_loser)
+                return result
+            if running == 0:
+                raise error
+
+    def _settle_losers(self, results, running, on_loser):
+        """Meldet den Verbrauch der abgebrochenen Ausfuehrungen an on_loser."""
+        deadline = time.monotonic() + self.grace
+        for _ in range(running):
+            try:
+                _, result, error, _ = results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                usage = None
+            else:
+                if error is None:
+                    # Im selben Moment fertig geworden - voll bezahlt
+                    usage = usage_of(result)
+                elif isinstance(error, HedgeCancelled):
+                    usage = error.usage
+                else:
+                    # Fehlgeschlagene Anfragen berechnet OpenAI nicht
+                    continue
+            if on_loser is not None:
+                on_loser(usage)
+
+
+_hedgers = {}
+_hedgers_lock = threading.Lock()
+
+
+def hedger_from_config(config):
+    """
+    Der prozessweite Hedger laut config.json - oder None, wenn nicht
+    eingeschaltet (openai.hedge, hedge_percentile, hedge_max_ratio).
+    """
+    openai_cfg = config.get("openai", {})
+    if not openai_cfg.get("hedge", False):
+        return None
+    settings = (
+        openai_cfg.get("hedge_percentile", DEFAULT_PERCENTILE),
+        openai_cfg.get("hedge_max_ratio", DEFAULT_MAX_RATIO),
+    )
+    with _hedgers_lock:
+        hedger = _hedgers.get(settings)
+        if hedger is None:
+            percentile, max_ratio = settings
+            hedger = _hedgers[settings] = Hedger(LatencyTracker(), HedgeBudget(max_ratio), percentile)
+        return hedger
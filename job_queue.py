@@ -0,0 +1,245 @@
+"""
+Dauerhafte Job-Queue fuer die Artikel-Generierung. Jeder Job (ein Thema)
+durchlaeuft die Zustaende
+
+  queued -> in_progress -> saved -> done
+                        \\-> queued (neuer Versuch) / failed
+
+"saved" heisst: Artikel gespeichert, Thema aber noch nicht als verwendet
+markiert - stirbt der Prozess genau dazwischen, holt --resume das nach.
+
+Die Queue ist ein Ereignisprotokoll (jobs.jsonl, eine Zeile pro
+Zustandswechsel); der aktuelle Stand ergibt sich durch Abspielen. Alle
+Zugriffe laufen unter einer Datei-Sperre, damit mehrere Worker-Prozesse die
+Queue leeren koennen, ohne ein Thema doppelt zu generieren. Ein Job in
+Arbeit hat eine Lease; laeuft sie ab (Worker abgestuerzt), wird er wieder
+vergeben.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+from file_lock import file_lock
+
+PROJECT_DIR = Path(__file__).parent
+JOBS_FILE = PROJECT_DIR / "jobs.jsonl"
+LOCK_FILE = PROJECT_DIR / "jobs.jsonl.lock"
+
+DEFAULT_LEASE_SECONDS = 30 * 60
+MAX_ATTEMPTS = 3
+
+OPEN_STATES = ("queued", "in_progress", "saved")
+
+
+def worker_id():
+    """Rechner, Prozess und Thread - eindeutig fuer jeden Worker."""
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def _replay():
+    """Spielt jobs.jsonl ab -> {job-id: job} in Einfuegereihenfolge."""
+    jobs = {}
+    if not JOBS_FILE.exists():
+        return jobs
+    with open(JOBS_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Halb geschriebene letzte Zeile nach einem Absturz
+                continue
+            jobs.setdefault(event["id"], {}).update(event)
+    return jobs
+
+
+def _append(events):
+    with open(JOBS_FILE, "a", encoding="utf-8") as f:
+        for event in events:
+            event["time"] = datetime.now().isoformat(timespec="seconds")
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _set_state(job_id, state, **fields):
+    with file_lock(LOCK_FILE):
+        _append([dict(fields, id=job_id, state=state)])
+
+
+# ============================================================
+# Oeffentliche Operationen
+# ============================================================
+
+def load_jobs():
+    with file_lock(LOCK_FILE):
+        return list(_replay().values())
+
+
+class OpenTitles:
+    """
+    Titel offener Jobs fuer die Themenauswahl, ohne die Queue bei jeder
+    Auswahl neu abzuspielen: refresh() liest nur die seit dem letzten Aufruf
+    angehaengten Zeilen (wie TopicLedger). Nach compact() - neue Datei -
+    wird einmal komplett neu eingelesen.
+    """
+
+    def __init__(self):
+        self._file_id = None
+        self._offset = 0
+        self._jobs = {}
+        self._open = {}
+
+    def _reset(self, file_id=None):
+        self._file_id = file_id
+        self._offset = 0
+        self._jobs = {}
+        self._open = {}
+
+    def refresh(self):
+        try:
+            stat = os.stat(JOBS_FILE)
+        except FileNotFoundError:
+            self._reset()
+            return
+        file_id = (stat.st_dev, stat.st_ino)
+        if file_id != self._file_id or stat.st_size < self._offset:
+            self._reset(file_id)
+        if stat.st_size == self._offset:
+            return
+        with open(JOBS_FILE, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Nur vollstaendige Zeilen - eine gerade geschriebene kommt beim naechsten Mal
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        for line in data[:end].splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError):
+                continue
+
+    def _apply(self, event):
+        job = self._jobs.setdefault(event["id"], {})
+        was_open = job.get("state") in OPEN_STATES and "title" in job
+        if "topic" in event:
+            job["title"] = event["topic"]["title"]
+        if "state" in event:
+            job["state"] = event["state"]
+        is_open = job.get("state") in OPEN_STATES and "title" in job
+        if was_open != is_open:
+            title = job["title"]
+            count = self._open.get(title, 0) + (1 if is_open else -1)
+            if count:
+                self._open[title] = count
+            else:
+                self._open.pop(title, None)
+
+    def __contains__(self, title):
+        return title in self._open
+
+    def __len__(self):
+        return len(self._open)
+
+
+def counts():
+    """Anzahl Jobs je Zustand."""
+    result = {}
+    for job in load_jobs():
+        result[job["state"]] = result.get(job["state"], 0) + 1
+    return result
+
+
+def enqueue(topics):
+    """Stellt Themen in die Queue; bereits offene Titel werden uebersprungen."""
+    with file_lock(LOCK_FILE):
+        taken = {job["topic"]["title"] for job in _replay().values() if job["state"] in OPEN_STATES}
+        events = []
+        for topic in topics:
+            if topic["title"] in taken:
+                continue
+            taken.add(topic["title"])
+            events.append({"id": uuid.uuid4().hex[:12], "state": "queued", "topic": topic, "attempts": 0})
+        _append(events)
+    return len(events)
+
+
+def claim(worker, lease_seconds=DEFAULT_LEASE_SECONDS):
+    """
+    Holt den naechsten Job und setzt ihn auf in_progress - oder None, wenn
+    nichts mehr zu tun ist. Jobs mit abgelaufener Lease zaehlen als frei.
+    """
+    with file_lock(LOCK_FILE):
+        now = time.time()
+        for job in _replay().values():
+            expired = job["state"] == "in_progress" and job.get("lease_until", 0) < now
+            if job["state"] == "queued" or expired:
+                event = {
+                    "id": job["id"],
+                    "state": "in_progress",
+                    "worker": worker,
+                    "lease_until": now + lease_seconds,
+                    "attempts": job.get("attempts", 0) + 1,
+                }
+                _append([event])
+                job.update(event)
+                return job
+    return None
+
+
+def mark_saved(job_id, filename):
+    _set_state(job_id, "saved", file=filename)
+
+
+def mark_done(job_id):
+    _set_state(job_id, "done")
+
+
+def mark_failed(job_id, error):
+    """Fehlschlag: zurueck in die Queue, nach MAX_ATTEMPTS Versuchen endgueltig failed."""
+    with file_lock(LOCK_FILE):
+        job = _replay()[job_id]
+        state = "failed" if job.get("attempts", 0) >= MAX_ATTEMPTS else "queued"
+        _append([{"id": job_id, "state": state, "error": str(error)}])
+    return state
+
+
+def release(job_id):
+    """Gibt einen Job ohne Fehlversuch zurueck (z.B. Budget erschoepft)."""
+    with file_lock(LOCK_FILE):
+        job = _replay()[job_id]
+        _append([{"id": job_id, "state": "queued", "attempts": max(0, job.get("attempts", 1) - 1)}])
+
+
+def recover(force=False):
+    """
+    Nach einem Absturz: Jobs in Arbeit mit abgelaufener Lease (mit force=True
+    alle) gehen zurueck in die Queue. Gibt (zurueckgestellt, gespeicherte Jobs)
+    zurueck - letztere muss der Aufrufer noch als verwendet markieren.
+    """
+    with file_lock(LOCK_FILE):
+        now = time.time()
+        requeued, saved = [], []
+        for job in _replay().values():
+            if job["state"] == "in_progress" and (force or job.get("lease_until", 0) < now):
+                requeued.append({"id": job["id"], "state": "queued"})
+            elif job["state"] == "saved":
+                saved.append(job)
+        _append(requeued)
+    return len(requeued), saved
+
+
+def compact():
+    """Schreibt jobs.jsonl neu: nur noch eine Zeile mit dem Endstand je Job."""
+    with file_lock(LOCK_FILE):
+        jobs = _replay()
+        tmp = JOBS_FILE.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for job in jobs.values():
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+        os.replace(tmp, JOBS_FILE)
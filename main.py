@@ -13,21 +13,35 @@ Nutzung:
   python main.py                  -> Menue anzeigen
   python main.py --generate       -> Einen Artikel generieren
   python main.py --generate -n 3  -> 3 Artikel generieren
+  python main.py --generate -n 30 --concurrency 6 -> 6 Artikel gleichzeitig
+  python main.py --enqueue -n 50  -> 50 Themen in die Job-Queue stellen
+  python main.py --work --concurrency 4 -> Queue mit 4 Workern abarbeiten
+  python main.py --resume         -> Nach Absturz: Queue aufraeumen + weiter
+  python main.py --batch -n 100   -> 100 Themen als Batch einreichen
+  python main.py --batch-collect  -> Fertige Batches abholen und speichern
   python main.py --build          -> Website neu bauen
+  python main.py --build --incremental -> Nur geaenderte Seiten neu bauen
+  python main.py --build --jobs 8 -> Seiten parallel rendern (0 = alle Kerne)
+  python main.py --build --precompress -> Zusaetzlich .gz/.br-Dateien schreiben
   python main.py --auto           -> Artikel generieren + Website bauen
+  python main.py --auto -n 50 --max-tokens-per-run 200000 -> Stoppt vor dem Budget
   python main.py --serve          -> Lokalen Webserver starten
+  python main.py --serve --port 9000 --bind 127.0.0.1 -> Anderer Port, nur lokal
+  python main.py --serve --watch  -> Bei Aenderungen neu bauen + Browser neu laden
+  python main.py --serve --on-demand -> Seiten beim Abruf rendern (ohne Build)
   python main.py --stats          -> Statistiken anzeigen
+  python main.py --find-duplicates -> Aehnliche Themen und doppelte Artikel finden
+  python main.py --import-articles -> articles/*.json nach articles.db packen
+  python main.py --export-articles -> articles.db als JSON-Dateien exportieren
+  python main.py --build --profile -> Zeitleiste + teuerste Abschnitte (--cprofile: + cProfile)
 """
 
 import argparse
-import http.server
 import json
 import os
-import random
-import socketserver
 import sys
-import time
-import webbrowser
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Windows Konsolen-Encoding Fix
 os.environ["PYTHONIOENCODING"] = "utf-8"
@@ -40,9 +54,13 @@ SITE_DIR = PROJECT_DIR / "site"
 
 sys.path.insert(0, str(PROJECT_DIR))
 
-from content_generator import generate_article
-from site_builder import build_site, load_all_articles
+import article_db
+import profiling
+import site_builder
+from site_builder import build_site, load_article_index, update_article_index
+from topic_ledger import TopicLedger, TopicPicker
 from topic_library import WHISKY_TOPICS
+from usage_ledger import read_ledger, summarize
 
 
 # ============================================================
@@ -83,43 +101,165 @@ def load_config():
 # Themen-Verwaltung
 # ============================================================
 
-def load_used_topics():
-    used_path = PROJECT_DIR / "used_topics.json"
-    if used_path.exists():
-        with open(used_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return []
+# Themen, die gerade von einem Worker bearbeitet werden (Titel -> Thema)
+_reserved_topics = {}
+_topic_lock = threading.RLock()
+_picker = None
+_guard = None
+_guard_source = None
+# Titel in offenen Batches bzw. offenen Queue-Jobs (inkrementell nachgelesen)
+_busy_sources = None
+# Themen, die in diesem Prozess schon als zu aehnlich aufgefallen sind
+_similar_topics = set()
 
+# So viele zu aehnliche Themen werden pro Auswahl hoechstens uebersprungen
+MAX_SIMILAR_SKIPS = 20
 
-def save_used_topic(topic_title):
-    used = load_used_topics()
-    used.append({"title": topic_title, "date": datetime.now().isoformat()})
-    with open(PROJECT_DIR / "used_topics.json", "w", encoding="utf-8") as f:
-        json.dump(used, f, indent=2, ensure_ascii=False)
 
+def _topic_picker():
+    """Der Themen-Picker ueber used_topics.jsonl (einmal pro Prozess aufgebaut)."""
+    global _picker
+    with _topic_lock:
+        if _picker is None:
+            _picker = TopicPicker(WHISKY_TOPICS, TopicLedger())
+        return _picker
 
-def pick_next_topic():
-    used = load_used_topics()
-    used_titles = {t["title"] for t in used}
-    available = [t for t in WHISKY_TOPICS if t["title"] not in used_titles]
 
-    if not available:
-        print("  HINWEIS: Alle Themen verwendet! Starte von vorne...")
-        available = WHISKY_TOPICS
+def load_used_topics():
+    return _topic_picker().ledger.entries()
 
-    # Abwechslung bei Kategorien
-    if len(available) > 5:
-        recent_cats = []
-        for t in reversed(used[-5:]):
-            for topic in WHISKY_TOPICS:
-                if topic["title"] == t["title"]:
-                    recent_cats.append(topic.get("category", ""))
-                    break
-        preferred = [t for t in available if t.get("category", "") not in recent_cats]
-        if preferred:
-            available = preferred
 
-    return random.choice(available)
+def save_used_topic(topic_title):
+    # Eine angehaengte Zeile unter Datei-Sperre - sicher auch bei mehreren Prozessen
+    with _topic_lock:
+        _topic_picker().mark_used(topic_title)
+        _reserved_topics.pop(topic_title, None)
+
+
+def reserve_next_topic(config=None):
+    """
+    Waehlt das naechste Thema und reserviert es, damit parallele Worker
+    nie dasselbe Thema bekommen. Freigabe ueber save_used_topic()
+    bzw. release_topic() bei Fehlern. None, wenn kein freies Thema mehr
+    unvergeben ist.
+    """
+    with _topic_lock:
+        topic = pick_next_topic(config)
+        if topic is not None:
+            _reserved_topics[topic["title"]] = topic
+        return topic
+
+
+def reserve_topics(config, count):
+    """Reserviert bis zu `count` Themen - weniger, wenn nicht genug frei sind."""
+    topics = []
+    for _ in range(count):
+        topic = reserve_next_topic(config)
+        if topic is None:
+            print(f"  HINWEIS: Nur {len(topics)} von {count} Themen frei - der Rest ist vergeben.")
+            break
+        topics.append(topic)
+    return topics
+
+
+def release_topic(topic_title):
+    with _topic_lock:
+        _reserved_topics.pop(topic_title, None)
+
+
+def _topic_guard(config=None):
+    """
+    Aehnlichkeits-Index der vorhandenen Artikel (einmal pro Prozess aus dem
+    Metadaten-Index aufgebaut; save_article() fuegt neue hinzu). Zeigen
+    Artikel-Ordner oder articles.db woanders hin, wird er neu aufgebaut.
+    """
+    global _guard, _guard_source
+    from similarity import DEFAULT_TOPIC_THRESHOLD, TopicGuard
+
+    source = (site_builder.ARTICLES_DIR, article_db.DB_PATH)
+    with _topic_lock:
+        if _guard is None or _guard_source != source:
+            settings = (config or {}).get("content_settings", {})
+            _guard = TopicGuard(settings.get("similarity_threshold", DEFAULT_TOPIC_THRESHOLD))
+            _guard.refresh(load_article_index())
+            _guard_source = source
+        return _guard
+
+
+def reset_topic_guard():
+    """Verwirft den Aehnlichkeits-Index - der naechste Zugriff baut ihn neu auf."""
+    global _guard, _guard_source
+    with _topic_lock:
+        _guard = None
+        _guard_source = None
+
+
+class _ExcludedTopics:
+    """Vereinigung mehrerer Titel-Mengen ohne Kopie (nur `in` und add())."""
+
+    def __init__(self, *sources):
+        self.sources = list(sources)
+        self.extra = set()
+
+    def __contains__(self, title):
+        return title in self.extra or any(title in source for source in self.sources)
+
+    def add(self, title):
+        self.extra.add(title)
+
+
+def _busy_topics():
+    """Titel in offenen Batches und offenen Queue-Jobs - nur Neues wird nachgelesen."""
+    global _busy_sources
+    from batch_generator import PendingTitles
+    from job_queue import OpenTitles
+
+    with _topic_lock:
+        if _busy_sources is None:
+            _busy_sources = (PendingTitles(), OpenTitles())
+        for source in _busy_sources:
+            source.refresh()
+        return _busy_sources
+
+
+def pick_next_topic(config=None):
+    from content_generator import partial_topics
+
+    picker = _topic_picker()
+    # content_settings.similar_topics: "skip" (Standard), "warn" oder "allow"
+    mode = (config or {}).get("content_settings", {}).get("similar_topics", "skip")
+    # Reservierte Themen und Themen in offenen Batches/der Queue zaehlen als vergeben
+    excluded = _ExcludedTopics(_reserved_topics, *_busy_topics())
+
+    # Abgebrochene (gestreamte) Artikel zuerst fortsetzen
+    for topic in partial_topics():
+        if topic["title"] not in excluded and not picker.is_used(topic["title"]):
+            return topic
+
+    reserved_cats = [t.get("category", "") for t in _reserved_topics.values()]
+    if mode == "skip":
+        excluded.sources.append(_similar_topics)
+    similar = None
+    for _ in range(MAX_SIMILAR_SKIPS):
+        topic = picker.pick(excluded, extra_recent=reserved_cats)
+        if topic is None:
+            # Alles Freie ist vergeben - hoechstens ein aehnliches bleibt uebrig
+            topic = similar
+            break
+        matches = _topic_guard(config).check(topic) if mode != "allow" else []
+        if not matches:
+            return topic
+        score, title = matches[0]
+        if mode == "warn":
+            print(f"  WARNUNG: '{topic['title']}' aehnelt '{title}' ({score:.0%})")
+            return topic
+        print(f"  Uebersprungen (zu aehnlich zu '{title}', {score:.0%}): {topic['title']}")
+        _similar_topics.add(topic["title"])
+        excluded.add(topic["title"])
+        similar = topic
+    if topic is not None:
+        print("  HINWEIS: Nur noch aehnliche Themen frei - nehme trotzdem eines.")
+    return topic
 
 
 # ============================================================
@@ -127,20 +267,39 @@ def pick_next_topic():
 # ============================================================
 
 def save_article(article_data):
-    """Speichert einen Artikel als JSON im articles-Ordner."""
+    """
+    Speichert einen Artikel als JSON im articles-Ordner
+    bzw. in articles.db, wenn die gepackte Ablage aktiv ist.
+    """
     ARTICLES_DIR.mkdir(exist_ok=True)
     slug = article_data.get("meta", {}).get("slug", "artikel")
     date_str = article_data.get("date", datetime.now().strftime("%Y-%m-%d"))
     filename = f"{date_str}_{slug}.json"
     filepath = ARTICLES_DIR / filename
 
+    if article_db.db_enabled():
+        with article_db.ArticleDB() as db:
+            db.save(article_data, filename)
+        _remember_article(filename, article_data)
+        print(f"  Gespeichert: {filename} (articles.db)")
+        return filepath
+
     with open(filepath, "w", encoding="utf-8") as f:
         json.dump(article_data, f, indent=2, ensure_ascii=False)
+    update_article_index(filepath, article_data)
+    _remember_article(filename, article_data)
 
     print(f"  Gespeichert: {filepath.name}")
     return filepath
 
 
+def _remember_article(filename, article_data):
+    """Neuer Artikel fuer die Aehnlichkeitspruefung (falls der Index schon steht)."""
+    with _topic_lock:
+        if _guard is not None:
+            _guard.refresh([{"file": filename, "title": article_data["title"], "tags": article_data.get("tags", [])}])
+
+
 # ============================================================
 # Logging
 # ============================================================
@@ -159,86 +318,364 @@ def log_action(action, details=""):
 # Hauptfunktionen
 # ============================================================
 
-def cmd_generate(config, count=1):
-    """Generiert neue Artikel."""
-    print(f"\n  Generiere {count} Artikel...\n")
+def _generate_one(number, count, config, limiter, budget):
+    """Ein Worker-Durchlauf: Budget pruefen, Thema reservieren, generieren, speichern."""
+    from content_generator import generate_article
+    from retry_policy import CircuitOpenError, policy_from_config
+    from usage_ledger import UsageMeter, record_usage
+
+    # Ist OpenAI gestoert, bricht der Lauf ab, statt jedes Thema anzufassen
+    if policy_from_config(config).breaker.is_open():
+        print(f"  Artikel {number} uebersprungen: OpenAI gestoert (Circuit Breaker offen).")
+        return False
+
+    topic = reserve_next_topic(config)
+    if topic is None:
+        print(f"  Artikel {number} uebersprungen: kein freies Thema mehr.")
+        return False
+    estimate = budget.reserve()
+    if estimate is None:
+        release_topic(topic["title"])
+        print(f"  Artikel {number} uebersprungen: {budget.reason}.")
+        return False
+
+    meter = UsageMeter(config)
+    model = config["openai"].get("model", "gpt-4o")
+    print(f"  --- Artikel {number} von {count}: {topic['title']} "
+          f"({topic.get('category', 'Allgemein')}, {topic.get('type', 'article')}) ---")
 
-    success = 0
-    for i in range(count):
-        print(f"  --- Artikel {i + 1} von {count} ---\n")
+    try:
+        article_data = generate_article(topic, config, limiter=limiter, meter=meter)
+        save_article(article_data)
+        save_used_topic(topic["title"])
+        log_action("GENERATED", topic["title"])
+        print(f"  Artikel {number} erfolgreich generiert! ({meter.total_tokens} Tokens)\n")
+        return True
+    except CircuitOpenError as e:
+        release_topic(topic["title"])
+        print(f"\n  ABBRUCH bei Artikel {number}: {e}\n")
+        log_action("ERROR", f"{topic['title']} | {e}")
+        return False
+    except Exception as e:
+        release_topic(topic["title"])
+        print(f"\n  FEHLER bei Artikel {number}: {e}\n")
+        log_action("ERROR", f"{topic['title']} | {e}")
+        return False
+    finally:
+        # Auch fehlgeschlagene Artikel haben schon Tokens gekostet
+        totals = meter.totals()
+        budget.settle(estimate, totals)
+        if totals["calls"]:
+            record_usage("article", topic["title"], totals, model)
+
+
+def cmd_generate(config, count=1, concurrency=1):
+    """
+    Generiert neue Artikel mit bis zu `concurrency` parallelen Workern.
+    Ein gemeinsamer Rate-Limiter (Anfragen/Tokens pro Minute aus config.json)
+    ersetzt die feste Wartezeit zwischen den Artikeln. Vor jedem Thema wird
+    das Token-Budget geprueft (max_tokens_per_run, daily_token_budget).
+    """
+    # Erst hier importieren: openai zu laden dauert laenger als --stats selbst
+    from rate_limiter import RateLimiter
+    from usage_ledger import TokenBudget
+
+    concurrency = max(1, min(concurrency, count))
+    print(f"\n  Generiere {count} Artikel ({concurrency} parallel)...\n")
+
+    limiter = RateLimiter.from_config(config)
+    budget = TokenBudget.from_config(config)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda n: _generate_one(n, count, config, limiter, budget),
+            range(1, count + 1),
+        ))
+    success = sum(results)
 
-        topic = pick_next_topic()
-        print(f"  Thema:     {topic['title']}")
-        print(f"  Kategorie: {topic.get('category', 'Allgemein')}")
-        print(f"  Typ:       {topic.get('type', 'article')}")
-        print()
+    print(f"  ====================================")
+    print(f"  ERGEBNIS: {success}/{count} Artikel generiert")
+    print(f"  Verbrauch: {budget.spent} Tokens (ca. ${budget.cost_usd:.2f})")
+    print(f"  ====================================\n")
+    return success
 
+
+def cmd_batch(config, count=1, local=False):
+    """
+    Bereitet einen Batch fuer `count` Themen vor und reicht ihn bei der
+    OpenAI Batch API ein - oder arbeitet ihn mit local=True sofort lokal ab.
+    """
+    import batch_generator
+    from api_client import get_client
+
+    topics = reserve_topics(config, count)
+    if not topics:
+        print("\n  Kein freies Thema - kein Batch eingereicht.\n")
+        return None
+    count = len(topics)
+    job = batch_generator.prepare_batch(topics, config)
+    for topic in topics:
+        release_topic(topic["title"])
+    print(f"\n  Batch {job['id']} mit {count} Themen vorbereitet.")
+
+    client = get_client(config)
+    if local:
+        print("  Arbeite Batch lokal ab...")
+        batch_generator.run_local(job, client)
+        _ingest_batch(job, config)
+    else:
+        batch_generator.submit_batch(job, client)
+        print(f"  Eingereicht als {job['remote_id']}.")
+        print("  Ergebnisse spaeter abholen mit: python main.py --batch-collect\n")
+    log_action("BATCH", f"{job['id']} | {count} Themen")
+
+
+def _ingest_batch(job, config):
+    import batch_generator
+
+    ingested, failed = batch_generator.ingest_results(job, save_article, save_used_topic, config)
+    print(f"  Batch {job['id']}: {ingested} Artikel uebernommen, {failed} fehlgeschlagen.\n")
+    log_action("BATCH_INGESTED", f"{job['id']} | {ingested} ok, {failed} Fehler")
+    return ingested
+
+
+def cmd_batch_collect(config):
+    """Prueft alle eingereichten Batches und uebernimmt fertige Ergebnisse."""
+    import batch_generator
+    from api_client import get_client
+
+    client = get_client(config)
+    ingested = 0
+    for job in batch_generator.list_jobs():
+        if job["status"] == "submitted":
+            status = batch_generator.refresh_batch(job, client)
+            print(f"\n  Batch {job['id']}: {status}")
+        if job["status"] == "completed":
+            ingested += _ingest_batch(job, config)
+    if not ingested:
+        print("\n  Keine neuen Batch-Ergebnisse.\n")
+    return ingested
+
+
+def cmd_enqueue(config, count=1):
+    """Stellt `count` neue Themen in die Job-Queue (jobs.jsonl)."""
+    import job_queue
+
+    topics = reserve_topics(config, count)
+    added = job_queue.enqueue(topics)
+    for topic in topics:
+        release_topic(topic["title"])
+    print(f"\n  {added} Themen in die Queue gestellt.")
+    print("  Abarbeiten mit: python main.py --work --concurrency 4\n")
+    log_action("ENQUEUE", f"{added} Themen")
+    return added
+
+
+def _mark_topic_used(title):
+    """Wie save_used_topic(), aber nur einmal pro Titel (Wiederanlauf nach Absturz)."""
+    if not _topic_picker().is_used(title):
+        save_used_topic(title)
+
+
+def _queue_worker(config, limiter, budget):
+    """Ein Worker: holt Jobs aus der Queue, bis sie leer ist. Gibt die Anzahl fertiger Jobs zurueck."""
+    import job_queue
+    from content_generator import generate_article
+    from retry_policy import CircuitOpenError, policy_from_config
+    from usage_ledger import UsageMeter, record_usage
+
+    worker = job_queue.worker_id()
+    model = config["openai"].get("model", "gpt-4o")
+    done = 0
+    while not policy_from_config(config).breaker.is_open():
+        estimate = budget.reserve()
+        if estimate is None:
+            print(f"  Worker beendet: {budget.reason}.")
+            break
+        job = job_queue.claim(worker)
+        if job is None:
+            budget.settle(estimate, {"total_tokens": 0, "cost_usd": 0.0})
+            break
+
+        topic = job["topic"]
+        meter = UsageMeter(config)
+        print(f"  --- Job {job['id']} (Versuch {job['attempts']}): {topic['title']} ---")
         try:
-            article_data = generate_article(topic, config)
-            save_article(article_data)
-            save_used_topic(topic["title"])
+            # Artikel dieses Jobs schon vor dem Absturz gespeichert? Dann nicht
+            # neu generieren. Nur die Job-ID zaehlt - ein aelterer Artikel mit
+            # demselben Titel (neuer Themen-Durchgang) ist kein Treffer
+            existing = [a for a in load_article_index() if a.get("job_id") == job["id"]]
+            if existing:
+                filename = existing[0].get("file")
+            else:
+                article_data = generate_article(topic, config, limiter=limiter, meter=meter)
+                article_data["job_id"] = job["id"]
+                filename = save_article(article_data).name
+            job_queue.mark_saved(job["id"], filename)
+            _mark_topic_used(topic["title"])
+            job_queue.mark_done(job["id"])
             log_action("GENERATED", topic["title"])
-            success += 1
-            print(f"  Artikel erfolgreich generiert!\n")
+            done += 1
+        except CircuitOpenError as e:
+            job_queue.release(job["id"])
+            print(f"\n  ABBRUCH bei Job {job['id']}: {e}\n")
+            log_action("ERROR", f"{topic['title']} | {e}")
         except Exception as e:
-            print(f"\n  FEHLER: {e}\n")
+            state = job_queue.mark_failed(job["id"], e)
+            print(f"\n  FEHLER bei Job {job['id']} ({state}): {e}\n")
             log_action("ERROR", f"{topic['title']} | {e}")
-
-        if i < count - 1:
-            wait = random.randint(3, 8)
-            print(f"  Warte {wait} Sekunden...\n")
-            time.sleep(wait)
-
+        finally:
+            totals = meter.totals()
+            budget.settle(estimate, totals)
+            if totals["calls"]:
+                record_usage("article", topic["title"], totals, model)
+    return done
+
+
+def cmd_work(config, concurrency=1):
+    """
+    Arbeitet die Job-Queue mit `concurrency` Workern ab. Mehrere Prozesse
+    duerfen gleichzeitig laufen - die Queue ist per Datei-Sperre geschuetzt.
+    """
+    import job_queue
+    from rate_limiter import RateLimiter
+    from usage_ledger import TokenBudget
+
+    waiting = job_queue.counts().get("queued", 0)
+    print(f"\n  Arbeite die Queue ab ({waiting} Jobs wartend, {concurrency} Worker)...\n")
+
+    limiter = RateLimiter.from_config(config)
+    budget = TokenBudget.from_config(config)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(lambda _: _queue_worker(config, limiter, budget), range(max(1, concurrency))))
+    success = sum(results)
+
+    state = job_queue.counts()
     print(f"  ====================================")
-    print(f"  ERGEBNIS: {success}/{count} Artikel generiert")
+    print(f"  ERGEBNIS: {success} Artikel generiert")
+    print(f"  Queue: {state.get('queued', 0)} wartend, {state.get('in_progress', 0)} in Arbeit, "
+          f"{state.get('failed', 0)} fehlgeschlagen")
+    print(f"  Verbrauch: {budget.spent} Tokens (ca. ${budget.cost_usd:.2f})")
     print(f"  ====================================\n")
     return success
 
 
-def cmd_build(config):
-    """Baut die Website neu."""
-    build_site(config)
+def cmd_resume(config, concurrency=1, force=False):
+    """
+    Wiederanlauf nach einem Absturz: gespeicherte Artikel als verwendet
+    markieren, liegengebliebene Jobs zurueck in die Queue, dann weiterarbeiten.
+    Mit force=True werden auch Jobs mit noch laufender Lease zurueckgeholt
+    (nur, wenn sicher kein anderer Worker mehr laeuft).
+    """
+    import job_queue
+
+    requeued, saved = job_queue.recover(force=force)
+    for job in saved:
+        _mark_topic_used(job["topic"]["title"])
+        job_queue.mark_done(job["id"])
+    job_queue.compact()
+    print(f"\n  Wiederanlauf: {requeued} Jobs zurueck in die Queue, {len(saved)} gespeicherte abgeschlossen.")
+    return cmd_work(config, concurrency=concurrency)
 
 
-def cmd_auto(config, count=1):
+def cmd_build(config, incremental=False, jobs=1, precompress=None):
+    """Baut die Website neu (inkrementell: nur geaenderte Seiten)."""
+    build_site(config, incremental=incremental, jobs=jobs, precompress=precompress)
+
+
+def cmd_auto(config, count=1, jobs=1, concurrency=1, precompress=None):
     """Generiert Artikel UND baut die Website."""
-    generated = cmd_generate(config, count)
+    generated = cmd_generate(config, count, concurrency=concurrency)
     if generated > 0:
         print()
-        cmd_build(config)
+        cmd_build(config, incremental=True, jobs=jobs, precompress=precompress)
     return generated
 
 
-def cmd_serve():
-    """Startet einen lokalen Webserver zur Vorschau."""
-    if not SITE_DIR.exists():
+def cmd_serve(config=None, port=None, bind="", watch=False, on_demand=False):
+    """
+    Startet den Vorschau-Server (mehrere Anfragen parallel, mit Cache und ETags).
+    Mit watch=True werden articles/, config.json und site_builder.py
+    beobachtet: Nach einer Aenderung wird inkrementell neu gebaut und jede
+    offene Seite im Browser neu geladen.
+    Mit on_demand=True werden die Seiten beim Abruf aus den Artikeln
+    gerendert - ohne Build, nach site/ wird nichts geschrieben.
+    """
+    from preview_server import DEFAULT_PORT, PreviewServer, serve
+
+    renderer = None
+    if on_demand:
+        import site_builder
+        renderer = site_builder.OnDemandSite(config)
+        print(f"\n  Seiten auf Abruf: {len(renderer.store)} Artikel, {len(renderer)} Seiten.")
+    elif watch:
+        build_site(config, incremental=True)
+    elif not SITE_DIR.exists():
         print("  FEHLER: Website noch nicht gebaut!")
         print("  Fuehre zuerst 'Website bauen' aus.")
         return
 
-    port = 8080
-    os.chdir(str(SITE_DIR))
-
-    handler = http.server.SimpleHTTPRequestHandler
-    handler.extensions_map.update({".html": "text/html; charset=utf-8"})
-
-    print(f"\n  Lokaler Webserver gestartet!")
-    print(f"  Oeffne im Browser: http://localhost:{port}")
-    print(f"  Druecke Strg+C zum Beenden.\n")
-
-    # Browser automatisch oeffnen
-    webbrowser.open(f"http://localhost:{port}")
-
-    with socketserver.TCPServer(("", port), handler) as httpd:
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\n  Server beendet.")
+    httpd = PreviewServer(SITE_DIR, bind, port or DEFAULT_PORT, live_reload=watch, renderer=renderer)
+    watcher = None
+    if watch or on_demand:
+        from site_watcher import PollingWatcher
+
+        state = {"config": config}
+        watched = [ARTICLES_DIR, article_db.DB_PATH, PROJECT_DIR / "config.json"]
+        if watch:
+            watched.append(PROJECT_DIR / "site_builder.py")
+            print("  Beobachte articles/, config.json und site_builder.py - Aenderungen laden die Seite neu.")
+        watcher = PollingWatcher(watched, lambda changed: _rebuild_on_change(state, changed, httpd)).start()
+    try:
+        serve(httpd)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+
+
+def _rebuild_on_change(state, changed, httpd):
+    """
+    Nach einer Aenderung: inkrementell neu bauen (bzw. bei --on-demand den
+    Artikel-Index neu lesen) und offene Browser-Tabs neu laden.
+    """
+    import contextlib
+    import importlib
+    import io
+    import time
+
+    import site_builder
+
+    names = sorted({Path(path).name for path in changed})
+    start = time.perf_counter()
+    try:
+        if "config.json" in names:
+            with open(PROJECT_DIR / "config.json", "r", encoding="utf-8") as f:
+                state["config"] = json.load(f)
+        if "site_builder.py" in names:
+            # Template-Aenderungen ohne Neustart uebernehmen
+            site_builder = importlib.reload(site_builder)
+        if httpd.renderer is not None:
+            if "site_builder.py" in names:
+                httpd.renderer = site_builder.OnDemandSite(state["config"])
+            else:
+                httpd.renderer.refresh(state["config"])
+            result = "Seiten-Cache aktualisiert"
+        else:
+            stats = {}
+            with contextlib.redirect_stdout(io.StringIO()):
+                site_builder.build_site(state["config"], incremental=True, stats=stats)
+            result = f"{sum(count for count, _ in stats['pages'].values())} Seiten neu"
+    except Exception as e:
+        print(f"  [{datetime.now():%H:%M:%S}] FEHLER beim Neubau ({', '.join(names)}): {e}")
+        return
+    if httpd.live_reload:
+        httpd.notify_reload()
+    shown = ", ".join(names[:3]) + (f" (+{len(names) - 3})" if len(names) > 3 else "")
+    print(f"  [{datetime.now():%H:%M:%S}] {shown} -> {result} ({time.perf_counter() - start:.2f}s)")
 
 
 def cmd_stats():
     """Zeigt Statistiken an."""
-    articles = load_all_articles()
+    articles = load_article_index()
     used = load_used_topics()
     total_topics = len(WHISKY_TOPICS)
 
@@ -262,6 +699,19 @@ def cmd_stats():
         weeks = remaining / 3
         print(f"  Reicht noch fuer:    ca. {weeks:.0f} Wochen (bei 3/Woche)")
 
+    ledger = read_ledger()
+    if ledger:
+        today_tokens, today_cost = summarize(ledger, datetime.now().strftime("%Y-%m-%d"))
+        total_tokens, total_cost = summarize(ledger)
+        print(f"  Tokens heute:        {today_tokens} (ca. ${today_cost:.2f})")
+        print(f"  Tokens gesamt:       {total_tokens} (ca. ${total_cost:.2f})")
+
+    if (PROJECT_DIR / "jobs.jsonl").exists():
+        import job_queue
+        state = job_queue.counts()
+        print(f"  Job-Queue:           {state.get('queued', 0)} wartend, {state.get('in_progress', 0)} in Arbeit, "
+              f"{state.get('done', 0)} fertig, {state.get('failed', 0)} fehlgeschlagen")
+
     if articles:
         # Kategorien zaehlen
         cats = {}
@@ -293,6 +743,62 @@ def cmd_stats():
     print()
 
 
+def cmd_find_duplicates(config):
+    """Listet aehnliche Themen der Bibliothek, schon abgedeckte Themen und doppelte Artikel."""
+    import similarity
+    from site_builder import load_article
+
+    settings = config.get("content_settings", {})
+    topic_threshold = settings.get("similarity_threshold", similarity.DEFAULT_TOPIC_THRESHOLD)
+    text_threshold = settings.get("duplicate_threshold", similarity.DEFAULT_TEXT_THRESHOLD)
+
+    print(f"\n  Aehnliche Themen in der Bibliothek (ab {topic_threshold:.0%}):")
+    pairs = similarity.similar_topics(WHISKY_TOPICS, topic_threshold)
+    for score, a, b in pairs:
+        print(f"    {score:.0%}  {a}  <->  {b}")
+    if not pairs:
+        print("    keine")
+
+    print(f"\n  Freie Themen, die ein vorhandener Artikel schon abdeckt:")
+    guard = _topic_guard(config)
+    picker = _topic_picker()
+    covered = 0
+    for topic in WHISKY_TOPICS:
+        if picker.is_used(topic["title"]):
+            continue
+        matches = guard.check(topic)
+        if matches:
+            covered += 1
+            print(f"    {matches[0][0]:.0%}  {topic['title']}  ~  {matches[0][1]}")
+    if not covered:
+        print("    keine")
+
+    print(f"\n  Nahezu doppelte Artikel (Text, ab {text_threshold:.0%}):")
+    duplicates = similarity.duplicate_articles(load_article_index(), load_article, text_threshold)
+    for score, a, b in duplicates:
+        print(f"    {score:.0%}  {a}  <->  {b}")
+    if not duplicates:
+        print("    keine")
+    print()
+
+
+def cmd_import_articles():
+    """Packt alle articles/*.json in die Datenbank articles.db."""
+    count = article_db.import_json(ARTICLES_DIR)
+    print(f"\n  {count} Artikel nach {article_db.DB_PATH.name} uebernommen.")
+    print("  Ab jetzt wird nur noch articles.db gelesen und geschrieben.")
+    print("  Zurueck zum JSON-Layout: --export-articles und articles.db loeschen.\n")
+
+
+def cmd_export_articles():
+    """Schreibt alle Artikel aus articles.db als JSON-Dateien nach articles/."""
+    if not article_db.db_enabled():
+        print("\n  HINWEIS: Keine articles.db vorhanden - nichts zu exportieren.\n")
+        return
+    count = article_db.export_json(ARTICLES_DIR)
+    print(f"\n  {count} Artikel nach {ARTICLES_DIR} exportiert.\n")
+
+
 def _short_date(date_str):
     try:
         dt = datetime.strptime(date_str, "%Y-%m-%d")
@@ -305,13 +811,17 @@ def cmd_test(config):
     """Testet die OpenAI-Verbindung."""
     print("\n  Teste OpenAI API-Verbindung...")
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=config["openai"]["api_key"])
+        from api_client import get_client
+        from usage_ledger import UsageMeter, record_usage
+        client = get_client(config)
         response = client.chat.completions.create(
             model=config["openai"].get("model", "gpt-4o"),
             max_tokens=30,
             messages=[{"role": "user", "content": "Sage 'Slainte Mhath!' und erklaere es in einem Satz auf Deutsch."}],
         )
+        meter = UsageMeter(config)
+        meter.add(response, config["openai"].get("model", "gpt-4o"))
+        record_usage("test", "Verbindungstest", meter.totals(), config["openai"].get("model", "gpt-4o"))
         result = response.choices[0].message.content.strip()
         print(f"  OpenAI OK!")
         print(f"  Antwort: {result}")
@@ -327,7 +837,7 @@ def cmd_test(config):
 
 def interactive_menu(config):
     """Zeigt ein interaktives Menue."""
-    articles = load_all_articles()
+    articles = load_article_index()
 
     print(f"\n  Was moechtest du tun?\n")
     print(f"  [1] Verbindung testen")
@@ -369,6 +879,41 @@ def interactive_menu(config):
 # Eintrittspunkt
 # ============================================================
 
+def run_command(args, config):
+    """Fuehrt das per Kommandozeile gewaehlte Kommando aus (sonst das Menue)."""
+    if args.test:
+        cmd_test(config)
+    elif args.generate:
+        cmd_generate(config, args.count, concurrency=args.concurrency)
+    elif args.enqueue:
+        cmd_enqueue(config, args.count)
+    elif args.work:
+        cmd_work(config, concurrency=args.concurrency)
+    elif args.resume:
+        cmd_resume(config, concurrency=args.concurrency, force=args.force)
+    elif args.batch:
+        cmd_batch(config, args.count, local=args.local)
+    elif args.batch_collect:
+        cmd_batch_collect(config)
+    elif args.build:
+        cmd_build(config, incremental=args.incremental, jobs=args.jobs, precompress=args.precompress)
+    elif args.auto:
+        cmd_auto(config, args.count, jobs=args.jobs, concurrency=args.concurrency,
+                 precompress=args.precompress)
+    elif args.serve:
+        cmd_serve(config, port=args.port, bind=args.bind, watch=args.watch, on_demand=args.on_demand)
+    elif args.stats:
+        cmd_stats()
+    elif args.find_duplicates:
+        cmd_find_duplicates(config)
+    elif args.import_articles:
+        cmd_import_articles()
+    elif args.export_articles:
+        cmd_export_articles()
+    else:
+        interactive_menu(config)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Whisky Magazin - Automatischer Website-Generator",
@@ -376,11 +921,36 @@ def main():
     )
     parser.add_argument("--generate", action="store_true", help="Artikel generieren")
     parser.add_argument("--build", action="store_true", help="Website bauen")
+    parser.add_argument("--incremental", action="store_true", help="Nur geaenderte Seiten neu bauen")
+    parser.add_argument("--precompress", action="store_true", default=None,
+                        help="Nach dem Build .gz/.br-Dateien schreiben (auch: build.precompress)")
     parser.add_argument("--auto", action="store_true", help="Generieren + Bauen")
     parser.add_argument("--serve", action="store_true", help="Lokalen Webserver starten")
+    parser.add_argument("--port", type=int, help="Port fuer --serve (Standard 8080)")
+    parser.add_argument("--bind", default="", help="Adresse fuer --serve, z.B. 127.0.0.1 (Standard: alle)")
+    parser.add_argument("--watch", action="store_true", help="Mit --serve: bei Aenderungen neu bauen und Browser neu laden")
+    parser.add_argument("--on-demand", action="store_true", help="Mit --serve: Seiten beim Abruf rendern, ohne site/")
     parser.add_argument("--stats", action="store_true", help="Statistiken anzeigen")
     parser.add_argument("--test", action="store_true", help="Verbindung testen")
+    parser.add_argument("--find-duplicates", action="store_true", help="Aehnliche Themen und doppelte Artikel finden")
+    parser.add_argument("--import-articles", action="store_true", help="articles/*.json nach articles.db packen")
+    parser.add_argument("--export-articles", action="store_true", help="articles.db als JSON-Dateien exportieren")
     parser.add_argument("-n", "--count", type=int, default=1, help="Anzahl Artikel")
+    parser.add_argument("--concurrency", type=int, default=1, help="Parallele Artikel-Generierung")
+    parser.add_argument("--enqueue", action="store_true", help="Themen in die Job-Queue stellen")
+    parser.add_argument("--work", action="store_true", help="Job-Queue abarbeiten")
+    parser.add_argument("--resume", action="store_true", help="Job-Queue nach Absturz wieder aufnehmen")
+    parser.add_argument("--force", action="store_true", help="Mit --resume: auch Jobs mit laufender Lease zurueckholen")
+    parser.add_argument("--batch", action="store_true", help="Artikel ueber die OpenAI Batch API generieren")
+    parser.add_argument("--local", action="store_true", help="Batch sofort lokal abarbeiten (mit --batch)")
+    parser.add_argument("--batch-collect", action="store_true", help="Fertige Batches abholen und speichern")
+    parser.add_argument("--stream", action="store_true", help="Artikel streamen und mitschreiben (fortsetzbar)")
+    parser.add_argument("--no-cache", action="store_true", help="OpenAI-Antwort-Cache umgehen")
+    parser.add_argument("--max-tokens-per-run", type=int, help="Token-Budget fuer diesen Lauf")
+    parser.add_argument("--daily-token-budget", type=int, help="Token-Budget pro Tag (laut usage_ledger.jsonl)")
+    parser.add_argument("--jobs", type=int, default=1, help="Prozesse beim Website-Build (0 = alle Kerne)")
+    parser.add_argument("--profile", action="store_true", help="Zeitleiste und Profil-Tabelle nach .cache/profile/")
+    parser.add_argument("--cprofile", action="store_true", help="Mit --profile zusaetzlich cProfile-Daten schreiben")
 
     args = parser.parse_args()
 
@@ -391,21 +961,27 @@ def main():
     print("  +==========================================+")
 
     config = load_config()
-
-    if args.test:
-        cmd_test(config)
-    elif args.generate:
-        cmd_generate(config, args.count)
-    elif args.build:
-        cmd_build(config)
-    elif args.auto:
-        cmd_auto(config, args.count)
-    elif args.serve:
-        cmd_serve()
-    elif args.stats:
-        cmd_stats()
-    else:
-        interactive_menu(config)
+    if args.no_cache:
+        config["openai"]["cache"] = False
+    if args.stream:
+        config["openai"]["stream"] = True
+    if args.max_tokens_per_run is not None:
+        config["openai"]["max_tokens_per_run"] = args.max_tokens_per_run
+    if args.daily_token_budget is not None:
+        config["openai"]["daily_token_budget"] = args.daily_token_budget
+
+    profile = args.profile or args.cprofile
+    if profile:
+        profiling.enable(cprofile=args.cprofile)
+        # Per "from ... import" uebernommene Namen und die Kommandos selbst
+        module = sys.modules[__name__]
+        profiling.instrument(module, ["build_site", "load_article_index", "save_article"], "build")
+        profiling.instrument(module, [name for name in dir(module) if name.startswith("cmd_")])
+    try:
+        run_command(args, config)
+    finally:
+        if profile:
+            profiling.finish()
 
 
 if __name__ == "__main__":
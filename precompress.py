@@ -0,0 +1,137 @@
+"""
+Vorkomprimierung nach dem Build: Zu jeder Text-Datei in site/ (HTML, XML,
+CSS, JS, ...) wird ein datei.gz (gzip, Stufe 9) und - wenn das Paket
+`brotli` installiert ist - ein datei.br (Qualitaet 11) geschrieben. Der
+Vorschau-Server und Hoster, die vorkomprimierte Dateien unterstuetzen,
+liefern dann direkt die kleinen Bytes aus.
+
+Die hohen Stufen kosten Rechenzeit, deshalb laeuft das Komprimieren auf
+allen CPU-Kernen, und Dateien, deren Inhalt sich seit dem letzten Lauf nicht
+geaendert hat (Hash in site/.compress-manifest.json), werden uebersprungen.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_FILE = ".compress-manifest.json"
+TEXT_SUFFIXES = {".html", ".xml", ".css", ".js", ".json", ".txt", ".svg", ".webmanifest"}
+# Kleine Dateien passen ohnehin in ein Paket - Komprimieren bringt nichts
+MIN_SIZE = 256
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+CHUNK_SIZE = 64
+
+
+def _variants(use_brotli):
+    return (".gz", ".br") if use_brotli else (".gz",)
+
+
+def _compress_one(path, use_brotli):
+    """Schreibt die komprimierten Varianten einer Datei (mtime wie das Original)."""
+    data = Path(path).read_bytes()
+    stat = os.stat(path)
+    outputs = {".gz": gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)}
+    if use_brotli:
+        outputs[".br"] = brotli.compress(data, quality=BROTLI_QUALITY)
+    for suffix, compressed in outputs.items():
+        target = path + suffix
+        tmp = target + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp, target)
+        os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+
+def _compress_chunk(paths, use_brotli):
+    for path in paths:
+        _compress_one(path, use_brotli)
+    return len(paths)
+
+
+def _load_manifest(site_dir):
+    try:
+        with open(site_dir / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(site_dir, hashes):
+    path = site_dir / MANIFEST_FILE
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(hashes, sort_keys=True))
+    os.replace(tmp, path)
+
+
+def _text_files(site_dir):
+    for path in site_dir.rglob("*"):
+        if path.suffix in TEXT_SUFFIXES and not path.name.startswith(".") and path.is_file():
+            yield path
+
+
+def compress_site(site_dir, jobs=0, use_brotli=None):
+    """
+    Komprimiert alle geaenderten Text-Dateien unter `site_dir` in `jobs`
+    Prozessen (0 = alle Kerne) und loescht Varianten verwaister Dateien.
+    Gibt {"compressed", "unchanged", "removed", "brotli"} zurueck.
+    """
+    site_dir = Path(site_dir)
+    if use_brotli is None:
+        use_brotli = brotli is not None
+    elif use_brotli and brotli is None:
+        print("  HINWEIS: Paket 'brotli' nicht installiert - nur gzip.")
+        use_brotli = False
+    variants = _variants(use_brotli)
+
+    manifest = _load_manifest(site_dir)
+    hashes = {}
+    todo = []
+    unchanged = 0
+    for path in _text_files(site_dir):
+        rel = path.relative_to(site_dir).as_posix()
+        stat = path.stat()
+        if stat.st_size < MIN_SIZE:
+            continue
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        hashes[rel] = digest
+        targets = [Path(f"{path}{suffix}") for suffix in variants]
+        if manifest.get(rel) == digest and all(t.exists() for t in targets):
+            # Gleicher Inhalt, evtl. neu geschrieben: mtime nachziehen, sonst
+            # haelt der Vorschau-Server die Variante fuer veraltet
+            for target in targets:
+                os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            unchanged += 1
+        else:
+            todo.append(str(path))
+
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(todo) < 2 * CHUNK_SIZE:
+        _compress_chunk(todo, use_brotli)
+    else:
+        chunks = [todo[i:i + CHUNK_SIZE] for i in range(0, len(todo), CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            list(pool.map(_compress_chunk, chunks, [use_brotli] * len(chunks)))
+
+    # Varianten, deren Original fehlt, zu klein ist oder deren Art abgeschaltet wurde
+    removed = 0
+    for suffix in (".gz", ".br"):
+        for variant in site_dir.rglob(f"*{suffix}"):
+            original = variant.with_name(variant.name[:-len(suffix)])
+            rel = original.relative_to(site_dir).as_posix()
+            if rel not in hashes or suffix not in variants:
+                variant.unlink()
+                removed += 1
+
+    _save_manifest(site_dir, hashes)
+    return {"compressed": len(todo), "unchanged": unchanged, "removed": removed, "brotli": use_brotli}
@@ -0,0 +1,379 @@
+"""
+Vorschau-Server fuer site/ (--serve).
+
+Mehrere Anfragen gleichzeitig (ein Thread pro Verbindung, Keep-Alive),
+Dateien im Speicher (ungueltig, sobald sich Groesse oder mtime aendern),
+ETag/If-None-Match und Last-Modified/If-Modified-Since mit 304, Range-
+Anfragen (206) und vorkomprimierte Varianten (datei.br / datei.gz), wenn
+der Browser sie annimmt. Cache-Control kommt aus den Header-Regeln in
+vercel.json - lokal verhaelt sich die Seite wie online.
+
+Mit einem renderer (site_builder.OnDemandSite) werden die Seiten beim
+Abruf gerendert statt aus site/ gelesen; der ETag ist dann der Eingabe-Hash
+der Seite aus dem Build-Plan.
+
+Mit live_reload=True bekommt jede HTML-Seite beim Ausliefern ein kleines
+Skript, das ueber /__livereload (Server-Sent Events) auf notify_reload()
+wartet und die Seite dann neu laedt. In site/ landet davon nichts.
+"""
+
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+import webbrowser
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+PROJECT_DIR = Path(__file__).parent
+VERCEL_FILE = PROJECT_DIR / "vercel.json"
+
+DEFAULT_PORT = 8080
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+CACHE_MAX_FILE_BYTES = 4 * 1024 * 1024
+
+# Bevorzugte Reihenfolge der vorkomprimierten Varianten
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = function () {{ location.reload(); }};</script>'
+).encode("utf-8")
+LIVE_RELOAD_PING_SECONDS = 15
+
+mimetypes.add_type("image/svg+xml", ".svg")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+# ============================================================
+# Header-Regeln aus vercel.json
+# ============================================================
+
+def _source_regex(source):
+    """vercel-Quellmuster (/assets/(.*), /artikel/:slug) als regulaerer Ausdruck."""
+    pattern = re.sub(r":(\w+)\*", r"(?P<\1>.*)", source)
+    pattern = re.sub(r":(\w+)", r"(?P<\1>[^/]+)", pattern)
+    return re.compile(f"^{pattern}$")
+
+
+def load_header_rules(path=VERCEL_FILE):
+    """[(regex, {header: wert})] in Dateireihenfolge; fehlt die Datei, keine Regeln."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return []
+    rules = []
+    for rule in config.get("headers", []):
+        headers = {h["key"]: h["value"] for h in rule.get("headers", [])}
+        rules.append((_source_regex(rule["source"]), headers))
+    return rules
+
+
+def headers_for(rules, url_path):
+    """Alle passenden Regeln - spaetere ueberschreiben fruehere (wie bei Vercel)."""
+    headers = {}
+    for regex, values in rules:
+        if regex.match(url_path):
+            headers.update(values)
+    return headers
+
+
+# ============================================================
+# Datei-Cache
+# ============================================================
+
+class FileCache:
+    """
+    Haelt Dateiinhalte im Speicher (LRU bis max_bytes). Jeder Zugriff prueft
+    per stat(), ob die Datei noch dieselbe ist - nach einem Build wird also
+    nie veralteter Inhalt ausgeliefert.
+    """
+
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """(bytes, os.stat_result) oder None, wenn die Datei fehlt."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = str(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry[1], stat
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) <= CACHE_MAX_FILE_BYTES:
+            with self._lock:
+                old = self._entries.pop(key, None)
+                if old is not None:
+                    self.size -= len(old[1])
+                self._entries[key] = (signature, data)
+                self.size += len(data)
+                while self.size > self.max_bytes:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data, stat
+
+
+def _stat_tag(stat):
+    """ETag-Kern einer Datei aus Groesse und mtime (wie nginx)."""
+    return f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+
+
+def _accepts(header, encoding):
+    """True, wenn Accept-Encoding `encoding` mit q > 0 enthaelt."""
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == encoding:
+            match = re.search(r"q=([0-9.]+)", params)
+            return not match or float(match.group(1)) > 0
+    return False
+
+
+def parse_range(header, size):
+    """
+    Einfacher Bereich aus "bytes=a-b" / "bytes=a-" / "bytes=-n" als (start, ende)
+    inklusive - None bei ungueltiger Angabe (ganze Datei), "unsatisfiable",
+    wenn der Bereich ausserhalb der Datei liegt.
+    """
+    match = re.fullmatch(r"\s*bytes=(\d*)-(\d*)\s*", header or "")
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return "unsatisfiable"
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return "unsatisfiable"
+    return start, end
+
+
+# ============================================================
+# Server
+# ============================================================
+
+class PreviewHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "WhiskyMagazinPreview/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._serve(head=False)
+
+    def do_HEAD(self):
+        self._serve(head=True)
+
+    def _resolve(self, url_path):
+        """Pfad in site/ zur URL - oder None (auch bei Versuchen, site/ zu verlassen)."""
+        if "\\" in url_path or "\0" in url_path:
+            return None
+        parts = [p for p in posixpath.normpath(url_path).split("/") if p and p not in (".", "..")]
+        if any(":" in p for p in parts):
+            return None
+        path = Path(self.server.root, *parts)
+        if path.is_dir():
+            path = path / "index.html"
+        return path
+
+    def _serve(self, head):
+        url_path = unquote(urlsplit(self.path).path)
+        if url_path == LIVE_RELOAD_PATH and self.server.live_reload:
+            self._live_reload_stream()
+            return
+        renderer = self.server.renderer
+        path = stat = mtime = None
+        if renderer is not None:
+            rel = url_path.lstrip("/") + ("index.html" if url_path.endswith("/") else "")
+            page = renderer.get(rel)
+            if page is None:
+                self._not_found(head)
+                return
+            name, (data, fingerprint) = rel, page
+            tag = fingerprint[:20]
+        else:
+            path = self._resolve(url_path)
+            cached = self.server.cache.get(path) if path is not None and path.is_file() else None
+            if cached is None:
+                self._not_found(head)
+                return
+            name, (data, stat) = path.name, cached
+            tag, mtime = _stat_tag(stat), stat.st_mtime
+
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type in ("application/javascript", "application/json", "application/xml"):
+            content_type += "; charset=utf-8"
+
+        headers = headers_for(self.server.header_rules, url_path)
+        headers["Content-Type"] = content_type
+        if mtime is not None:
+            headers["Last-Modified"] = formatdate(mtime, usegmt=True)
+        headers["Vary"] = "Accept-Encoding"
+        headers["Accept-Ranges"] = "bytes"
+
+        range_header = self.headers.get("Range")
+        if self.server.live_reload and content_type.startswith("text/html"):
+            data = _inject_live_reload(data)
+            tag += "-lr"
+        elif path is not None and not range_header:
+            variant = self._compressed_variant(path, stat)
+            if variant is not None:
+                data, variant_stat, encoding = variant
+                headers["Content-Encoding"] = encoding
+                tag = f"{_stat_tag(variant_stat)}-{encoding}"
+        headers["ETag"] = f'"{tag}"'
+
+        if self._not_modified(headers["ETag"], mtime):
+            self._send(304, headers, b"", head=True)
+            return
+
+        if range_header and self._range_applies(headers["ETag"]):
+            span = parse_range(range_header, len(data))
+            if span == "unsatisfiable":
+                headers["Content-Range"] = f"bytes */{len(data)}"
+                self._send(416, headers, b"", head)
+                return
+            if span is not None:
+                start, end = span
+                headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                self._send(206, headers, data[start:end + 1], head)
+                return
+        self._send(200, headers, data, head)
+
+    def _compressed_variant(self, path, stat):
+        """Die .br/.gz-Datei daneben, wenn der Browser sie nimmt und sie nicht aelter ist."""
+        accept = self.headers.get("Accept-Encoding", "")
+        for encoding, suffix in ENCODINGS:
+            if not _accepts(accept, encoding):
+                continue
+            cached = self.server.cache.get(path.with_name(path.name + suffix))
+            if cached is not None and cached[1].st_mtime_ns >= stat.st_mtime_ns:
+                return cached[0], cached[1], encoding
+        return None
+
+    def _live_reload_stream(self):
+        """Haelt die Verbindung offen und meldet jeden Neubau als Event."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        version = self.server.reload_version
+        try:
+            while True:
+                version, changed = self.server.wait_for_reload(version, LIVE_RELOAD_PING_SECONDS)
+                self.wfile.write(b"data: reload\n\n" if changed else b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, OSError):
+            pass
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            return if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since and mtime is not None:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _range_applies(self, etag):
+        if_range = self.headers.get("If-Range")
+        return if_range is None or if_range.strip() == etag
+
+    def _not_found(self, head):
+        page = self.server.cache.get(Path(self.server.root) / "404.html")
+        body = page[0] if page else b"<h1>404 - Seite nicht gefunden</h1>"
+        self._send(404, {"Content-Type": "text/html; charset=utf-8", "Cache-Control": "no-store"}, body, head)
+
+    def _send(self, status, headers, body, head):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head and body:
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+
+def _inject_live_reload(html):
+    position = html.rfind(b"</body>")
+    if position < 0:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:position] + LIVE_RELOAD_SCRIPT + html[position:]
+
+
+class PreviewServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer mit Wurzelverzeichnis, Datei-Cache und Header-Regeln."""
+
+    daemon_threads = True
+
+    def __init__(self, root, host="", port=DEFAULT_PORT, handler=PreviewHandler, live_reload=False, renderer=None):
+        self.root = str(root)
+        self.cache = FileCache()
+        self.header_rules = load_header_rules()
+        self.live_reload = live_reload
+        # Mit renderer (site_builder.OnDemandSite) kommen die Seiten nicht aus site/
+        self.renderer = renderer
+        self.reload_version = 0
+        self._reload_condition = threading.Condition()
+        super().__init__((host, port), handler)
+
+    def notify_reload(self):
+        """Alle offenen Seiten neu laden lassen."""
+        with self._reload_condition:
+            self.reload_version += 1
+            self._reload_condition.notify_all()
+
+    def wait_for_reload(self, version, timeout):
+        """Wartet auf einen Neubau nach `version` -> (aktuelle Version, ob neu)."""
+        with self._reload_condition:
+            self._reload_condition.wait_for(lambda: self.reload_version != version, timeout)
+            return self.reload_version, self.reload_version != version
+
+
+def serve(httpd, open_browser=True):
+    """Startet den Vorschau-Server und blockiert bis Strg+C."""
+    host = httpd.server_address[0]
+    shown = "localhost" if host in ("", "0.0.0.0", "127.0.0.1") else host
+    url = f"http://{shown}:{httpd.server_address[1]}"
+    print(f"\n  Lokaler Webserver gestartet!")
+    print(f"  Oeffne im Browser: {url}")
+    print(f"  Druecke Strg+C zum Beenden.\n")
+    if open_browser:
+        webbrowser.open(url)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n  Server beendet.")
+    finally:
+        httpd.server_close()
@@ -0,0 +1,243 @@
+"""
+Profiling fuer alle Kommandos (--profile).
+
+Ist der Schalter aus, wird nichts veraendert - die Funktionen laufen
+unverpackt, die Kosten sind null. Mit enable() werden die wichtigen
+Funktionen (Artikel-Generierung, API-Aufrufe, Laden, build_*, Datei-
+Schreibzugriffe) durch Messhuellen ersetzt. finish() schreibt:
+
+  .cache/profile/trace-<zeit>.json   Zeitleiste im Chrome-Trace-Format
+                                     (chrome://tracing oder ui.perfetto.dev)
+  .cache/profile/trace-<zeit>.pstats cProfile-Daten (nur mit --cprofile)
+
+und druckt eine Tabelle der teuersten Abschnitte (nach Eigenzeit).
+Render-Prozesse (--jobs) schreiben ihre Abschnitte in Zwischendateien, die
+finish() einsammelt.
+"""
+
+import functools
+import importlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+PROFILE_DIR = PROJECT_DIR / ".cache" / "profile"
+SUMMARY_ROWS = 15
+
+# Modul -> (Kategorie, Funktionen)
+TARGETS = {
+    "content_generator": ("api", [
+        "generate_article", "_call_openai_with_retry", "_stream_with_checkpoint",
+        "_cancellable_completion", "_parse_meta",
+    ]),
+    "site_builder": ("build", [
+        "build_site", "load_all_articles", "load_article_index", "load_article",
+        "_read_index", "_write_index", "_plan_outputs", "_render_tasks", "_render_chunk",
+        "_render_output", "build_article_page", "build_index_page", "build_category_page",
+        "build_sitemap", "_write_output", "_load_manifest", "_save_manifest", "_remove_orphans",
+    ]),
+}
+
+_enabled = False
+_main_pid = os.getpid()
+_t0 = time.perf_counter_ns()
+_events = []
+_local = threading.local()
+_wrappers = {}
+_profiler = None
+_trace_path = None
+
+
+# ============================================================
+# Abschnitte
+# ============================================================
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Span:
+    """Misst einen Abschnitt; die Zeit verschachtelter Abschnitte zaehlt nicht als Eigenzeit."""
+
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args=None):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        _stack().append(0)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter_ns() - self.start
+        stack = _stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += duration
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": (self.start - _t0) / 1000,
+            "dur": duration / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": dict(self.args or {}, self_ms=round((duration - children) / 1e6, 3)),
+        }
+        _events.append(event)
+        if not stack and os.getpid() != _main_pid:
+            _flush_worker()
+        return False
+
+
+def _describe(args):
+    """Kurze Beschreibung des ersten Arguments (Artikel-Titel, Dateiname)."""
+    if not args:
+        return None
+    first = args[0]
+    if isinstance(first, dict) and "title" in first:
+        return {"title": first["title"]}
+    if isinstance(first, Path):
+        return {"file": first.name}
+    return None
+
+
+def _wrap(func, category):
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _Span(name, category, _describe(args)):
+            return func(*args, **kwargs)
+
+    wrapper._profiled = True
+    return wrapper
+
+
+def instrument(module, names, category="cmd"):
+    """
+    Ersetzt module.<name> durch eine Messhuelle. Dieselbe Funktion bekommt
+    ueberall dieselbe Huelle - auch per `from x import y` uebernommene Namen
+    lassen sich so nachtraeglich einbinden.
+    """
+    for name in names:
+        func = getattr(module, name, None)
+        if func is None or getattr(func, "_profiled", False):
+            continue
+        wrapper = _wrappers.get(func)
+        if wrapper is None:
+            wrapper = _wrappers[func] = _wrap(func, category)
+        setattr(module, name, wrapper)
+
+
+# ============================================================
+# Ein- und Ausschalten
+# ============================================================
+
+def _reset_after_fork():
+    global _events
+    _events = []
+    _local.stack = []
+
+
+def _spool_dir():
+    return PROFILE_DIR / f".parts-{_main_pid}"
+
+
+def _flush_worker():
+    """Render-Prozess: gesammelte Abschnitte an die Zwischendatei anhaengen."""
+    global _events
+    events, _events = _events, []
+    spool = _spool_dir()
+    spool.mkdir(parents=True, exist_ok=True)
+    with open(spool / f"{os.getpid()}.jsonl", "a", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+
+
+def enable(cprofile=False):
+    """Schaltet das Profiling ein und verpackt alle Funktionen aus TARGETS."""
+    global _enabled, _profiler, _trace_path
+    if _enabled:
+        return
+    _enabled = True
+    _trace_path = PROFILE_DIR / f"trace-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_reset_after_fork)
+    for module_name, (category, names) in TARGETS.items():
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            # z.B. openai nicht installiert - dann gibt es auch nichts zu messen
+            continue
+        instrument(module, names, category)
+    if cprofile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def _collect_workers():
+    spool = _spool_dir()
+    if not spool.exists():
+        return []
+    events = []
+    for part in spool.glob("*.jsonl"):
+        with open(part, "r", encoding="utf-8") as f:
+            events.extend(json.loads(line) for line in f if line.strip())
+    shutil.rmtree(spool, ignore_errors=True)
+    return events
+
+
+def summarize(events, limit=SUMMARY_ROWS):
+    """[(name, aufrufe, gesamt_ms, eigen_ms, max_ms)] nach Eigenzeit sortiert."""
+    rows = {}
+    for event in events:
+        row = rows.setdefault(event["name"], [0, 0.0, 0.0, 0.0])
+        row[0] += 1
+        row[1] += event["dur"] / 1000
+        row[2] += event["args"]["self_ms"]
+        row[3] = max(row[3], event["dur"] / 1000)
+    ordered = sorted(rows.items(), key=lambda item: item[1][2], reverse=True)
+    return [(name, *values) for name, values in ordered[:limit]]
+
+
+def finish():
+    """Schreibt Trace (und cProfile-Daten) und druckt die Zusammenfassung."""
+    global _profiler
+    if not _enabled:
+        return
+    if _profiler is not None:
+        _profiler.disable()
+    events = _events + _collect_workers()
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+
+    names = {_main_pid: "main.py"}
+    metadata = [
+        {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": names.get(pid, f"render {pid}")}}
+        for pid in sorted({event["pid"] for event in events})
+    ]
+    with open(_trace_path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": metadata + events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+
+    print("\n  Profil (teuerste Abschnitte nach Eigenzeit):")
+    print(f"  {'Abschnitt':<28} {'Aufrufe':>8} {'Gesamt ms':>11} {'Eigen ms':>10} {'Max ms':>9}")
+    for name, calls, total, own, longest in summarize(events):
+        print(f"  {name:<28} {calls:>8} {total:>11.1f} {own:>10.1f} {longest:>9.1f}")
+    print(f"\n  Zeitleiste: {_trace_path}")
+
+    if _profiler is not None:
+        stats_path = _trace_path.with_suffix(".pstats")
+        _profiler.dump_stats(str(stats_path))
+        _profiler = None
+        print(f"  cProfile:   {stats_path}")
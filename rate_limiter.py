@@ -0,0 +1,84 @@
+"""
+Rate-Limiter fuer die OpenAI API: Token-Buckets fuer Anfragen und Tokens
+pro Minute. Wird von allen Generierungs-Workern gemeinsam benutzt und
+ersetzt die feste Wartezeit zwischen zwei Artikeln.
+"""
+
+import threading
+import time
+
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_TOKENS_PER_MINUTE = 150000
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket: `rate` Einheiten pro Minute, Kapazitaet = rate."""
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Sekunden bis `amount` verfuegbar ist (0 = sofort)."""
+        self._refill(now)
+        # Anfragen groesser als die Kapazitaet duerfen bei vollem Bucket durch
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount):
+        self.level -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Begrenzt Anfragen und Tokens pro Minute. acquire() blockiert, bis beide
+    Buckets genug Guthaben haben, und ist thread-sicher.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        openai_cfg = config.get("openai", {})
+        return cls(
+            openai_cfg.get("requests_per_minute", DEFAULT_REQUESTS_PER_MINUTE),
+            openai_cfg.get("tokens_per_minute", DEFAULT_TOKENS_PER_MINUTE),
+        )
+
+    def acquire(self, tokens=0):
+        """Wartet, bis eine Anfrage mit `tokens` Tokens erlaubt ist."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = 0.0
+                if self.requests:
+                    wait = max(wait, self.requests.wait_time(1, now))
+                if self.tokens:
+                    wait = max(wait, self.tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    if self.requests:
+                        self.requests.take(1)
+                    if self.tokens:
+                        self.tokens.take(tokens)
+                    return
+            time.sleep(wait)
+
+
+def estimate_tokens(request):
+    """
+    Schaetzt den Token-Bedarf einer Chat-Anfrage so, wie OpenAI ihn fuer
+    das Rate-Limit ansetzt: Prompt (ca. 4 Zeichen pro Token) plus max_tokens.
+    """
+    prompt_chars = sum(len(m.get("content", "")) for m in request.get("messages", []))
+    return prompt_chars // 4 + request.get("max_tokens", 0)
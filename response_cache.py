@@ -0,0 +1,150 @@
+"""
+Antwort-Cache fuer OpenAI-Aufrufe: Jede Chat-Completion wird unter dem Hash
+ihrer Anfrage (Modell, Temperatur, max_tokens, Nachrichten) auf der Platte
+abgelegt. Wiederholte Laeufe - nach Abbruechen, bei Retries oder beim
+Entwickeln der Nachbearbeitung - bekommen die Antwort ohne neue Tokens.
+
+Eintraege gelten nur `ttl` Sekunden (openai.cache_ttl_hours, Standard 24):
+Ein Wiederanlauf am selben Tag trifft den Cache, ein bewusst neu generiertes
+Thema (z.B. nach einem neuen Themen-Durchgang) bekommt einen neuen Text.
+
+Die Groesse ist begrenzt; bei Ueberschreitung fliegen die am laengsten nicht
+benutzten Eintraege raus (LRU ueber die Aenderungszeit der Dateien).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+PROJECT_DIR = Path(__file__).parent
+CACHE_DIR = PROJECT_DIR / ".cache" / "openai"
+DEFAULT_MAX_MB = 200
+DEFAULT_TTL_HOURS = 24
+
+KEY_FIELDS = ("model", "temperature", "max_tokens", "messages")
+
+
+def completion_to_dict(response):
+    """Wandelt eine Chat-Completion (SDK-Objekt oder Fake) in ein JSON-Dict um."""
+    if hasattr(response, "model_dump"):
+        return response.model_dump()
+    usage = getattr(response, "usage", None)
+    return {
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": response.choices[0].message.content}}],
+        "usage": vars(usage) if usage is not None else None,
+    }
+
+
+def completion_from_dict(data):
+    """Macht aus dem Dict wieder ein Objekt mit .choices[0].message.content und .usage."""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{k: completion_from_dict(v) for k, v in data.items()})
+    if isinstance(data, list):
+        return [completion_from_dict(v) for v in data]
+    return data
+
+
+class ResponseCache:
+    """Inhaltsadressierter Platten-Cache mit Groessengrenze (thread-sicher)."""
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024,
+                 ttl=DEFAULT_TTL_HOURS * 3600, clock=time.time):
+        self.directory = Path(directory or CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    @staticmethod
+    def key(request):
+        """Hash ueber die Felder, die das Ergebnis bestimmen."""
+        relevant = {field: request.get(field) for field in KEY_FIELDS}
+        data = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def get(self, key):
+        """
+        Gespeicherte Antwort oder None (auch wenn aelter als ttl). Ein
+        Treffer zaehlt als Benutzung (LRU).
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Eintraege ohne Zeitstempel stammen aus aelteren Versionen - abgelaufen
+        cached_at = entry.get("cached_at") if isinstance(entry, dict) else None
+        if cached_at is None or (self.ttl is not None and self.clock() - cached_at > self.ttl):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return completion_from_dict(entry["response"])
+
+    def put(self, key, response):
+        path = self._path(key)
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"cached_at": self.clock(), "response": completion_to_dict(response)}, f, ensure_ascii=False)
+        with self._lock:
+            old = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)
+            self._size += path.stat().st_size - old
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Loescht die aeltesten Eintraege, bis der Cache auf 90 % der Grenze ist."""
+        entries = []
+        for p in self.directory.glob("*.json"):
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, p in entries:
+            if self._size <= target:
+                break
+            try:
+                p.unlink()
+                self._size -= size
+            except OSError:
+                pass
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def cache_from_config(config):
+    """
+    Der prozessweite Cache laut config.json - oder None, wenn abgeschaltet
+    (openai.cache = false bzw. --no-cache). openai.cache_ttl_hours = null
+    laesst Eintraege nie ablaufen.
+    """
+    openai_cfg = config.get("openai", {})
+    if not openai_cfg.get("cache", True):
+        return None
+    max_mb = openai_cfg.get("cache_max_mb", DEFAULT_MAX_MB)
+    ttl_hours = openai_cfg.get("cache_ttl_hours", DEFAULT_TTL_HOURS)
+    settings = (max_mb, ttl_hours)
+    with _caches_lock:
+        cache = _caches.get(settings)
+        if cache is None:
+            ttl = ttl_hours * 3600 if ttl_hours is not None else None
+            cache = _caches[settings] = ResponseCache(max_bytes=max_mb * 1024 * 1024, ttl=ttl)
+        return cache
@@ -0,0 +1,255 @@
+"""
+Retry-Strategie fuer die OpenAI API: Fehler werden nach Typ und HTTP-Status
+eingeordnet statt nach Text, Retry-After-Header werden befolgt, Wartezeiten
+bekommen vollen Jitter (kein Gleichschritt mehrerer Laeufe), und ein
+Circuit Breaker bricht nach wiederholten Serverfehlern sofort ab, statt pro
+Artikel minutenlang zu warten.
+
+Uhr, sleep und Zufall sind injizierbar - die Klassen lassen sich mit einem
+Fake-Client ohne echte Wartezeiten pruefen.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+import openai
+
+DEFAULT_MAX_ATTEMPTS = 4
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 60.0
+
+# Netzwerkfehler ohne HTTP-Status (auch mitten im Stream)
+TRANSIENT_ERRORS = (openai.APIConnectionError, httpx.TransportError, ConnectionError, TimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Der Circuit Breaker ist offen - es wird gar nicht erst angefragt."""
+
+
+# ============================================================
+# Fehler einordnen
+# ============================================================
+
+def classify(error):
+    """
+    Ordnet einen Fehler ein -> (wiederholbar, Stoerung bei OpenAI).
+    429 ist wiederholbar, zaehlt aber nicht fuer den Circuit Breaker;
+    ein aufgebrauchtes Kontingent (insufficient_quota) hilft kein Warten.
+    """
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int):
+        if status == 429:
+            return getattr(error, "code", None) != "insufficient_quota", False
+        if status in (408, 409):
+            return True, False
+        if status >= 500:
+            return True, True
+        return False, False
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True, True
+    return False, False
+
+
+def retry_after(error):
+    """Wartezeit in Sekunden aus Retry-After(-ms) der Fehlerantwort oder None."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+    headers = {key.lower(): value for key, value in headers.items()}
+    try:
+        if "retry-after-ms" in headers:
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            # HTTP-Datum statt Sekunden
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# ============================================================
+# Circuit Breaker
+# ============================================================
+
+class CircuitBreaker:
+    """
+    Oeffnet nach `threshold` Stoerungen in Folge fuer `cooldown` Sekunden.
+    Danach ist er halb offen: genau ein Aufrufer darf als Probe durch, alle
+    anderen warten weiter. Ein Erfolg der Probe schliesst ihn, eine Stoerung
+    oeffnet ihn sofort wieder. Meldet sich die Probe nicht zurueck (z.B.
+    Absturz des Threads), darf nach einem weiteren `cooldown` die naechste.
+    Thread-sicher, wird von allen Workern eines Laufs geteilt.
+    """
+
+    def __init__(self, threshold=DEFAULT_BREAKER_THRESHOLD, cooldown=DEFAULT_BREAKER_COOLDOWN, clock=time.monotonic):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started = None
+        self._lock = threading.Lock()
+
+    def _blocked(self, now):
+        """Sekunden bis zur naechsten erlaubten Anfrage (0 = Probe laeuft) oder None. Nur unter Lock."""
+        if self.opened_at is None:
+            return None
+        remaining = self.cooldown - (now - self.opened_at)
+        if remaining > 0:
+            return remaining
+        if self.probe_started is not None and now - self.probe_started < self.cooldown:
+            return 0
+        return None
+
+    def is_open(self):
+        """True, solange keine Anfrage durch darf (auch waehrend eine Probe laeuft)."""
+        with self._lock:
+            return self._blocked(self.clock()) is not None
+
+    def check(self):
+        """
+        Wirft CircuitOpenError, solange der Breaker offen ist. Im halb offenen
+        Zustand wird der erste Aufrufer zur Probe.
+        """
+        with self._lock:
+            now = self.clock()
+            remaining = self._blocked(now)
+            if remaining is None:
+                if self.opened_at is not None:
+                    self.probe_started = now
+                return
+            failures = self.failures
+        if remaining == 0:
+            raise CircuitOpenError("OpenAI gestoert - eine Testanfrage laeuft, bis dahin keine weiteren Anfragen.")
+        raise CircuitOpenError(
+            f"OpenAI gestoert ({failures} Fehler in Folge) - "
+            f"keine Anfragen fuer {remaining:.0f} Sekunden."
+        )
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_started = None
+
+    def record_response(self):
+        """
+        Fehlerantwort ohne Stoerung (z.B. 429, 400): OpenAI ist erreichbar.
+        Beendet eine laufende Probe wie ein Erfolg, aendert sonst nichts.
+        """
+        with self._lock:
+            if self.probe_started is not None:
+                self.failures = 0
+                self.opened_at = None
+                self.probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probe_started is not None or self.failures >= self.threshold:
+                self.opened_at = self.clock()
+                self.probe_started = None
+
+
+# ============================================================
+# Retry-Strategie
+# ============================================================
+
+class RetryPolicy:
+    """
+    Wiederholt voruebergehende Fehler bis zu `max_attempts` Versuche.
+    Wartezeit: Retry-After des Servers (hoechstens max_delay), sonst voller
+    Jitter (zufaellig zwischen 0 und min(max_delay, base_delay * 2^versuch)).
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, breaker=None, sleep=time.sleep, random=random.random):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker or CircuitBreaker()
+        self.sleep = sleep
+        self.random = random
+
+    def delay(self, attempt, error=None):
+        """Wartezeit vor dem Versuch nach `attempt` (0 = nach dem ersten Fehlschlag)."""
+        server_wait = retry_after(error)
+        if server_wait is not None:
+            # Gedeckelt, damit ein kaputter Header keinen Worker endlos blockiert;
+            # etwas Jitter obendrauf, damit nicht alle Worker gleichzeitig kommen
+            return min(server_wait, self.max_delay) + self.random() * self.base_delay
+        return self.random() * min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    def on_error(self, error, attempt):
+        """
+        Wertet den Fehlschlag von Versuch `attempt` (ab 1) aus. Gibt die
+        Wartezeit zurueck, wenn ein weiterer Versuch sinnvoll ist - sonst wird
+        der Fehler weitergeworfen (bzw. CircuitOpenError, wenn der Breaker
+        gerade aufgegangen ist).
+        """
+        retryable, upstream = classify(error)
+        if upstream:
+            self.breaker.record_failure()
+        elif getattr(error, "status_code", None) is not None:
+            self.breaker.record_response()
+        if not retryable or attempt >= self.max_attempts:
+            raise error
+        self.breaker.check()
+        return self.delay(attempt - 1, error)
+
+    def call(self, fn, label="API-Fehler"):
+        """Ruft fn() auf und wiederholt nach dieser Strategie."""
+        attempt = 0
+        while True:
+            self.breaker.check()
+            attempt += 1
+            try:
+                result = fn()
+            except Exception as e:
+                wait_time = self.on_error(e, attempt)
+                print(f"    {label} (Versuch {attempt}/{self.max_attempts}): {e}")
+                print(f"    Warte {wait_time:.1f} Sekunden...")
+                self.sleep(wait_time)
+                continue
+            self.breaker.record_success()
+            return result
+
+
+_policies = {}
+_policies_lock = threading.Lock()
+
+
+def policy_from_config(config):
+    """
+    Die prozessweite Retry-Strategie laut config.json (openai.max_retries,
+    retry_base_seconds, retry_max_seconds, breaker_threshold,
+    breaker_cooldown_seconds). Gleiche Einstellungen teilen sich einen Breaker.
+    """
+    openai_cfg = config.get("openai", {})
+    settings = (
+        openai_cfg.get("max_retries", DEFAULT_MAX_ATTEMPTS),
+        openai_cfg.get("retry_base_seconds", DEFAULT_BASE_DELAY),
+        openai_cfg.get("retry_max_seconds", DEFAULT_MAX_DELAY),
+        openai_cfg.get("breaker_threshold", DEFAULT_BREAKER_THRESHOLD),
+        openai_cfg.get("breaker_cooldown_seconds", DEFAULT_BREAKER_COOLDOWN),
+    )
+    with _policies_lock:
+        policy = _policies.get(settings)
+        if policy is None:
+            max_attempts, base, max_delay, threshold, cooldown = settings
+            policy = _policies[settings] = RetryPolicy(
+                max_attempts=max_attempts,
+                base_delay=base,
+                max_delay=max_delay,
+                breaker=CircuitBreaker(threshold, cooldown),
+            )
+        return policy
@@ -0,0 +1,268 @@
+"""
+Aehnlichkeits-Index mit MinHash und Locality-Sensitive Hashing (LSH).
+
+Themen (Titel + Tags) und Artikeltexte werden in Shingles zerlegt und auf
+eine kurze MinHash-Signatur abgebildet. Der LSH-Index teilt die Signatur in
+Baender; nur Eintraege, die in mindestens einem Band uebereinstimmen, werden
+verglichen - die Suche bleibt auch bei zehntausenden Themen unterlinear.
+
+Anwendungen:
+  - pick_next_topic() ueberspringt Themen, die einem vorhandenen Artikel zu
+    aehnlich sind, bevor Tokens ausgegeben werden
+  - --find-duplicates listet aehnliche Themen der Bibliothek und
+    nahezu doppelte Artikeltexte
+"""
+
+import hashlib
+import json
+import os
+import random
+import re
+from functools import lru_cache
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+NUM_PERM = 128
+TOPIC_BANDS = 42      # 42 x 3 Zeilen: ab 40 % Aehnlichkeit fast sicher Kandidat
+TEXT_BANDS = 64       # 64 x 2 Zeilen: ab 30 % Aehnlichkeit fast sicher Kandidat
+DEFAULT_TOPIC_THRESHOLD = 0.4
+DEFAULT_TEXT_THRESHOLD = 0.3
+
+SIGNATURE_CACHE = PROJECT_DIR / ".cache" / f"minhash-bodies-{NUM_PERM}.json"
+
+_MASK = (1 << 64) - 1
+_rng = random.Random(20240229)
+# Multiply-Shift-Hashfamilie, fest geseedet - Signaturen bleiben ueber Laeufe gleich
+_PERMUTATIONS = [(_rng.getrandbits(64) | 1, _rng.getrandbits(64)) for _ in range(NUM_PERM)]
+
+STOPWORDS = {
+    "der", "die", "das", "den", "dem", "des", "ein", "eine", "einer", "eines", "einem",
+    "und", "oder", "mit", "von", "vom", "fuer", "auf", "aus", "bei", "im", "in", "am",
+    "an", "zu", "zum", "zur", "ist", "sind", "was", "wie", "wo", "wer", "warum", "so",
+    "du", "dein", "deine", "dich", "dir", "man", "es", "sich", "nicht", "auch", "als",
+    "vs", "co", "ueber", "unter", "nach", "vor", "mehr", "alle", "alles", "the",
+}
+# Kommen in fast jedem Thema vor und sagen ueber den Inhalt nichts aus
+GENERIC_WORDS = {"whisky", "whiskey", "schottland", "tipp", "best", "wirklich", "brauch", "guide", "tasting"}
+
+_SUFFIXES = ("ern", "en", "er", "es", "e", "n", "s")
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+# ============================================================
+# Shingles und MinHash
+# ============================================================
+
+def _stem(word):
+    """Grobe Grundform: Destillerien/Destillerie, Islays/Islay."""
+    for suffix in _SUFFIXES:
+        if len(word) - len(suffix) >= 4 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def _words(text):
+    """Kleingeschriebene Wortstaemme ohne HTML, Umlaute und Fuellwoerter."""
+    text = re.sub(r"<[^>]+>", " ", text).lower().translate(_UMLAUTS)
+    return [_stem(w) for w in re.findall(r"[a-z0-9]+", text) if len(w) > 1 and w not in STOPWORDS]
+
+
+def topic_shingles(title, tags=()):
+    """Shingles eines Themas: die Woerter aus Titel und Tags."""
+    return set(_words(" ".join([title, *tags]))) - GENERIC_WORDS
+
+
+def jaccard(a, b):
+    """Exakte Jaccard-Aehnlichkeit zweier Mengen."""
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def text_shingles(html, size=3):
+    """Shingles eines Artikeltextes: Folgen von `size` Woertern."""
+    words = _words(html)
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _permuted(shingle):
+    """Die NUM_PERM Hashwerte eines Shingles."""
+    h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+    return tuple(((a * h + b) & _MASK) >> 32 for a, b in _PERMUTATIONS)
+
+
+# Titel-Woerter wiederholen sich staendig - ihre Hashwerte lohnen den Cache
+_permuted_word = lru_cache(maxsize=4096)(_permuted)
+
+
+def minhash(shingles, cached=False):
+    """MinHash-Signatur (NUM_PERM Werte) einer Shingle-Menge; None fuer leere Mengen."""
+    if not shingles:
+        return None
+    return tuple(map(min, zip(*map(_permuted_word if cached else _permuted, shingles))))
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Geschaetzte Jaccard-Aehnlichkeit zweier Signaturen (0..1)."""
+    return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+
+# ============================================================
+# LSH-Index
+# ============================================================
+
+class SimilarityIndex:
+    """
+    LSH ueber MinHash-Signaturen. add() und query() kosten pro Eintrag nur
+    `bands` Dict-Zugriffe plus den Vergleich mit den Kandidaten.
+    """
+
+    def __init__(self, bands=TOPIC_BANDS):
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.signatures = {}
+        self._buckets = [{} for _ in range(bands)]
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def add(self, key, signature):
+        if signature is None or key in self.signatures:
+            return
+        self.signatures[key] = signature
+        for band, band_key in self._band_keys(signature):
+            self._buckets[band].setdefault(band_key, []).append(key)
+
+    def __contains__(self, key):
+        return key in self.signatures
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def query(self, signature, threshold):
+        """[(aehnlichkeit, key)] aller Eintraege ab `threshold`, aehnlichste zuerst."""
+        if signature is None:
+            return []
+        candidates = set()
+        for band, band_key in self._band_keys(signature):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        matches = []
+        for key in candidates:
+            score = estimate_similarity(signature, self.signatures[key])
+            if score >= threshold:
+                matches.append((score, key))
+        matches.sort(reverse=True)
+        return matches
+
+    def pairs(self, threshold):
+        """Alle Paare ab `threshold` - ueber die Buckets, nicht ueber alle Paare."""
+        seen = set()
+        result = []
+        for buckets in self._buckets:
+            for keys in buckets.values():
+                for i, a in enumerate(keys):
+                    for b in keys[i + 1:]:
+                        pair = (a, b) if str(a) < str(b) else (b, a)
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        score = estimate_similarity(self.signatures[a], self.signatures[b])
+                        if score >= threshold:
+                            result.append((score, pair[0], pair[1]))
+        result.sort(reverse=True)
+        return result
+
+
+# ============================================================
+# Themen und Artikel
+# ============================================================
+
+def _topic_shingles(topic):
+    return topic_shingles(topic["title"], topic.get("tags", []))
+
+
+class TopicGuard:
+    """
+    Index der bereits geschriebenen Artikel (Titel + Tags aus dem
+    Metadaten-Index). check(topic) liefert die Artikel, denen ein Thema zu
+    aehnlich ist. Neue Artikel kommen per refresh() inkrementell dazu.
+    Die LSH-Kandidaten werden exakt nachgeprueft (Titel sind kurz).
+    """
+
+    def __init__(self, threshold=DEFAULT_TOPIC_THRESHOLD):
+        self.threshold = threshold
+        self.index = SimilarityIndex(TOPIC_BANDS)
+        self.titles = {}
+        self.shingles = {}
+
+    def refresh(self, entries):
+        for entry in entries:
+            key = entry.get("file") or entry.get("title")
+            if key in self.titles:
+                continue
+            self.titles[key] = entry.get("title", key)
+            self.shingles[key] = _topic_shingles(entry)
+            self.index.add(key, minhash(self.shingles[key], cached=True))
+
+    def check(self, topic):
+        """[(aehnlichkeit, artikeltitel)] ab der Schwelle, aehnlichste zuerst."""
+        shingles = _topic_shingles(topic)
+        # Etwas unter der Schwelle suchen: die Signatur ist nur eine Schaetzung
+        candidates = self.index.query(minhash(shingles, cached=True), self.threshold * 0.6)
+        matches = [(jaccard(shingles, self.shingles[key]), self.titles[key]) for _, key in candidates]
+        return sorted((m for m in matches if m[0] >= self.threshold), reverse=True)
+
+
+def _load_signature_cache():
+    try:
+        with open(SIGNATURE_CACHE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_signature_cache(cache):
+    SIGNATURE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SIGNATURE_CACHE.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp, SIGNATURE_CACHE)
+
+
+def duplicate_articles(entries, load_article, threshold=DEFAULT_TEXT_THRESHOLD):
+    """
+    Nahezu doppelte Artikeltexte: [(aehnlichkeit, datei_a, datei_b)].
+    Signaturen werden pro Inhalts-Hash in .cache/ gemerkt; nur neue oder
+    geaenderte Artikel werden neu gelesen. Artikel, die load_article nicht
+    mehr findet (None), werden uebersprungen.
+    """
+    cache = _load_signature_cache()
+    fresh = {}
+    index = SimilarityIndex(TEXT_BANDS)
+    for entry in entries:
+        cached = cache.get(entry["file"])
+        if cached is not None and cached[0] == entry.get("hash"):
+            signature = cached[1]
+        else:
+            article = load_article(entry)
+            if article is None:
+                continue
+            signature = minhash(text_shingles(article.get("html_content") or ""))
+        fresh[entry["file"]] = [entry.get("hash"), signature]
+        index.add(entry["file"], tuple(signature) if signature else None)
+    if fresh != cache:
+        _save_signature_cache(fresh)
+    return index.pairs(threshold)
+
+
+def similar_topics(topics, threshold=DEFAULT_TOPIC_THRESHOLD):
+    """Aehnliche Themen innerhalb der Bibliothek: [(aehnlichkeit, titel_a, titel_b)]."""
+    index = SimilarityIndex(TOPIC_BANDS)
+    shingles = {}
+    for topic in topics:
+        shingles[topic["title"]] = _topic_shingles(topic)
+        index.add(topic["title"], minhash(shingles[topic["title"]], cached=True))
+    pairs = [(jaccard(shingles[a], shingles[b]), a, b) for _, a, b in index.pairs(threshold * 0.6)]
+    return sorted((p for p in pairs if p[0] >= threshold), reverse=True)
@@ -3,13 +3,22 @@ Site Builder: Generiert eine komplette statische Website aus Artikel-Daten.
 Erstellt HTML-Seiten, Startseite, Kategorie-Seiten und Sitemap.
 """
 
+import hashlib
 import json
 import os
 import re
 import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+import article_db
+from file_lock import file_lock
+
 PROJECT_DIR = Path(__file__).parent
 SITE_DIR = PROJECT_DIR / "site"
 ARTICLES_DIR = PROJECT_DIR / "articles"
@@ -37,6 +46,372 @@ def _german_date(date_str):
         return date_str
 
 
+# ============================================================
+# Stylesheet (wird als eigene, per Hash versionierte Datei ausgeliefert)
+# ============================================================
+
+STYLESHEET = """:root {
+    --whisky-dark: #1a1209;
+    --whisky-brown: #3d2b1f;
+    --whisky-amber: #b8860b;
+    --whisky-gold: #d4a574;
+    --whisky-light: #f5e6d3;
+    --whisky-cream: #faf6f0;
+    --whisky-white: #fffdf9;
+    --text-primary: #2c2c2c;
+    --text-secondary: #5a5a5a;
+    --shadow-sm: 0 1px 3px rgba(0,0,0,0.08);
+    --shadow-md: 0 4px 12px rgba(0,0,0,0.1);
+    --shadow-lg: 0 8px 30px rgba(0,0,0,0.12);
+    --radius: 12px;
+}
+
+* { margin: 0; padding: 0; box-sizing: border-box; }
+
+body {
+    font-family: 'Georgia', 'Times New Roman', serif;
+    background: var(--whisky-cream);
+    color: var(--text-primary);
+    line-height: 1.8;
+    font-size: 17px;
+}
+
+/* --- HEADER --- */
+header {
+    background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 100%);
+    color: var(--whisky-gold);
+    padding: 0;
+    box-shadow: var(--shadow-lg);
+    position: sticky;
+    top: 0;
+    z-index: 100;
+}
+.header-inner {
+    max-width: 1100px;
+    margin: 0 auto;
+    padding: 15px 24px;
+    display: flex;
+    align-items: center;
+    justify-content: space-between;
+}
+.logo {
+    font-size: 1.6em;
+    font-weight: bold;
+    letter-spacing: 2px;
+    text-decoration: none;
+    color: var(--whisky-gold);
+}
+.logo span {
+    color: #fff;
+    font-weight: 300;
+}
+nav a {
+    color: var(--whisky-light);
+    text-decoration: none;
+    margin-left: 28px;
+    font-size: 0.9em;
+    letter-spacing: 0.5px;
+    transition: color 0.2s;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+}
+nav a:hover { color: var(--whisky-gold); }
+
+/* --- HERO (nur Startseite) --- */
+.hero {
+    background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 50%, var(--whisky-amber) 100%);
+    color: #fff;
+    text-align: center;
+    padding: 80px 24px 70px;
+}
+.hero h1 {
+    font-size: 2.8em;
+    margin-bottom: 12px;
+    letter-spacing: 3px;
+    font-weight: 400;
+}
+.hero p {
+    font-size: 1.15em;
+    opacity: 0.85;
+    max-width: 600px;
+    margin: 0 auto;
+}
+
+/* --- MAIN --- */
+.container {
+    max-width: 1100px;
+    margin: 0 auto;
+    padding: 40px 24px;
+}
+.content-grid {
+    display: grid;
+    grid-template-columns: 1fr 340px;
+    gap: 40px;
+}
+@media (max-width: 900px) {
+    .content-grid { grid-template-columns: 1fr; }
+}
+
+/* --- ARTIKELKARTEN (Startseite) --- */
+.article-card {
+    background: var(--whisky-white);
+    border-radius: var(--radius);
+    box-shadow: var(--shadow-sm);
+    overflow: hidden;
+    margin-bottom: 28px;
+    transition: box-shadow 0.3s, transform 0.2s;
+}
+.article-card:hover {
+    box-shadow: var(--shadow-md);
+    transform: translateY(-2px);
+}
+.article-card .card-body {
+    padding: 28px;
+}
+.card-meta {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+    font-size: 0.8em;
+    color: var(--text-secondary);
+    margin-bottom: 8px;
+    display: flex;
+    gap: 16px;
+}
+.card-meta .cat {
+    background: var(--whisky-light);
+    color: var(--whisky-brown);
+    padding: 2px 10px;
+    border-radius: 20px;
+    font-weight: 600;
+    font-size: 0.85em;
+}
+.article-card h2 {
+    font-size: 1.4em;
+    margin-bottom: 10px;
+    line-height: 1.3;
+}
+.article-card h2 a {
+    color: var(--whisky-brown);
+    text-decoration: none;
+}
+.article-card h2 a:hover {
+    color: var(--whisky-amber);
+}
+.article-card .teaser {
+    color: var(--text-secondary);
+    font-size: 0.95em;
+    margin-bottom: 16px;
+}
+.read-more {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+    color: var(--whisky-amber);
+    text-decoration: none;
+    font-weight: 600;
+    font-size: 0.9em;
+}
+.read-more:hover { text-decoration: underline; }
+
+/* --- ARTIKEL-SEITE --- */
+.article-header {
+    background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 100%);
+    color: #fff;
+    padding: 60px 24px 50px;
+    text-align: center;
+}
+.article-header h1 {
+    font-size: 2.2em;
+    max-width: 800px;
+    margin: 0 auto 16px;
+    line-height: 1.3;
+}
+.article-header .meta-line {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+    font-size: 0.85em;
+    opacity: 0.75;
+}
+.article-body {
+    background: var(--whisky-white);
+    border-radius: var(--radius);
+    box-shadow: var(--shadow-md);
+    padding: 48px;
+    margin-top: -30px;
+    position: relative;
+}
+.article-body h2 {
+    color: var(--whisky-brown);
+    font-size: 1.5em;
+    margin: 36px 0 16px;
+    padding-bottom: 8px;
+    border-bottom: 2px solid var(--whisky-light);
+}
+.article-body h3 {
+    color: var(--whisky-amber);
+    font-size: 1.2em;
+    margin: 28px 0 12px;
+}
+.article-body p { margin-bottom: 18px; }
+.article-body ul, .article-body ol {
+    margin: 16px 0;
+    padding-left: 28px;
+}
+.article-body li { margin-bottom: 8px; }
+.article-body blockquote {
+    border-left: 4px solid var(--whisky-amber);
+    background: var(--whisky-light);
+    padding: 20px 24px;
+    margin: 24px 0;
+    border-radius: 0 var(--radius) var(--radius) 0;
+    font-style: italic;
+    color: var(--whisky-brown);
+}
+.article-body a {
+    color: var(--whisky-amber);
+    text-decoration: underline;
+    text-decoration-color: var(--whisky-gold);
+}
+.article-body a:hover { color: var(--whisky-brown); }
+
+.affiliate-link {
+    background: linear-gradient(135deg, var(--whisky-light), var(--whisky-cream));
+    padding: 2px 6px;
+    border-radius: 4px;
+    text-decoration: none !important;
+    border-bottom: 2px solid var(--whisky-gold);
+}
+.affiliate-link:hover {
+    background: var(--whisky-gold);
+    color: #fff !important;
+}
+
+.related-box {
+    background: var(--whisky-light);
+    border-radius: var(--radius);
+    padding: 24px;
+    margin-top: 36px;
+    border: 1px solid var(--whisky-gold);
+}
+.related-box h3 {
+    color: var(--whisky-brown);
+    margin-bottom: 12px;
+    border: none;
+}
+
+/* --- SIDEBAR --- */
+.sidebar {
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+}
+.sidebar-box {
+    background: var(--whisky-white);
+    border-radius: var(--radius);
+    box-shadow: var(--shadow-sm);
+    padding: 24px;
+    margin-bottom: 24px;
+}
+.sidebar-box h3 {
+    color: var(--whisky-brown);
+    font-size: 1em;
+    margin-bottom: 14px;
+    padding-bottom: 8px;
+    border-bottom: 2px solid var(--whisky-light);
+    font-family: Georgia, serif;
+}
+.sidebar-box ul { list-style: none; padding: 0; }
+.sidebar-box li { margin-bottom: 10px; }
+.sidebar-box a {
+    color: var(--text-primary);
+    text-decoration: none;
+    font-size: 0.9em;
+}
+.sidebar-box a:hover { color: var(--whisky-amber); }
+
+.tag-cloud {
+    display: flex;
+    flex-wrap: wrap;
+    gap: 6px;
+}
+.tag {
+    background: var(--whisky-light);
+    color: var(--whisky-brown);
+    padding: 4px 12px;
+    border-radius: 20px;
+    font-size: 0.8em;
+    text-decoration: none;
+    transition: background 0.2s;
+}
+.tag:hover {
+    background: var(--whisky-gold);
+    color: #fff;
+}
+
+.cta-box {
+    background: linear-gradient(135deg, var(--whisky-brown) 0%, var(--whisky-dark) 100%);
+    color: var(--whisky-light);
+    border-radius: var(--radius);
+    padding: 28px;
+    text-align: center;
+}
+.cta-box h3 { color: var(--whisky-gold); border: none; }
+.cta-box p { font-size: 0.9em; margin: 10px 0 16px; opacity: 0.85; }
+.cta-box a {
+    display: inline-block;
+    background: var(--whisky-amber);
+    color: #fff;
+    padding: 10px 28px;
+    border-radius: 30px;
+    text-decoration: none;
+    font-weight: bold;
+    font-size: 0.9em;
+}
+.cta-box a:hover { background: var(--whisky-gold); }
+
+/* --- TAGS --- */
+.article-tags {
+    margin-top: 32px;
+    padding-top: 20px;
+    border-top: 1px solid var(--whisky-light);
+}
+
+/* --- FOOTER --- */
+footer {
+    background: var(--whisky-dark);
+    color: var(--whisky-gold);
+    text-align: center;
+    padding: 40px 24px;
+    margin-top: 60px;
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
+    font-size: 0.85em;
+}
+footer a { color: var(--whisky-gold); text-decoration: none; }
+footer a:hover { text-decoration: underline; }
+.footer-note {
+    opacity: 0.5;
+    font-size: 0.85em;
+    margin-top: 12px;
+}
+
+/* --- RESPONSIVE --- */
+@media (max-width: 600px) {
+    .hero h1 { font-size: 1.8em; }
+    .article-header h1 { font-size: 1.5em; }
+    .article-body { padding: 24px; }
+    .header-inner { flex-direction: column; gap: 12px; }
+    nav a { margin-left: 12px; }
+}
+"""
+
+
+def _stylesheet_path():
+    """Pfad des Stylesheets mit Inhalts-Hash, z.B. assets/site.1a2b3c4d5e.css."""
+    digest = hashlib.sha256(STYLESHEET.encode("utf-8")).hexdigest()[:10]
+    return f"assets/site.{digest}.css"
+
+
+# Cache-Regeln fuer Netlify/Cloudflare Pages (site/_headers). Gehashte Assets
+# aendern nie ihren Inhalt und duerfen ein Jahr gecacht werden; HTML bleibt
+# bei den Standardregeln der Hoster (revalidieren). vercel.json spiegelt das.
+HEADERS_FILE = """/assets/*
+  Cache-Control: public, max-age=31536000, immutable
+"""
+
+
 # ============================================================
 # HTML-Templates (eingebettet - keine externen Abhaengigkeiten)
 # ============================================================
@@ -55,353 +430,7 @@ def _base_template():
     <meta property="og:description" content="{og_description}">
     <meta property="og:type" content="article">
     <link rel="canonical" href="{canonical_url}">
-    <style>
-        :root {{
-            --whisky-dark: #1a1209;
-            --whisky-brown: #3d2b1f;
-            --whisky-amber: #b8860b;
-            --whisky-gold: #d4a574;
-            --whisky-light: #f5e6d3;
-            --whisky-cream: #faf6f0;
-            --whisky-white: #fffdf9;
-            --text-primary: #2c2c2c;
-            --text-secondary: #5a5a5a;
-            --shadow-sm: 0 1px 3px rgba(0,0,0,0.08);
-            --shadow-md: 0 4px 12px rgba(0,0,0,0.1);
-            --shadow-lg: 0 8px 30px rgba(0,0,0,0.12);
-            --radius: 12px;
-        }}
-
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-
-        body {{
-            font-family: 'Georgia', 'Times New Roman', serif;
-            background: var(--whisky-cream);
-            color: var(--text-primary);
-            line-height: 1.8;
-            font-size: 17px;
-        }}
-
-        /* --- HEADER --- */
-        header {{
-            background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 100%);
-            color: var(--whisky-gold);
-            padding: 0;
-            box-shadow: var(--shadow-lg);
-            position: sticky;
-            top: 0;
-            z-index: 100;
-        }}
-        .header-inner {{
-            max-width: 1100px;
-            margin: 0 auto;
-            padding: 15px 24px;
-            display: flex;
-            align-items: center;
-            justify-content: space-between;
-        }}
-        .logo {{
-            font-size: 1.6em;
-            font-weight: bold;
-            letter-spacing: 2px;
-            text-decoration: none;
-            color: var(--whisky-gold);
-        }}
-        .logo span {{
-            color: #fff;
-            font-weight: 300;
-        }}
-        nav a {{
-            color: var(--whisky-light);
-            text-decoration: none;
-            margin-left: 28px;
-            font-size: 0.9em;
-            letter-spacing: 0.5px;
-            transition: color 0.2s;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
-        nav a:hover {{ color: var(--whisky-gold); }}
-
-        /* --- HERO (nur Startseite) --- */
-        .hero {{
-            background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 50%, var(--whisky-amber) 100%);
-            color: #fff;
-            text-align: center;
-            padding: 80px 24px 70px;
-        }}
-        .hero h1 {{
-            font-size: 2.8em;
-            margin-bottom: 12px;
-            letter-spacing: 3px;
-            font-weight: 400;
-        }}
-        .hero p {{
-            font-size: 1.15em;
-            opacity: 0.85;
-            max-width: 600px;
-            margin: 0 auto;
-        }}
-
-        /* --- MAIN --- */
-        .container {{
-            max-width: 1100px;
-            margin: 0 auto;
-            padding: 40px 24px;
-        }}
-        .content-grid {{
-            display: grid;
-            grid-template-columns: 1fr 340px;
-            gap: 40px;
-        }}
-        @media (max-width: 900px) {{
-            .content-grid {{ grid-template-columns: 1fr; }}
-        }}
-
-        /* --- ARTIKELKARTEN (Startseite) --- */
-        .article-card {{
-            background: var(--whisky-white);
-            border-radius: var(--radius);
-            box-shadow: var(--shadow-sm);
-            overflow: hidden;
-            margin-bottom: 28px;
-            transition: box-shadow 0.3s, transform 0.2s;
-        }}
-        .article-card:hover {{
-            box-shadow: var(--shadow-md);
-            transform: translateY(-2px);
-        }}
-        .article-card .card-body {{
-            padding: 28px;
-        }}
-        .card-meta {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            font-size: 0.8em;
-            color: var(--text-secondary);
-            margin-bottom: 8px;
-            display: flex;
-            gap: 16px;
-        }}
-        .card-meta .cat {{
-            background: var(--whisky-light);
-            color: var(--whisky-brown);
-            padding: 2px 10px;
-            border-radius: 20px;
-            font-weight: 600;
-            font-size: 0.85em;
-        }}
-        .article-card h2 {{
-            font-size: 1.4em;
-            margin-bottom: 10px;
-            line-height: 1.3;
-        }}
-        .article-card h2 a {{
-            color: var(--whisky-brown);
-            text-decoration: none;
-        }}
-        .article-card h2 a:hover {{
-            color: var(--whisky-amber);
-        }}
-        .article-card .teaser {{
-            color: var(--text-secondary);
-            font-size: 0.95em;
-            margin-bottom: 16px;
-        }}
-        .read-more {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            color: var(--whisky-amber);
-            text-decoration: none;
-            font-weight: 600;
-            font-size: 0.9em;
-        }}
-        .read-more:hover {{ text-decoration: underline; }}
-
-        /* --- ARTIKEL-SEITE --- */
-        .article-header {{
-            background: linear-gradient(135deg, var(--whisky-dark) 0%, var(--whisky-brown) 100%);
-            color: #fff;
-            padding: 60px 24px 50px;
-            text-align: center;
-        }}
-        .article-header h1 {{
-            font-size: 2.2em;
-            max-width: 800px;
-            margin: 0 auto 16px;
-            line-height: 1.3;
-        }}
-        .article-header .meta-line {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            font-size: 0.85em;
-            opacity: 0.75;
-        }}
-        .article-body {{
-            background: var(--whisky-white);
-            border-radius: var(--radius);
-            box-shadow: var(--shadow-md);
-            padding: 48px;
-            margin-top: -30px;
-            position: relative;
-        }}
-        .article-body h2 {{
-            color: var(--whisky-brown);
-            font-size: 1.5em;
-            margin: 36px 0 16px;
-            padding-bottom: 8px;
-            border-bottom: 2px solid var(--whisky-light);
-        }}
-        .article-body h3 {{
-            color: var(--whisky-amber);
-            font-size: 1.2em;
-            margin: 28px 0 12px;
-        }}
-        .article-body p {{ margin-bottom: 18px; }}
-        .article-body ul, .article-body ol {{
-            margin: 16px 0;
-            padding-left: 28px;
-        }}
-        .article-body li {{ margin-bottom: 8px; }}
-        .article-body blockquote {{
-            border-left: 4px solid var(--whisky-amber);
-            background: var(--whisky-light);
-            padding: 20px 24px;
-            margin: 24px 0;
-            border-radius: 0 var(--radius) var(--radius) 0;
-            font-style: italic;
-            color: var(--whisky-brown);
-        }}
-        .article-body a {{
-            color: var(--whisky-amber);
-            text-decoration: underline;
-            text-decoration-color: var(--whisky-gold);
-        }}
-        .article-body a:hover {{ color: var(--whisky-brown); }}
-
-        .affiliate-link {{
-            background: linear-gradient(135deg, var(--whisky-light), var(--whisky-cream));
-            padding: 2px 6px;
-            border-radius: 4px;
-            text-decoration: none !important;
-            border-bottom: 2px solid var(--whisky-gold);
-        }}
-        .affiliate-link:hover {{
-            background: var(--whisky-gold);
-            color: #fff !important;
-        }}
-
-        .related-box {{
-            background: var(--whisky-light);
-            border-radius: var(--radius);
-            padding: 24px;
-            margin-top: 36px;
-            border: 1px solid var(--whisky-gold);
-        }}
-        .related-box h3 {{
-            color: var(--whisky-brown);
-            margin-bottom: 12px;
-            border: none;
-        }}
-
-        /* --- SIDEBAR --- */
-        .sidebar {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-        }}
-        .sidebar-box {{
-            background: var(--whisky-white);
-            border-radius: var(--radius);
-            box-shadow: var(--shadow-sm);
-            padding: 24px;
-            margin-bottom: 24px;
-        }}
-        .sidebar-box h3 {{
-            color: var(--whisky-brown);
-            font-size: 1em;
-            margin-bottom: 14px;
-            padding-bottom: 8px;
-            border-bottom: 2px solid var(--whisky-light);
-            font-family: Georgia, serif;
-        }}
-        .sidebar-box ul {{ list-style: none; padding: 0; }}
-        .sidebar-box li {{ margin-bottom: 10px; }}
-        .sidebar-box a {{
-            color: var(--text-primary);
-            text-decoration: none;
-            font-size: 0.9em;
-        }}
-        .sidebar-box a:hover {{ color: var(--whisky-amber); }}
-
-        .tag-cloud {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 6px;
-        }}
-        .tag {{
-            background: var(--whisky-light);
-            color: var(--whisky-brown);
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.8em;
-            text-decoration: none;
-            transition: background 0.2s;
-        }}
-        .tag:hover {{
-            background: var(--whisky-gold);
-            color: #fff;
-        }}
-
-        .cta-box {{
-            background: linear-gradient(135deg, var(--whisky-brown) 0%, var(--whisky-dark) 100%);
-            color: var(--whisky-light);
-            border-radius: var(--radius);
-            padding: 28px;
-            text-align: center;
-        }}
-        .cta-box h3 {{ color: var(--whisky-gold); border: none; }}
-        .cta-box p {{ font-size: 0.9em; margin: 10px 0 16px; opacity: 0.85; }}
-        .cta-box a {{
-            display: inline-block;
-            background: var(--whisky-amber);
-            color: #fff;
-            padding: 10px 28px;
-            border-radius: 30px;
-            text-decoration: none;
-            font-weight: bold;
-            font-size: 0.9em;
-        }}
-        .cta-box a:hover {{ background: var(--whisky-gold); }}
-
-        /* --- TAGS --- */
-        .article-tags {{
-            margin-top: 32px;
-            padding-top: 20px;
-            border-top: 1px solid var(--whisky-light);
-        }}
-
-        /* --- FOOTER --- */
-        footer {{
-            background: var(--whisky-dark);
-            color: var(--whisky-gold);
-            text-align: center;
-            padding: 40px 24px;
-            margin-top: 60px;
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
-            font-size: 0.85em;
-        }}
-        footer a {{ color: var(--whisky-gold); text-decoration: none; }}
-        footer a:hover {{ text-decoration: underline; }}
-        .footer-note {{
-            opacity: 0.5;
-            font-size: 0.85em;
-            margin-top: 12px;
-        }}
-
-        /* --- RESPONSIVE --- */
-        @media (max-width: 600px) {{
-            .hero h1 {{ font-size: 1.8em; }}
-            .article-header h1 {{ font-size: 1.5em; }}
-            .article-body {{ padding: 24px; }}
-            .header-inner {{ flex-direction: column; gap: 12px; }}
-            nav a {{ margin-left: 12px; }}
-        }}
-    </style>
+    <link rel="stylesheet" href="{base_url}/""" + _stylesheet_path() + """">
 </head>
 <body>
     <header>
@@ -429,11 +458,23 @@ def _base_template():
 # Seiten generieren
 # ============================================================
 
+def _article_files():
+    """Alle Artikel-Dateien im articles-Ordner (ohne versteckte Hilfsdateien)."""
+    return [p for p in ARTICLES_DIR.glob("*.json") if not p.name.startswith(".")]
+
+
 def load_all_articles():
-    """Laedt alle gespeicherten Artikel aus dem articles-Ordner."""
+    """
+    Laedt alle gespeicherten Artikel, neueste zuerst - aus articles.db,
+    falls die gepackte Ablage aktiv ist, sonst aus dem articles-Ordner.
+    """
+    if article_db.db_enabled():
+        with article_db.ArticleDB() as db:
+            return list(db.iter_articles())
+
     ARTICLES_DIR.mkdir(exist_ok=True)
     articles = []
-    for json_file in sorted(ARTICLES_DIR.glob("*.json"), reverse=True):
+    for json_file in sorted(_article_files(), reverse=True):
         try:
             with open(json_file, "r", encoding="utf-8") as f:
                 article = json.load(f)
@@ -443,8 +484,194 @@ def load_all_articles():
     return articles
 
 
-def build_article_page(article, config):
-    """Erstellt die HTML-Seite fuer einen einzelnen Artikel."""
+# ============================================================
+# Metadaten-Index (Listen, Statistik, Menue ohne Artikel-Inhalte)
+# ============================================================
+
+INDEX_FILE = ".meta-index.json"
+_index_lock = threading.Lock()
+
+
+@contextmanager
+def _locked_index():
+    """
+    Sperrt den Metadaten-Index fuer Lesen-Aendern-Schreiben - auch gegen
+    andere Prozesse (mehrere --work-Worker speichern gleichzeitig).
+    """
+    with _index_lock, file_lock(ARTICLES_DIR / (INDEX_FILE + ".lock")):
+        yield
+
+
+_body_db = threading.local()
+
+
+def _summary(article, filename, content_hash):
+    """
+    Die Felder eines Artikels, die Uebersichten brauchen - in derselben
+    Form wie ein Artikel, damit die Seiten-Builder beides verarbeiten.
+    """
+    meta = article.get("meta", {})
+    entry = {
+        "file": filename,
+        "hash": content_hash,
+        "title": article.get("title", ""),
+        "date": article.get("date", ""),
+        "category": article.get("category", "Allgemein"),
+        "tags": article.get("tags", []),
+        "meta": {
+            "slug": meta.get("slug", ""),
+            "teaser": meta.get("teaser", meta.get("meta_description", "")),
+        },
+    }
+    # Von der Job-Queue erzeugt: erkennt den Artikel beim Wiederanlauf
+    if article.get("job_id"):
+        entry["job_id"] = article["job_id"]
+    return entry
+
+
+def _read_index():
+    try:
+        with open(ARTICLES_DIR / INDEX_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(entries):
+    path = ARTICLES_DIR / INDEX_FILE
+    # Eigener Name pro Prozess und Thread - nie zwei Schreiber auf einer Datei
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    # dumps statt dump: nur der Einmal-Aufruf nutzt den schnellen C-Encoder
+    data = json.dumps(entries, ensure_ascii=False)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def update_article_index(filepath, article):
+    """Traegt einen gerade gespeicherten Artikel in den Metadaten-Index ein."""
+    filepath = Path(filepath)
+    stat = filepath.stat()
+    with _locked_index():
+        entries = _read_index()
+        entry = _summary(article, filepath.name, article_db.content_hash(article))
+        entry["stat"] = [stat.st_mtime_ns, stat.st_size]
+        entries[filepath.name] = entry
+        _write_index(entries)
+
+
+def load_article_index():
+    """
+    Liefert nur die Metadaten aller Artikel (Titel, Slug, Datum, Kategorie,
+    Tags, Teaser), neueste zuerst - ohne html_content.
+
+    JSON-Ablage: Die Sidecar-Datei articles/.meta-index.json wird ueber
+    Aenderungszeit und Groesse abgeglichen; nur neue oder geaenderte
+    Dateien werden geparst. Mit articles.db kommt alles aus der Datenbank.
+    """
+    if article_db.db_enabled():
+        with article_db.ArticleDB() as db:
+            return [_summary(a, a["file"], a["hash"]) for a in db.list_meta()]
+
+    ARTICLES_DIR.mkdir(exist_ok=True)
+    with _locked_index():
+        cached = _read_index()
+        entries = {}
+        changed = False
+        with os.scandir(ARTICLES_DIR) as it:
+            for dir_entry in it:
+                name = dir_entry.name
+                if not name.endswith(".json") or name.startswith("."):
+                    continue
+                stat = dir_entry.stat()
+                signature = [stat.st_mtime_ns, stat.st_size]
+                entry = cached.get(name)
+                if entry is None or entry.get("stat") != signature:
+                    try:
+                        with open(dir_entry.path, "r", encoding="utf-8") as f:
+                            article = json.load(f)
+                    except Exception as e:
+                        print(f"  Warnung: Konnte {name} nicht laden: {e}")
+                        continue
+                    entry = _summary(article, name, article_db.content_hash(article))
+                    entry["stat"] = signature
+                    changed = True
+                entries[name] = entry
+        if changed or len(entries) != len(cached):
+            _write_index(entries)
+    return [entries[name] for name in sorted(entries, reverse=True)]
+
+
+def load_article(entry):
+    """Laedt den kompletten Artikel (inkl. html_content) zu einem Index-Eintrag."""
+    if "html_content" in entry:
+        return entry
+    if article_db.db_enabled():
+        # Eine Verbindung pro Thread (SQLite-Verbindungen gehoeren dem
+        # Thread, der sie geoeffnet hat) und pro Prozess (nach fork() erbt
+        # ein Render-Worker den Thread-Speicher des Elternprozesses)
+        key = (os.getpid(), article_db.DB_PATH)
+        if getattr(_body_db, "key", None) != key:
+            _body_db.conn = article_db.ArticleDB()
+            _body_db.key = key
+        return _body_db.conn.get(entry["file"])
+    with open(ARTICLES_DIR / entry["file"], "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class ArticleStore:
+    """
+    Haelt alle Artikel eines Builds im Speicher.
+    Wird einmal pro Build geladen und an alle Seiten-Builder uebergeben;
+    die Sichten (neueste, pro Kategorie, pro Tag) werden einmal vorberechnet.
+    """
+
+    def __init__(self, articles, recent_count=5):
+        self.articles = list(articles)
+        self.recent = self.articles[:recent_count]
+        self.by_category = {}
+        self.by_tag = {}
+        self.category_counts = {}
+        for article in self.articles:
+            cat = article.get("category", "Allgemein")
+            self.by_category.setdefault(cat.lower(), []).append(article)
+            self.category_counts[cat] = self.category_counts.get(cat, 0) + 1
+            for tag in article.get("tags", []):
+                self.by_tag.setdefault(tag, []).append(article)
+
+    @classmethod
+    def load(cls):
+        """
+        Laedt den Metadaten-Index aller Artikel genau einmal.
+        Die Inhalte holt erst die jeweilige Artikelseite (load_article).
+        """
+        return cls(load_article_index())
+
+    def __len__(self):
+        return len(self.articles)
+
+    def __iter__(self):
+        return iter(self.articles)
+
+    def in_category(self, category_name):
+        return self.by_category.get(category_name.lower(), [])
+
+    def tags(self):
+        return sorted(self.by_tag)
+
+
+def _as_store(articles):
+    """Akzeptiert eine Artikelliste oder einen ArticleStore."""
+    if isinstance(articles, ArticleStore):
+        return articles
+    return ArticleStore(articles)
+
+
+def build_article_page(article, config, store=None):
+    """
+    Erstellt die HTML-Seite fuer einen einzelnen Artikel.
+    `store` ist der ArticleStore des Builds; ohne ihn wird einmalig geladen.
+    """
     base_url = config["site"].get("base_url", "")
     site_name = config["site"]["name"]
     meta = article.get("meta", {})
@@ -458,9 +685,10 @@ def build_article_page(article, config):
         tags_html = f'<div class="article-tags"><div class="tag-cloud">{tag_links}</div></div>'
 
     # Sidebar mit neuesten Artikeln
-    all_articles = load_all_articles()
+    if store is None:
+        store = ArticleStore.load()
     recent_html = ""
-    for a in all_articles[:5]:
+    for a in store.recent:
         if a.get("meta", {}).get("slug") != meta.get("slug"):
             s = a.get("meta", {}).get("slug", "")
             t = a["title"]
@@ -515,10 +743,11 @@ def build_index_page(articles, config):
     base_url = config["site"].get("base_url", "")
     site_name = config["site"]["name"]
     tagline = config["site"]["tagline"]
+    store = _as_store(articles)
 
     # Artikelkarten
     cards_html = ""
-    for article in articles[:12]:
+    for article in store.articles[:12]:
         meta = article.get("meta", {})
         slug = meta.get("slug", "")
         teaser = meta.get("teaser", meta.get("meta_description", ""))
@@ -539,20 +768,12 @@ def build_index_page(articles, config):
         </div>"""
 
     # Sidebar: Kategorien + Tags
-    categories = {}
-    all_tags = set()
-    for a in articles:
-        cat = a.get("category", "Allgemein")
-        categories[cat] = categories.get(cat, 0) + 1
-        for tag in a.get("tags", []):
-            all_tags.add(tag)
-
     cat_html = ""
-    for cat_name, count in sorted(categories.items()):
+    for cat_name, count in sorted(store.category_counts.items()):
         cat_slug = cat_name.lower()
         cat_html += f'<li><a href="{base_url}/kategorie/{cat_slug}.html">{cat_name} ({count})</a></li>\n'
 
-    tags_html = " ".join(f'<span class="tag">{t}</span>' for t in sorted(all_tags)[:20])
+    tags_html = " ".join(f'<span class="tag">{t}</span>' for t in store.tags()[:20])
 
     content = f"""
     <div class="hero">
@@ -608,7 +829,7 @@ def build_category_page(category_name, articles, config):
     base_url = config["site"].get("base_url", "")
     site_name = config["site"]["name"]
 
-    filtered = [a for a in articles if a.get("category", "").lower() == category_name.lower()]
+    filtered = _as_store(articles).in_category(category_name)
 
     cards_html = ""
     for article in filtered:
@@ -679,62 +900,390 @@ def build_sitemap(articles, config):
 {xml_entries}</urlset>"""
 
 
+# ============================================================
+# Inkrementeller Build (Manifest mit Eingabe-Hashes)
+# ============================================================
+
+# Erhoehen, wenn sich das Markup der Seiten-Builder aendert -
+# erzwingt beim naechsten inkrementellen Build den Neuaufbau aller Seiten.
+TEMPLATE_VERSION = 3
+MANIFEST_FILE = ".build-manifest.json"
+DEFAULT_CATEGORIES = ["Whisky", "Reise", "Lifestyle", "Natur", "Urlaub"]
+
+
+def _hash(value):
+    """Stabiler SHA-256 ueber einen JSON-serialisierbaren Wert."""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _article_fingerprint(article):
+    """Hash ueber den kompletten Artikelinhalt (aus dem Index, falls vorhanden)."""
+    if "hash" in article and "html_content" not in article:
+        return article["hash"]
+    return article_db.content_hash(article)
+
+
+def _listing_entry(article):
+    """Die Felder eines Artikels, die auf Uebersichtsseiten erscheinen."""
+    meta = article.get("meta", {})
+    return [
+        article.get("title", ""),
+        meta.get("slug", ""),
+        meta.get("teaser", meta.get("meta_description", "")),
+        article.get("date", ""),
+        article.get("category", "Allgemein"),
+        article.get("tags", []),
+    ]
+
+
+def _config_inputs(config):
+    """Die Konfigurationswerte, die in die Seiten einfliessen."""
+    affiliate = config.get("affiliate_links", {})
+    return {
+        "site": config["site"],
+        "amazon_tag": affiliate.get("amazon_tag"),
+        "faehre": affiliate.get("travel_links", {}).get("faehre"),
+    }
+
+
+def _plan_outputs(store, config):
+    """
+    Bestimmt alle Ausgabedateien samt Hash ihrer Eingaben
+    (Artikel-JSON, relevante Config-Werte, Template-Version).
+    Gibt {relativer Pfad: (hash, art, schluessel)} zurueck; der Schluessel
+    einer Artikelseite ist die Position im Store (billig an Worker zu senden).
+    """
+    # Einmal gehasht statt in jeden Seiten-Hash neu serialisiert
+    shared = _hash([_config_inputs(config), TEMPLATE_VERSION, _hash(_base_template())])
+    plan = {}
+
+    # Die Sidebar "Neueste Artikel" gehoert zu den Eingaben jeder Artikelseite;
+    # nur die neuesten Artikel selbst sehen eine andere Liste (ohne sich).
+    # Eine Seite wird also nur neu gebaut, wenn sich ihre angezeigte Liste
+    # aendert - ein neuer neuester Artikel betrifft alle, ein aelterer keine.
+    recent_all = [[a["title"], a.get("meta", {}).get("slug", "")] for a in store.recent]
+    recent_key = _hash(recent_all)
+    recent_slugs = {slug for _, slug in recent_all}
+
+    for position, article in enumerate(store):
+        slug = article.get("meta", {}).get("slug", "")
+        if not slug:
+            continue
+        recent = recent_key
+        if slug in recent_slugs:
+            recent = _hash([entry for entry in recent_all if entry[1] != slug])
+        fingerprint = _hash([shared, _article_fingerprint(article), recent])
+        plan[f"artikel/{slug}.html"] = (fingerprint, "article", position)
+
+    index_inputs = [
+        [_listing_entry(a) for a in store.articles[:12]],
+        store.category_counts,
+        store.tags()[:20],
+    ]
+    plan["index.html"] = (_hash([shared, index_inputs]), "index", None)
+
+    categories = set(store.category_counts)
+    # Standard-Kategorien immer erstellen
+    categories.update(DEFAULT_CATEGORIES)
+    for cat in sorted(categories):
+        listing = [_listing_entry(a) for a in store.in_category(cat)]
+        plan[f"kategorie/{cat.lower()}.html"] = (_hash([shared, cat, listing]), "category", cat)
+
+    slugs = [a.get("meta", {}).get("slug", "") for a in store]
+    plan["sitemap.xml"] = (_hash([config["site"].get("base_url", ""), slugs]), "sitemap", None)
+
+    # Statische Assets: der Inhalt ist zugleich der Schluessel
+    plan[_stylesheet_path()] = (_hash(STYLESHEET), "asset", STYLESHEET)
+    plan["_headers"] = (_hash(HEADERS_FILE), "asset", HEADERS_FILE)
+    return plan
+
+
+def _render_output(kind, key, store, config):
+    """Rendert eine einzelne Ausgabedatei aus dem Build-Plan."""
+    if kind == "article":
+        return build_article_page(load_article(store.articles[key]), config, store=store)
+    if kind == "index":
+        return build_index_page(store, config)
+    if kind == "category":
+        return build_category_page(key, store, config)
+    if kind == "asset":
+        return key
+    return build_sitemap(store, config)
+
+
+def _load_manifest():
+    """Laedt das Build-Manifest ({Pfad: Eingabe-Hash}) aus dem site-Ordner."""
+    try:
+        with open(SITE_DIR / MANIFEST_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("outputs", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(outputs):
+    """Schreibt das Build-Manifest atomar."""
+    path = SITE_DIR / MANIFEST_FILE
+    tmp = path.with_suffix(".tmp")
+    data = json.dumps({"template_version": TEMPLATE_VERSION, "outputs": outputs}, sort_keys=True)
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _write_output(filepath, text):
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _remove_orphans(plan, manifest):
+    """
+    Loescht Seiten, zu denen es keinen Artikel bzw. keine Kategorie mehr
+    gibt - samt ihrer vorkomprimierten .gz/.br-Dateien (precompress.py).
+    """
+    candidates = set(manifest)
+    for folder, pattern in (("artikel", "*.html"), ("kategorie", "*.html"), ("assets", "site.*.css")):
+        candidates.update(f"{folder}/{p.name}" for p in (SITE_DIR / folder).glob(pattern))
+    removed = 0
+    for rel in sorted(candidates - set(plan)):
+        target = SITE_DIR / rel
+        if target.exists():
+            target.unlink()
+            removed += 1
+        for suffix in (".gz", ".br"):
+            variant = target.with_name(target.name + suffix)
+            if variant.exists():
+                variant.unlink()
+    return removed
+
+
+# ============================================================
+# Paralleles Rendern
+# ============================================================
+
+KIND_LABELS = {
+    "article": "Artikelseiten",
+    "index": "Startseite",
+    "category": "Kategorieseiten",
+    "sitemap": "Sitemap",
+    "asset": "Assets",
+}
+
+_worker_state = {}
+
+
+class _PhaseTimer:
+    """Sammelt die Laufzeit pro Build-Phase."""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def report(self):
+        parts = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.phases.items())
+        print(f"  Zeiten: {parts}")
+
+
+def _render_chunk(tasks, store, config):
+    """Rendert und schreibt eine Liste von (Pfad, Art, Schluessel)-Aufgaben."""
+    totals = {}
+    for rel, kind, key in tasks:
+        start = time.perf_counter()
+        _write_output(SITE_DIR / rel, _render_output(kind, key, store, config))
+        count, seconds = totals.get(kind, (0, 0.0))
+        totals[kind] = (count + 1, seconds + time.perf_counter() - start)
+    return totals
+
+
+def _init_render_worker(store, config, site_dir):
+    """Initialisiert einen Worker-Prozess einmalig mit Store und Config."""
+    global SITE_DIR
+    SITE_DIR = site_dir
+    _worker_state["store"] = store
+    _worker_state["config"] = config
+
+
+def _render_chunk_in_worker(tasks):
+    return _render_chunk(tasks, _worker_state["store"], _worker_state["config"])
+
+
+def _render_tasks(tasks, store, config, jobs=1):
+    """
+    Rendert alle Aufgaben - seriell oder in `jobs` Prozessen mit
+    gebuendelten Aufgabenpaketen. Jede Ausgabedatei haengt nur von ihren
+    Eingaben ab, daher ist das Ergebnis unabhaengig von der Reihenfolge.
+    Gibt {art: (anzahl, sekunden)} zurueck.
+    """
+    if jobs <= 1 or len(tasks) < 2 * jobs:
+        return _render_chunk(tasks, store, config)
+
+    chunk_size = max(1, min(256, len(tasks) // (jobs * 4)))
+    chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+    totals = {}
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_render_worker,
+        initargs=(store, config, SITE_DIR),
+    ) as pool:
+        for result in pool.map(_render_chunk_in_worker, chunks):
+            for kind, (count, seconds) in result.items():
+                prev_count, prev_seconds = totals.get(kind, (0, 0.0))
+                totals[kind] = (prev_count + count, prev_seconds + seconds)
+    return totals
+
+
 # ============================================================
 # Haupt-Build-Funktion
 # ============================================================
 
-def build_site(config):
-    """Baut die komplette Website neu auf."""
-    print("\n  Website wird gebaut...")
+def build_site(config, incremental=False, jobs=1, stats=None, precompress=None):
+    """
+    Baut die Website auf.
+    Mit incremental=True werden nur Seiten neu geschrieben, deren Eingaben
+    sich laut Manifest seit dem letzten Build geaendert haben.
+    Mit jobs > 1 wird auf mehrere Prozesse verteilt (0 = alle CPU-Kerne).
+    Mit precompress=True (Standard: config["build"]["precompress"]) werden
+    danach .gz/.br-Dateien neben die Text-Dateien gelegt (precompress.py).
+    Ein uebergebenes Dict `stats` wird mit Zeiten und Seitenzahlen gefuellt
+    (fuer benchmark.py).
+    """
+    if precompress is None:
+        precompress = config.get("build", {}).get("precompress", False)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    print("\n  Website wird gebaut..." if not incremental else "\n  Website wird inkrementell gebaut...")
+    timer = _PhaseTimer()
 
     # Verzeichnisse erstellen
     SITE_DIR.mkdir(exist_ok=True)
     (SITE_DIR / "artikel").mkdir(exist_ok=True)
     (SITE_DIR / "kategorie").mkdir(exist_ok=True)
+    (SITE_DIR / "assets").mkdir(exist_ok=True)
 
-    # Alle Artikel laden
-    articles = load_all_articles()
+    # Alle Artikel einmal laden - alle Seiten arbeiten auf diesem Store
+    with timer.phase("Laden"):
+        articles = ArticleStore.load()
     print(f"  {len(articles)} Artikel gefunden.")
 
     if not articles:
         print("  HINWEIS: Noch keine Artikel vorhanden.")
         print("  Generiere zuerst Artikel mit Option [2] oder [3].")
 
-    # 1. Artikelseiten erstellen
-    for article in articles:
-        slug = article.get("meta", {}).get("slug", "")
-        if not slug:
-            continue
-        html = build_article_page(article, config)
-        filepath = SITE_DIR / "artikel" / f"{slug}.html"
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html)
-    print(f"  {len(articles)} Artikelseiten erstellt.")
-
-    # 2. Startseite erstellen
-    index_html = build_index_page(articles, config)
-    with open(SITE_DIR / "index.html", "w", encoding="utf-8") as f:
-        f.write(index_html)
-    print("  Startseite erstellt.")
-
-    # 3. Kategorieseiten erstellen
-    categories = set(a.get("category", "Allgemein") for a in articles)
-    # Standard-Kategorien immer erstellen
-    categories.update(["Whisky", "Reise", "Lifestyle", "Natur", "Urlaub"])
-    for cat in categories:
-        cat_html = build_category_page(cat, articles, config)
-        filepath = SITE_DIR / "kategorie" / f"{cat.lower()}.html"
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(cat_html)
-    print(f"  {len(categories)} Kategorieseiten erstellt.")
-
-    # 4. Sitemap erstellen
-    sitemap_xml = build_sitemap(articles, config)
-    with open(SITE_DIR / "sitemap.xml", "w", encoding="utf-8") as f:
-        f.write(sitemap_xml)
-    print("  Sitemap erstellt.")
+    with timer.phase("Planen"):
+        manifest = _load_manifest()
+        plan = _plan_outputs(articles, config)
+        unchanged = {kind: 0 for kind in KIND_LABELS}
+        tasks = []
+        for rel, (fingerprint, kind, key) in plan.items():
+            if incremental and manifest.get(rel) == fingerprint and (SITE_DIR / rel).exists():
+                unchanged[kind] += 1
+            else:
+                tasks.append((rel, kind, key))
+
+    label = f"Rendern ({jobs} Prozesse)" if jobs > 1 else "Rendern"
+    with timer.phase(label):
+        results = _render_tasks(tasks, articles, config, jobs)
+    written = {kind: results.get(kind, (0, 0.0))[0] for kind in KIND_LABELS}
+    for kind, (_, seconds) in results.items():
+        timer.add(KIND_LABELS[kind], seconds)
+
+    with timer.phase("Aufraeumen"):
+        removed = _remove_orphans(plan, manifest)
+        _save_manifest({rel: entry[0] for rel, entry in plan.items()})
+
+    compressed = None
+    if precompress:
+        import precompress as precompress_module
+        with timer.phase("Komprimieren"):
+            # Ohne --jobs alle Kerne - die hohen Stufen sind CPU-lastig
+            compressed = precompress_module.compress_site(SITE_DIR, jobs=jobs if jobs > 1 else 0)
+
+    suffix = lambda kind: f" ({unchanged[kind]} unveraendert)" if incremental else ""
+    print(f"  {written['article']} Artikelseiten erstellt.{suffix('article')}")
+    print("  Startseite erstellt." if written["index"] else "  Startseite unveraendert.")
+    print(f"  {written['category']} Kategorieseiten erstellt.{suffix('category')}")
+    print("  Sitemap erstellt." if written["sitemap"] else "  Sitemap unveraendert.")
+    if removed:
+        print(f"  {removed} verwaiste Seiten entfernt.")
+    if compressed is not None:
+        formats = "gzip + brotli" if compressed["brotli"] else "gzip"
+        print(f"  {compressed['compressed']} Dateien komprimiert ({formats}, "
+              f"{compressed['unchanged']} unveraendert).")
+    timer.report()
+    if stats is not None:
+        stats.update({
+            "articles": len(articles),
+            "phases": {
+                "load": timer.phases["Laden"],
+                "plan": timer.phases["Planen"],
+                "render": timer.phases[label],
+                "cleanup": timer.phases["Aufraeumen"],
+                "compress": timer.phases.get("Komprimieren", 0.0),
+            },
+            "pages": {kind: results.get(kind, (0, 0.0)) for kind in KIND_LABELS},
+            "unchanged": unchanged,
+            "removed": removed,
+        })
 
     print(f"\n  Website bereit unter: {SITE_DIR}")
     print(f"  Oeffne {SITE_DIR / 'index.html'} im Browser um sie zu sehen!")
 
     return str(SITE_DIR)
+
+
+# ============================================================
+# Seiten auf Abruf (Vorschau ohne site/)
+# ============================================================
+
+class OnDemandSite:
+    """
+    Rendert einzelne Seiten erst, wenn sie angefragt werden - fuer
+    `--serve --on-demand`. Artikel-Index und Build-Plan liegen im Speicher,
+    gerenderte Seiten in einem LRU-Cache. Der Cache-Schluessel enthaelt den
+    Eingabe-Hash aus dem Plan: nach refresh() passen geaenderte Seiten nicht
+    mehr und werden beim naechsten Abruf neu gerendert.
+    """
+
+    def __init__(self, config, max_pages=512):
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self.refresh(config)
+
+    def refresh(self, config):
+        """Liest den Artikel-Index neu (nur geaenderte Dateien werden geparst)."""
+        store = ArticleStore.load()
+        plan = _plan_outputs(store, config)
+        with self._lock:
+            self.config, self.store, self.plan = config, store, plan
+
+    def __len__(self):
+        return len(self.plan)
+
+    def get(self, rel):
+        """(Bytes, Eingabe-Hash) der Seite unter `rel` (z.B. artikel/x.html) oder None."""
+        with self._lock:
+            config, store, entry = self.config, self.store, self.plan.get(rel)
+            if entry is None:
+                return None
+            fingerprint, kind, key = entry
+            page = self._pages.get((rel, fingerprint))
+            if page is not None:
+                self._pages.move_to_end((rel, fingerprint))
+                return page, fingerprint
+        page = _render_output(kind, key, store, config).encode("utf-8")
+        with self._lock:
+            self._pages[(rel, fingerprint)] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page, fingerprint
@@ -0,0 +1,84 @@
+"""
+Beobachtet Dateien und Ordner per Polling (ohne Zusatzpakete, auch unter
+Windows) und meldet Aenderungen gebuendelt: Nach der ersten Aenderung wird
+kurz gewartet, bis nichts mehr geschrieben wird (Debounce) - ein Editor,
+der eine Datei in mehreren Schritten speichert, loest nur einen Neubau aus.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+DEFAULT_INTERVAL = 0.25
+DEFAULT_DEBOUNCE = 0.1
+
+
+def scan(paths):
+    """{pfad: (mtime_ns, groesse)} der Dateien bzw. der direkten Dateien in Ordnern."""
+    snapshot = {}
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith(".") or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        else:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def changed_paths(old, new):
+    """Neue, geaenderte und geloeschte Pfade zwischen zwei Snapshots."""
+    return {path for path in old.keys() | new.keys() if old.get(path) != new.get(path)}
+
+
+class PollingWatcher:
+    """
+    Ruft callback(geaenderte_pfade) in einem eigenen Thread auf, sobald sich
+    unter `paths` etwas geaendert hat und `debounce` Sekunden lang ruhig war.
+    """
+
+    def __init__(self, paths, callback, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE):
+        self.paths = [Path(p) for p in paths]
+        self.callback = callback
+        self.interval = interval
+        self.debounce = debounce
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="site-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        snapshot = scan(self.paths)
+        while not self._stop.wait(self.interval):
+            current = scan(self.paths)
+            if current == snapshot:
+                continue
+            changed = changed_paths(snapshot, current)
+            # Warten, bis die Dateien fertig geschrieben sind
+            while not self._stop.wait(self.debounce):
+                settled = scan(self.paths)
+                if settled == current:
+                    break
+                changed |= changed_paths(current, settled)
+                current = settled
+            snapshot = current
+            try:
+                self.callback(sorted(changed))
+            except Exception as e:
+                print(f"  FEHLER beim Verarbeiten der Aenderung: {e}")
@@ -0,0 +1,98 @@
+"""
+Gemeinsame Fixtures: Alle Tests arbeiten in einem temporaeren Ordner -
+articles/, site/, articles.db und .cache/ des Projekts bleiben unberuehrt.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import article_db  # noqa: E402
+import site_builder  # noqa: E402
+import usage_ledger  # noqa: E402
+
+CATEGORIES = ["Whisky", "Reise", "Natur"]
+
+
+def make_article(i, category=None, date=None):
+    """Ein kleiner, vollstaendiger Artikel im Format von content_generator."""
+    slug = f"testartikel-{i}"
+    return {
+        "title": f"Testartikel {i}",
+        "html_content": f"<h2>Abschnitt {i}</h2><p>{'Text ' * 50}</p>",
+        "category": category or CATEGORIES[i % len(CATEGORIES)],
+        "tags": ["Test", f"Tag{i % 4}"],
+        "type": "guide",
+        "meta": {
+            "meta_description": f"Beschreibung {i}",
+            "teaser": f"Teaser {i}",
+            "slug": slug,
+            "keywords": "Test",
+            "og_description": f"OG {i}",
+        },
+        "date": date or f"2026-01-{i % 28 + 1:02d}",
+        "date_display": f"{i % 28 + 1}. January 2026",
+    }
+
+
+def write_article(articles_dir, article):
+    path = Path(articles_dir) / article_db.article_filename(article)
+    path.write_text(json.dumps(article, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture(autouse=True)
+def usage_ledger_file(tmp_path, monkeypatch):
+    """usage_ledger.jsonl des Projekts bleibt unberuehrt."""
+    path = tmp_path / "usage_ledger.jsonl"
+    monkeypatch.setattr(usage_ledger, "LEDGER_FILE", path)
+    return path
+
+
+@pytest.fixture
+def config():
+    with open(PROJECT_DIR / "config.example.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def site_dirs(tmp_path, monkeypatch):
+    """Leitet articles/, site/ und articles.db in einen temporaeren Ordner um."""
+    articles_dir = tmp_path / "articles"
+    site_dir = tmp_path / "site"
+    articles_dir.mkdir()
+    monkeypatch.setattr(site_builder, "ARTICLES_DIR", articles_dir)
+    monkeypatch.setattr(site_builder, "SITE_DIR", site_dir)
+    monkeypatch.setattr(article_db, "DB_PATH", tmp_path / "articles.db")
+    import main
+
+    # Der Aehnlichkeits-Index soll keine Artikel eines anderen Tests kennen
+    main.reset_topic_guard()
+    yield articles_dir, site_dir
+    main.reset_topic_guard()
+
+
+@pytest.fixture
+def fake_api():
+    """Lokaler Fake der OpenAI-API (fake_openai_server.py) ohne Wartezeiten."""
+    from fake_openai_server import FakeOpenAIServer
+
+    server = FakeOpenAIServer(port=0, latency="fixed:0", words=300, seed=1).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def fake_config(config, fake_api):
+    """config.example.json, umgebogen auf den Fake-Endpunkt (ohne Cache)."""
+    import api_client
+
+    config["openai"].update({"api_key": "sk-fake", "base_url": fake_api.url, "cache": False})
+    yield config
+    api_client.set_client_factory(None)
@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+from openai import OpenAI
+
+import api_client
+from content_generator import generate_article
+
+
+class RecordingFactory:
+    def __init__(self, build=None):
+        self.configs = []
+        self.closed = []
+        self.build = build
+
+    def __call__(self, config):
+        self.configs.append(config["openai"].get("base_url"))
+        if self.build is not None:
+            return self.build(config)
+        client = SimpleNamespace(close=lambda: self.closed.append(client))
+        return client
+
+
+def test_factory_is_used_once_per_settings(fake_config):
+    factory = RecordingFactory()
+    api_client.set_client_factory(factory)
+    first = api_client.get_client(fake_config)
+    assert api_client.get_client(fake_config) is first
+    assert len(factory.configs) == 1
+
+    # Andere Einstellungen: neuer Client, der alte wird geschlossen
+    fake_config["openai"]["pool_size"] = 5
+    second = api_client.get_client(fake_config)
+    assert second is not first
+    assert factory.closed == [first]
+
+
+def test_resetting_the_factory_restores_the_default(fake_config):
+    api_client.set_client_factory(RecordingFactory())
+    api_client.set_client_factory(None)
+    client = api_client.get_client(fake_config)
+    assert isinstance(client, OpenAI)
+    assert str(client.base_url).rstrip("/") == fake_config["openai"]["base_url"]
+
+
+def test_generate_article_uses_injected_client(fake_config, fake_api):
+    factory = RecordingFactory(build=api_client.default_client_factory)
+    api_client.set_client_factory(factory)
+    topic = {"title": "Islay im Winter", "category": "Reise", "type": "guide", "keywords": ["Islay"]}
+    article = generate_article(topic, fake_config)
+
+    assert factory.configs == [fake_api.url]
+    assert article["title"] == "Islay im Winter"
+    assert article["meta"]["slug"] == "islay-im-winter"
+    assert "<h2>" in article["html_content"]
+    # Artikel und Meta-Daten
+    assert fake_api.stats == {200: 2}
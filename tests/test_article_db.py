@@ -0,0 +1,57 @@
+import json
+
+import article_db
+import site_builder
+from article_db import ArticleDB
+from conftest import make_article, write_article
+
+
+def test_save_get_and_replace(tmp_path):
+    with ArticleDB(tmp_path / "articles.db") as db:
+        article = make_article(1)
+        filename = db.save(article)
+        assert filename == "2026-01-02_testartikel-1.json"
+        assert db.get(filename) == article
+        assert db.get("gibt-es-nicht.json") is None
+
+        db.save(dict(article, title="Neuer Titel"))
+        assert db.count() == 1
+        assert db.get(filename)["title"] == "Neuer Titel"
+        db.delete(filename)
+        assert db.count() == 0
+
+
+def test_list_meta_is_newest_first_without_bodies(tmp_path):
+    with ArticleDB(tmp_path / "articles.db") as db:
+        for i in range(3):
+            db.save(make_article(i))
+        entries = db.list_meta()
+    assert [e["title"] for e in entries] == ["Testartikel 2", "Testartikel 1", "Testartikel 0"]
+    assert all("html_content" not in e and e["hash"] for e in entries)
+
+
+def test_import_export_round_trip(tmp_path):
+    source, target = tmp_path / "json", tmp_path / "export"
+    source.mkdir()
+    articles = [make_article(i) for i in range(4)]
+    for article in articles:
+        write_article(source, article)
+    (source / ".meta-index.json").write_text("{}", encoding="utf-8")
+    (source / "kaputt.json").write_text("{", encoding="utf-8")
+
+    db_path = tmp_path / "articles.db"
+    assert article_db.import_json(source, db_path) == 4
+    assert article_db.export_json(target, db_path) == 4
+    for article in articles:
+        with open(target / article_db.article_filename(article), "r", encoding="utf-8") as f:
+            assert json.load(f) == article
+
+
+def test_build_reads_from_db_when_present(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    with ArticleDB() as db:
+        db.save(make_article(5))
+    assert article_db.db_enabled()
+    site_builder.build_site(config)
+    assert (site_dir / "artikel" / "testartikel-5.html").exists()
+    assert not list(articles_dir.glob("*.json"))
@@ -0,0 +1,57 @@
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import site_builder
+from conftest import make_article, write_article
+
+
+def save(articles_dir, first, count):
+    """Wie main.save_article() mit JSON-Ablage: Datei schreiben, Index nachtragen."""
+    site_builder.ARTICLES_DIR = articles_dir
+    for i in range(first, first + count):
+        article = make_article(i)
+        site_builder.update_article_index(write_article(articles_dir, article), article)
+
+
+def index_entries(articles_dir):
+    with open(articles_dir / site_builder.INDEX_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_index_skips_unchanged_files(site_dirs, monkeypatch):
+    articles_dir, _ = site_dirs
+    for i in range(4):
+        write_article(articles_dir, make_article(i))
+    entries = site_builder.load_article_index()
+    assert [e["title"] for e in entries][0] == "Testartikel 3"
+    assert "html_content" not in entries[0]
+
+    opened = []
+    real_open = open
+    monkeypatch.setattr("builtins.open", lambda path, *a, **kw: opened.append(str(path)) or real_open(path, *a, **kw))
+    assert site_builder.load_article_index() == entries
+    assert not any(path.endswith(".json") and "testartikel" in path for path in opened)
+
+
+def test_concurrent_threads_lose_no_update(site_dirs):
+    articles_dir, _ = site_dirs
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda n: save(articles_dir, n * 5, 5), range(8)))
+    assert len(index_entries(articles_dir)) == 40
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="braucht fork")
+def test_concurrent_processes_lose_no_update(site_dirs):
+    articles_dir, _ = site_dirs
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=save, args=(articles_dir, n * 10, 10)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+    assert len(index_entries(articles_dir)) == 40
+    assert not list(articles_dir.glob("*.tmp"))
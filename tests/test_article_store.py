@@ -0,0 +1,40 @@
+import site_builder
+from conftest import make_article, write_article
+from site_builder import ArticleStore
+
+
+def test_store_precomputes_views():
+    articles = [make_article(i, category=category) for i, category in enumerate(["Whisky", "Reise", "whisky"])]
+    store = ArticleStore(articles, recent_count=2)
+    assert len(store) == 3 and store.recent == articles[:2]
+    assert store.in_category("WHISKY") == [articles[0], articles[2]]
+    assert store.category_counts == {"Whisky": 1, "Reise": 1, "whisky": 1}
+    assert store.tags() == ["Tag0", "Tag1", "Tag2", "Test"]
+
+
+def test_build_loads_the_corpus_once(site_dirs, config, monkeypatch):
+    articles_dir, site_dir = site_dirs
+    for i in range(8):
+        write_article(articles_dir, make_article(i))
+
+    calls = []
+    load_index = site_builder.load_article_index
+    monkeypatch.setattr(site_builder, "load_article_index", lambda: calls.append(1) or load_index())
+    bodies = []
+    load_article = site_builder.load_article
+    monkeypatch.setattr(site_builder, "load_article", lambda entry: bodies.append(entry["file"]) or load_article(entry))
+
+    site_builder.build_site(config)
+    assert len(calls) == 1
+    # Jeder Artikeltext wird genau einmal gelesen - fuer seine eigene Seite
+    assert sorted(bodies) == sorted(p.name for p in articles_dir.glob("2026-*.json"))
+    page = (site_dir / "artikel" / "testartikel-0.html").read_text(encoding="utf-8")
+    assert "Testartikel 7" in page
+
+
+def test_article_page_without_store_loads_the_index(site_dirs, config):
+    articles_dir, _ = site_dirs
+    article = make_article(1)
+    write_article(articles_dir, article)
+    html = site_builder.build_article_page(article, config)
+    assert "<h1>Testartikel 1</h1>" in html
@@ -0,0 +1,93 @@
+import pytest
+
+import api_client
+import batch_generator
+import usage_ledger
+
+TOPICS = [
+    {"title": "Speyside mit dem Rad", "category": "Reise", "type": "guide", "keywords": ["Speyside"]},
+    {"title": "Sherry-Fass oder Bourbon-Fass", "category": "Whisky", "type": "guide", "keywords": ["Fass"]},
+]
+
+
+@pytest.fixture(autouse=True)
+def batches_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(batch_generator, "BATCHES_DIR", tmp_path / "batches")
+
+
+def ingest(job):
+    saved, used = [], []
+    result = batch_generator.ingest_results(job, saved.append, used.append)
+    return result, saved, used
+
+
+@pytest.mark.parametrize("meta_mode", ["parallel", "combined"])
+def test_local_round_trip(fake_config, fake_api, meta_mode):
+    fake_config["openai"]["meta_mode"] = meta_mode
+    job = batch_generator.prepare_batch(TOPICS, fake_config)
+    assert batch_generator.pending_titles() == {topic["title"] for topic in TOPICS}
+
+    batch_generator.run_local(job, api_client.get_client(fake_config))
+    requests = 2 if meta_mode == "combined" else 4
+    assert fake_api.stats == {200: requests}
+
+    (ingested, failed), saved, used = ingest(job)
+    assert (ingested, failed) == (2, 0)
+    assert used == [topic["title"] for topic in TOPICS]
+    assert [article["meta"]["slug"] for article in saved] == ["speyside-mit-dem-rad", "sherry-fass-oder-bourbon-fass"]
+    assert all("<h2>" in article["html_content"] for article in saved)
+    assert batch_generator.load_job(job["id"])["status"] == "ingested"
+    assert batch_generator.pending_titles() == set()
+
+
+def test_failed_requests_are_reported_and_ingest_is_repeatable(fake_config):
+    class HalfBrokenClient:
+        def __init__(self, client):
+            self.chat = self
+            self.completions = self
+            self.client = client
+
+        def create(self, **body):
+            if "Sherry" in body["messages"][-1]["content"]:
+                raise RuntimeError("kaputt")
+            return self.client.chat.completions.create(**body)
+
+    job = batch_generator.prepare_batch(TOPICS, fake_config)
+    batch_generator.run_local(job, HalfBrokenClient(api_client.get_client(fake_config)))
+    (ingested, failed), saved, _ = ingest(job)
+    assert (ingested, failed) == (1, 1)
+    assert saved[0]["title"] == "Speyside mit dem Rad"
+
+    # Ein zweiter Durchlauf uebernimmt nichts doppelt
+    (ingested, _), saved, _ = ingest(batch_generator.load_job(job["id"]))
+    assert ingested == 0 and saved == []
+
+
+def test_pending_titles_cache_follows_save_job(fake_config):
+    pending = batch_generator.PendingTitles()
+    pending.refresh()
+    assert len(pending) == 0
+    job = batch_generator.prepare_batch(TOPICS[:1], fake_config)
+    pending.refresh()
+    assert TOPICS[0]["title"] in pending
+
+    job["status"] = "ingested"
+    batch_generator.save_job(job)
+    pending.refresh()
+    assert TOPICS[0]["title"] not in pending
+
+
+def test_batch_usage_is_recorded_at_batch_price(fake_config, usage_ledger_file):
+    job = batch_generator.prepare_batch(TOPICS, fake_config)
+    batch_generator.run_local(job, api_client.get_client(fake_config))
+    saved, used = [], []
+    batch_generator.ingest_results(job, saved.append, used.append, fake_config)
+
+    usage = saved[0]["usage"]
+    assert usage["calls"] == 2 and usage["total_tokens"] > 0
+    full_price = (usage["prompt_tokens"] * 2.50 + usage["completion_tokens"] * 10.00) / 1e6
+    assert usage["cost_usd"] == pytest.approx(full_price * usage_ledger.BATCH_PRICE_FACTOR, abs=1e-6)
+
+    entries = usage_ledger.read_ledger()
+    assert [(e["kind"], e["title"]) for e in entries] == [("batch", topic["title"]) for topic in TOPICS]
+    assert usage_ledger.summarize(entries)[0] == sum(article["usage"]["total_tokens"] for article in saved)
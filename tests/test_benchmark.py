@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+import benchmark
+
+
+@pytest.fixture(autouse=True)
+def bench_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "BENCH_DIR", tmp_path / "benchmark")
+    return tmp_path / "benchmark"
+
+
+def test_corpus_is_deterministic_and_reused():
+    first = benchmark.generate_corpus(12, seed=7)
+    files = sorted(p.name for p in first.glob("*.json"))
+    assert len(files) == 12
+    content = (first / files[0]).read_text(encoding="utf-8")
+    article = json.loads(content)
+    assert {"title", "html_content", "category", "tags", "meta", "date"} <= set(article)
+    assert article["meta"]["slug"] in files[0]
+
+    (first / files[0]).write_text("{}", encoding="utf-8")
+    # Fertiger Bestand wird nicht neu erzeugt
+    assert benchmark.generate_corpus(12, seed=7) == first
+    assert (first / files[0]).read_text(encoding="utf-8") == "{}"
+
+    other = benchmark.generate_corpus(12, seed=8)
+    assert sorted(p.name for p in other.glob("*.json")) != files
+
+
+def test_run_size_measures_all_modes(bench_dir):
+    runs = benchmark.run_size(6, seed=1, jobs=1)
+    assert runs["articles"] == 6
+    for mode in benchmark.MODES:
+        assert runs[mode]["wall"] > 0
+        assert "render" in runs[mode]["phases"]
+    assert runs["cold"]["pages"]["article"]["count"] == 6
+    assert runs["incremental"]["pages"]["article"]["count"] == 0
+    assert not (bench_dir / "site-6").exists()
+
+
+def test_compare_reports_relative_change(capsys):
+    def result(wall):
+        run = {"wall": wall, "phases": {}, "pages": {}, "peak_rss_kb": 1000}
+        return {"commit": "abc", "sizes": {"100": {mode: run for mode in benchmark.MODES}}}
+
+    benchmark.compare(result(2.0), result(1.0))
+    assert "wall -50%" in capsys.readouterr().out
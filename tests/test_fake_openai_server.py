@@ -0,0 +1,99 @@
+import argparse
+import random
+
+import openai
+import pytest
+
+import content_generator
+import fake_openai_server
+import hedging
+from fake_openai_server import FakeOpenAIServer, completion_text, parse_latency
+
+
+def client(server):
+    return openai.OpenAI(api_key="sk-fake", base_url=server.url, max_retries=0)
+
+
+@pytest.fixture
+def server_factory():
+    servers = []
+
+    def start(**kwargs):
+        kwargs.setdefault("latency", "fixed:0")
+        server = FakeOpenAIServer(port=0, seed=1, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+@pytest.mark.parametrize("spec, low, high", [
+    ("fixed:0.5", 0.5, 0.5),
+    ("uniform:0.2:1.5", 0.2, 1.5),
+    ("normal:1.0:0.3", 0.0, None),
+    ("lognormal:0.8:0.5", 0.0, None),
+])
+def test_parse_latency(spec, low, high):
+    draw = parse_latency(spec)
+    rng = random.Random(3)
+    values = [draw(rng) for _ in range(200)]
+    assert min(values) >= low and (high is None or max(values) <= high)
+
+
+def test_parse_latency_rejects_unknown_distribution():
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1")
+
+
+def test_completion_text_matches_request_kind():
+    article = {"max_tokens": 100, "messages": [{"role": "system", "content": "HTML"}, {"role": "user", "content": 'Thema: "Islay"'}]}
+    assert completion_text(article, 1500).startswith("<h2>Islay</h2>")
+    meta = {"messages": [{"role": "system", "content": "Nur JSON"}, {"role": "user", "content": 'Titel "Islay"'}]}
+    assert '"slug": "islay"' in completion_text(meta, 1500)
+
+
+def test_completion_and_stream_with_usage(server_factory):
+    server = server_factory(words=200)
+    api = client(server)
+    messages = [{"role": "system", "content": "HTML"}, {"role": "user", "content": 'Thema: "Speyside"'}]
+    response = api.chat.completions.create(model="gpt-4o", messages=messages)
+    assert "<h2>Speyside</h2>" in response.choices[0].message.content
+    assert response.usage.total_tokens == response.usage.prompt_tokens + response.usage.completion_tokens
+
+    chunks = list(api.chat.completions.create(
+        model="gpt-4o", messages=messages, stream=True, stream_options={"include_usage": True},
+    ))
+    text = "".join(chunk.choices[0].delta.content or "" for chunk in chunks if chunk.choices)
+    assert text == response.choices[0].message.content
+    assert chunks[-1].usage.completion_tokens == response.usage.completion_tokens
+    assert server.stats == {200: 2}
+
+
+def test_injected_errors_and_rate_limits(server_factory):
+    api = client(server_factory(rate_limit_rate=1.0, retry_after=2.5))
+    with pytest.raises(openai.RateLimitError) as error:
+        api.chat.completions.create(model="gpt-4o", messages=[])
+    assert error.value.response.headers["retry-after"] == "2.5"
+
+    server = server_factory(error_rate=1.0)
+    with pytest.raises(openai.InternalServerError):
+        client(server).chat.completions.create(model="gpt-4o", messages=[])
+    assert set(server.stats) <= {500, 502, 503}
+
+
+def test_bench_reports_throughput(tmp_path, monkeypatch):
+    monkeypatch.setattr(fake_openai_server, "FAKE_DIR", tmp_path)
+    # run_bench biegt diese Pfade um - monkeypatch stellt sie danach wieder her
+    monkeypatch.setattr(content_generator, "PARTIAL_DIR", content_generator.PARTIAL_DIR)
+    monkeypatch.setattr(hedging, "LATENCY_FILE", hedging.LATENCY_FILE)
+    args = argparse.Namespace(
+        port=0, latency="fixed:0", error_rate=0.0, rate_limit_rate=0.0, retry_after=0.1, words=200, seed=1,
+        count=4, concurrency=2, stream=False, hedge=False, combined=True, rpm=None, tpm=None,
+        config=None, output=str(tmp_path / "report.json"),
+    )
+    report = fake_openai_server.run_bench(args)
+    assert report["succeeded"] == 4 and report["failed"] == 0
+    assert report["requests"] == 4 and report["status_counts"] == {"200": 4}
+    assert report["tokens"] > 0 and (tmp_path / "report.json").exists()
@@ -0,0 +1,152 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from content_generator import _call_openai_with_retry, _prompt_tokens
+from hedging import MIN_SAMPLES, CancelToken, HedgeBudget, HedgeCancelled, Hedger, LatencyTracker
+from retry_policy import CircuitBreaker, RetryPolicy
+from usage_ledger import UsageMeter
+
+KEY = "gpt-4o/4000"
+REQUEST = {"model": "gpt-4o", "max_tokens": 4000, "messages": [{"role": "user", "content": "x" * 400}]}
+
+
+def fast_tracker(tmp_path, seconds=0.05):
+    tracker = LatencyTracker(tmp_path / "latency.json")
+    for _ in range(MIN_SAMPLES):
+        tracker.record(KEY, seconds)
+    return tracker
+
+
+# ============================================================
+# Schwelle und Budget
+# ============================================================
+
+def test_percentile_needs_enough_samples_and_persists(tmp_path):
+    tracker = LatencyTracker(tmp_path / "latency.json")
+    for seconds in range(1, MIN_SAMPLES):
+        tracker.record(KEY, seconds)
+    assert tracker.percentile(KEY, 90) is None
+    tracker.record(KEY, MIN_SAMPLES)
+    assert tracker.percentile(KEY, 90) == 18
+    assert tracker.percentile(KEY, 50) == 10
+    assert LatencyTracker(tmp_path / "latency.json").percentile(KEY, 90) == 18
+
+
+def test_budget_caps_hedges_at_ratio():
+    budget = HedgeBudget(max_ratio=0.1)
+    granted = 0
+    for _ in range(30):
+        budget.record_call()
+        granted += budget.try_spend()
+    assert granted == 3
+
+
+def test_no_hedge_without_budget(tmp_path):
+    started = []
+
+    def start(cancel):
+        started.append(1)
+        time.sleep(0.2)
+        return "langsam"
+
+    hedger = Hedger(fast_tracker(tmp_path), HedgeBudget(max_ratio=0))
+    assert hedger.call(KEY, start) == "langsam"
+    assert len(started) == 1
+
+
+# ============================================================
+# Verlierer
+# ============================================================
+
+def test_loser_is_cancelled_and_reported(tmp_path):
+    calls, reported = [], []
+
+    def start(cancel):
+        calls.append(cancel)
+        if len(calls) == 1:
+            stopped = threading.Event()
+            cancel.on_cancel(stopped.set)
+            stopped.wait(5)
+            raise HedgeCancelled({"prompt_tokens": 100, "completion_tokens": 7})
+        return "schnell"
+
+    hedger = Hedger(fast_tracker(tmp_path), HedgeBudget(max_ratio=1))
+    assert hedger.call(KEY, start, on_loser=reported.append) == "schnell"
+    assert calls[0].is_set() and not calls[1].is_set()
+    assert reported == [{"prompt_tokens": 100, "completion_tokens": 7}]
+
+
+def test_silent_loser_is_reported_without_usage(tmp_path):
+    reported = []
+    release = threading.Event()
+
+    def start(cancel):
+        if not release.is_set():
+            release.set()
+            time.sleep(1)  # Reagiert nicht auf den Abbruch
+            return "zu spaet"
+        return "schnell"
+
+    hedger = Hedger(fast_tracker(tmp_path), HedgeBudget(max_ratio=1), grace=0.05)
+    assert hedger.call(KEY, start, on_loser=reported.append) == "schnell"
+    assert reported == [None]
+
+
+def test_cancel_token_runs_callbacks_once():
+    token, closed = CancelToken(), []
+    token.on_cancel(lambda: closed.append(1))
+    token.set()
+    token.set()
+    token.on_cancel(lambda: closed.append(2))
+    assert closed == [1, 2] and token.is_set()
+
+
+class BlockingStream:
+    """Wartet auf das erste Byte, bis close() die Verbindung schliesst."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        self.closed.wait(5)
+        raise ConnectionError("Stream geschlossen")
+
+    def close(self):
+        self.closed.set()
+
+
+def chunk(text, finish_reason=None):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=finish_reason)], usage=None,
+    )
+
+
+class HedgeClient:
+    def __init__(self):
+        self.slow = BlockingStream()
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            return self.slow
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=50, total_tokens=150)
+        return iter([chunk("Fertig", "stop"), SimpleNamespace(choices=[], usage=usage)])
+
+
+def test_loser_waiting_for_first_byte_is_closed_and_metered(tmp_path):
+    client = HedgeClient()
+    meter = UsageMeter({})
+    policy = RetryPolicy(max_attempts=1, breaker=CircuitBreaker(), sleep=lambda _: None)
+    hedger = Hedger(fast_tracker(tmp_path), HedgeBudget(max_ratio=1))
+
+    response = _call_openai_with_retry(client, policy=policy, hedger=hedger, meter=meter, **REQUEST)
+    assert response.choices[0].message.content == "Fertig"
+    assert client.slow.closed.is_set()
+    totals = meter.totals()
+    # Gewinner (150) plus der Prompt der abgebrochenen Anfrage
+    assert totals["prompt_tokens"] == 100 + _prompt_tokens(REQUEST)
+    assert totals["completion_tokens"] == 50
+    assert totals["calls"] == 2
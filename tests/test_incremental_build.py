@@ -0,0 +1,72 @@
+import site_builder
+from conftest import make_article, write_article
+
+
+def build(config, **kwargs):
+    stats = {}
+    site_builder.build_site(config, incremental=True, stats=stats, **kwargs)
+    return stats
+
+
+def test_older_article_rebuilds_only_its_own_page(site_dirs, config):
+    articles_dir, _ = site_dirs
+    for i in range(10):
+        write_article(articles_dir, make_article(i, date=f"2026-01-{i + 10:02d}"))
+    first = build(config)
+    assert first["pages"]["article"][0] == 10
+
+    # Aelter als die fuenf neuesten: keine Sidebar aendert sich
+    write_article(articles_dir, make_article(10, category="Whisky", date="2025-12-01"))
+    second = build(config)
+    assert second["pages"]["article"][0] == 1
+    assert second["unchanged"]["article"] == 10
+    assert second["unchanged"]["category"] == len(site_builder.DEFAULT_CATEGORIES) - 1
+
+
+def test_new_newest_article_updates_server_rendered_sidebars(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    for i in range(10):
+        write_article(articles_dir, make_article(i, date=f"2026-01-{i + 10:02d}"))
+    build(config)
+
+    write_article(articles_dir, make_article(10, date="2026-02-01"))
+    second = build(config)
+    # Die Sidebar steht im HTML (interne Links fuer Suchmaschinen) - jede Liste aendert sich
+    assert second["pages"]["article"][0] == 11
+    page = (site_dir / "artikel" / "testartikel-0.html").read_text(encoding="utf-8")
+    assert 'href="/artikel/testartikel-10.html">Testartikel 10</a>' in page
+
+
+def test_edit_outside_recent_list_rebuilds_one_article(site_dirs, config):
+    articles_dir, _ = site_dirs
+    articles = [make_article(i, date=f"2026-01-{i + 10:02d}") for i in range(10)]
+    for article in articles:
+        write_article(articles_dir, article)
+    build(config)
+
+    articles[0]["html_content"] += "<p>Nachtrag</p>"
+    write_article(articles_dir, articles[0])
+    assert build(config)["pages"]["article"][0] == 1
+
+
+def test_unchanged_corpus_writes_nothing(site_dirs, config):
+    articles_dir, _ = site_dirs
+    for i in range(5):
+        write_article(articles_dir, make_article(i))
+    build(config)
+    again = build(config)
+    assert all(count == 0 for count, _ in again["pages"].values())
+
+
+def test_removed_article_drops_compressed_variants(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    paths = [write_article(articles_dir, make_article(i)) for i in range(3)]
+    build(config, precompress=True)
+    page = site_dir / "artikel" / "testartikel-0.html"
+    assert page.with_name(page.name + ".gz").exists()
+
+    paths[0].unlink()
+    stats = build(config)
+    assert stats["removed"] == 1
+    assert not page.exists()
+    assert not page.with_name(page.name + ".gz").exists()
@@ -0,0 +1,159 @@
+import pytest
+
+import content_generator
+import job_queue
+import main
+from conftest import make_article
+from topic_ledger import TopicLedger, TopicPicker
+
+TOPICS = [{"title": f"Thema {i}", "category": "Whisky"} for i in range(4)]
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOBS_FILE", tmp_path / "jobs.jsonl")
+    monkeypatch.setattr(job_queue, "LOCK_FILE", tmp_path / "jobs.jsonl.lock")
+    return job_queue
+
+
+@pytest.fixture
+def worker_env(queue, site_dirs, tmp_path, monkeypatch, config):
+    """main.py mit temporaerer Ablage, eigenem Themen-Protokoll und Fake-Generator."""
+    articles_dir, _ = site_dirs
+    monkeypatch.setattr(main, "ARTICLES_DIR", articles_dir)
+    monkeypatch.setattr(main, "PROJECT_DIR", tmp_path)
+    ledger = TopicLedger(tmp_path / "used_topics.jsonl", tmp_path / "used_topics.json")
+    monkeypatch.setattr(main, "_picker", TopicPicker(TOPICS, ledger))
+    generated = []
+
+    def fake_generate(topic, config, limiter=None, meter=None):
+        generated.append(topic["title"])
+        article = make_article(len(generated))
+        article["title"] = topic["title"]
+        return article
+
+    monkeypatch.setattr(content_generator, "generate_article", fake_generate)
+    config["openai"]["breaker_cooldown_seconds"] = 0.001
+    return generated
+
+
+def states(queue):
+    return {job["topic"]["title"]: job["state"] for job in queue.load_jobs()}
+
+
+def test_enqueue_skips_open_titles(queue):
+    assert queue.enqueue(TOPICS[:2]) == 2
+    assert queue.enqueue(TOPICS[:3]) == 1
+    assert queue.counts() == {"queued": 3}
+
+
+def test_claim_hands_out_each_job_once(queue):
+    queue.enqueue(TOPICS[:2])
+    first = queue.claim("a")
+    second = queue.claim("b")
+    assert {first["topic"]["title"], second["topic"]["title"]} == {"Thema 0", "Thema 1"}
+    assert first["attempts"] == second["attempts"] == 1
+    assert queue.claim("c") is None
+
+
+def test_expired_lease_is_claimed_again(queue):
+    queue.enqueue(TOPICS[:1])
+    crashed = queue.claim("a", lease_seconds=-1)
+    retry = queue.claim("b")
+    assert retry["id"] == crashed["id"]
+    assert retry["worker"] == "b"
+    assert retry["attempts"] == 2
+
+
+def test_job_fails_after_max_attempts(queue):
+    queue.enqueue(TOPICS[:1])
+    results = []
+    for _ in range(job_queue.MAX_ATTEMPTS):
+        job = queue.claim("a")
+        results.append(queue.mark_failed(job["id"], "kaputt"))
+    assert results == ["queued"] * (job_queue.MAX_ATTEMPTS - 1) + ["failed"]
+    assert queue.claim("a") is None
+    assert queue.counts() == {"failed": 1}
+
+
+def test_release_does_not_count_as_attempt(queue):
+    queue.enqueue(TOPICS[:1])
+    job = queue.claim("a")
+    queue.release(job["id"])
+    assert queue.claim("a")["attempts"] == 1
+
+
+def test_recover_requeues_only_expired_unless_forced(queue):
+    queue.enqueue(TOPICS[:3])
+    running = queue.claim("a")
+    saved = queue.claim("b")
+    queue.mark_saved(saved["id"], "datei.json")
+    requeued, saved_jobs = queue.recover()
+    assert requeued == 0
+    assert [job["id"] for job in saved_jobs] == [saved["id"]]
+
+    requeued, _ = queue.recover(force=True)
+    assert requeued == 1
+    assert states(queue)[running["topic"]["title"]] == "queued"
+
+
+def test_compact_keeps_state(queue):
+    queue.enqueue(TOPICS)
+    job = queue.claim("a")
+    queue.mark_done(job["id"])
+    before = states(queue)
+    queue.compact()
+    assert states(queue) == before
+    assert len(queue.JOBS_FILE.read_text(encoding="utf-8").splitlines()) == len(TOPICS)
+
+
+def test_open_titles_follow_appends_and_compact(queue):
+    titles = job_queue.OpenTitles()
+    titles.refresh()
+    assert len(titles) == 0
+    queue.enqueue(TOPICS[:2])
+    titles.refresh()
+    assert "Thema 0" in titles and "Thema 1" in titles
+
+    job = queue.claim("a")
+    queue.mark_done(job["id"])
+    titles.refresh()
+    assert job["topic"]["title"] not in titles
+    assert len(titles) == 1
+
+    queue.compact()
+    queue.enqueue(TOPICS[2:3])
+    titles.refresh()
+    assert len(titles) == 2
+
+
+def test_worker_generates_and_marks_used(worker_env, queue, config):
+    queue.enqueue(TOPICS[:2])
+    assert main.cmd_work(config) == 2
+    assert sorted(worker_env) == ["Thema 0", "Thema 1"]
+    assert states(queue) == {"Thema 0": "done", "Thema 1": "done"}
+    assert main._topic_picker().is_used("Thema 0")
+
+
+def test_worker_ignores_older_article_with_same_title(worker_env, queue, config):
+    # Ein Artikel aus einem frueheren Themen-Durchgang
+    old = make_article(90)
+    old["title"] = "Thema 0"
+    main.save_article(old)
+    queue.enqueue(TOPICS[:1])
+    assert main.cmd_work(config) == 1
+    assert worker_env == ["Thema 0"]
+
+
+def test_resume_force_finishes_saved_job_without_regenerating(worker_env, queue, config):
+    queue.enqueue(TOPICS[:2])
+    crashed = queue.claim("a")
+    # Absturz nach dem Speichern, vor mark_saved
+    article = make_article(50)
+    article["title"] = crashed["topic"]["title"]
+    article["job_id"] = crashed["id"]
+    main.save_article(article)
+
+    assert main.cmd_resume(config, force=True) == 2
+    assert worker_env == [title for title in ("Thema 0", "Thema 1") if title != crashed["topic"]["title"]]
+    assert set(states(queue).values()) == {"done"}
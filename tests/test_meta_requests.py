@@ -0,0 +1,85 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import api_client
+from content_generator import META_MARKER, _parse_meta, generate_article
+
+TOPIC = {"title": "Islay: Torf und Meer", "category": "Whisky", "type": "guide", "tags": ["Islay", "Torf"]}
+META = {"meta_description": "Beschreibung", "teaser": "Teaser", "slug": "islay-torf", "keywords": "Islay", "og_description": "OG"}
+
+
+def completion(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=20, total_tokens=30),
+    )
+
+
+class ScriptedClient:
+    """Antwortet je nach System-Prompt mit Artikel- oder Meta-Text."""
+
+    def __init__(self, article, meta=None, wait_for_meta=False):
+        self.article, self.meta = article, meta
+        self.wait_for_meta = wait_for_meta
+        self.meta_started = threading.Event()
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if "SEO-Experte" in kwargs["messages"][0]["content"]:
+            self.meta_started.set()
+            return completion(self.meta)
+        # Der Artikel wird erst fertig, wenn die Meta-Anfrage schon laeuft
+        if self.wait_for_meta and not self.meta_started.wait(5):
+            raise AssertionError("Meta-Anfrage lief nicht parallel")
+        return completion(self.article)
+
+
+@pytest.fixture
+def use_client(config):
+    config["openai"].update({"cache": False})
+
+    def install(client):
+        api_client.set_client_factory(lambda _: client)
+        return client
+
+    yield install
+    api_client.set_client_factory(None)
+
+
+def test_parallel_mode_overlaps_meta_with_article(config, use_client):
+    client = use_client(ScriptedClient("<h2>Torf</h2>", json.dumps(META), wait_for_meta=True))
+    article = generate_article(TOPIC, config)
+    assert article["html_content"] == "<h2>Torf</h2>"
+    assert article["meta"] == META
+    assert len(client.requests) == 2
+    assert article["usage"]["calls"] == 2 and article["usage"]["total_tokens"] == 60
+
+
+def test_combined_mode_uses_one_request(config, use_client):
+    config["openai"]["meta_mode"] = "combined"
+    text = f"```html\n<h2>Torf</h2>\n```\n{META_MARKER}\n```json\n{json.dumps(META)}\n```"
+    client = use_client(ScriptedClient(text))
+    article = generate_article(TOPIC, config)
+    assert len(client.requests) == 1
+    assert META_MARKER in client.requests[0]["messages"][1]["content"]
+    assert client.requests[0]["max_tokens"] == config["openai"]["max_tokens"] + 500
+    assert article["html_content"] == "<h2>Torf</h2>"
+    assert article["meta"] == META
+
+
+def test_combined_mode_without_marker_falls_back_to_title(config, use_client):
+    config["openai"]["meta_mode"] = "combined"
+    use_client(ScriptedClient("<h2>Nur Inhalt</h2>"))
+    article = generate_article(TOPIC, config)
+    assert article["html_content"] == "<h2>Nur Inhalt</h2>"
+    assert article["meta"]["slug"] == "islay-torf-und-meer"
+    assert article["meta"]["keywords"] == "Islay, Torf"
+
+
+def test_parse_meta_strips_code_fence():
+    assert _parse_meta(f"```json\n{json.dumps(META)}\n```", TOPIC) == META
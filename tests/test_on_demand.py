@@ -0,0 +1,43 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import article_db
+import site_builder
+from conftest import make_article, write_article
+
+
+def test_concurrent_renders_with_articles_db(site_dirs, config):
+    articles_dir, _ = site_dirs
+    for i in range(12):
+        write_article(articles_dir, make_article(i))
+    article_db.import_json(articles_dir)
+    for path in articles_dir.glob("*.json"):
+        path.unlink()
+    assert article_db.db_enabled()
+
+    site = site_builder.OnDemandSite(config)
+    pages = sorted(rel for rel in site.plan if rel.startswith("artikel/"))
+    assert len(pages) == 12
+
+    # Jeder Thread braucht seine eigene SQLite-Verbindung
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(site.get, pages * 3))
+    for rel, (page, fingerprint) in zip(pages * 3, results):
+        number = rel.split("-")[-1].split(".")[0]
+        assert f"Abschnitt {number}</h2>".encode() in page
+        assert fingerprint == site.plan[rel][0]
+
+
+def test_unknown_path_and_cache_invalidation(site_dirs, config):
+    articles_dir, _ = site_dirs
+    path = write_article(articles_dir, make_article(1))
+    site = site_builder.OnDemandSite(config)
+    assert site.get("artikel/gibt-es-nicht.html") is None
+
+    page, fingerprint = site.get("artikel/testartikel-1.html")
+    changed = make_article(1)
+    changed["html_content"] = "<p>Neuer Inhalt</p>"
+    path.write_text(site_builder.json.dumps(changed), encoding="utf-8")
+    site.refresh(config)
+    new_page, new_fingerprint = site.get("artikel/testartikel-1.html")
+    assert new_fingerprint != fingerprint
+    assert b"Neuer Inhalt" in new_page
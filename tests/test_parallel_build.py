@@ -0,0 +1,37 @@
+import site_builder
+from conftest import make_article, write_article
+
+
+def snapshot(site_dir):
+    return {
+        str(path.relative_to(site_dir)): path.read_bytes()
+        for path in sorted(site_dir.rglob("*"))
+        if path.is_file() and not path.name.startswith(".")
+    }
+
+
+def test_parallel_build_matches_serial_build(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    for i in range(24):
+        write_article(articles_dir, make_article(i))
+
+    site_builder.build_site(config)
+    serial = snapshot(site_dir)
+    stats = {}
+    site_builder.build_site(config, jobs=2, stats=stats)
+    assert snapshot(site_dir) == serial
+    assert stats["pages"]["article"][0] == 24
+
+
+def test_small_builds_stay_serial(site_dirs, monkeypatch):
+    _, site_dir = site_dirs
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("Fuer wenige Seiten lohnt kein Prozess-Pool")
+
+    monkeypatch.setattr(site_builder, "ProcessPoolExecutor", no_pool)
+    site_dir.mkdir()
+    tasks = [(f"datei-{i}.txt", "asset", f"Inhalt {i}") for i in range(3)]
+    totals = site_builder._render_tasks(tasks, None, {}, jobs=8)
+    assert totals["asset"][0] == 3
+    assert (site_dir / "datei-2.txt").read_text(encoding="utf-8") == "Inhalt 2"
@@ -0,0 +1,119 @@
+import gzip
+import http.client
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import site_builder
+from conftest import make_article, write_article
+from preview_server import PreviewServer, parse_range
+
+PAGE = b"<!DOCTYPE html><html><body>" + b"Whisky " * 200 + b"</body></html>"
+
+
+def start(root, **kwargs):
+    httpd = PreviewServer(root, host="127.0.0.1", port=0, **kwargs)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def request(httpd, path, headers=None, method="GET"):
+    conn = http.client.HTTPConnection(*httpd.server_address[:2], timeout=10)
+    conn.request(method, path, headers=headers or {})
+    response = conn.getresponse()
+    body = response.read()
+    conn.close()
+    return response, body
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "artikel").mkdir()
+    (tmp_path / "index.html").write_bytes(PAGE)
+    (tmp_path / "assets").mkdir()
+    (tmp_path / "assets" / "site.abc.css").write_text("body{}", encoding="utf-8")
+    httpd = start(tmp_path)
+    yield tmp_path, httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=-5", (95, 99)),
+    ("bytes=200-", "unsatisfiable"),
+    ("items=0-1", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+def test_etag_and_not_modified(site):
+    _, httpd = site
+    response, body = request(httpd, "/")
+    assert response.status == 200 and body == PAGE
+    etag = response.getheader("ETag")
+    response, body = request(httpd, "/index.html", {"If-None-Match": etag})
+    assert response.status == 304 and body == b""
+
+
+def test_precompressed_variant_is_served(site):
+    root, httpd = site
+    stat = (root / "index.html").stat()
+    variant = root / "index.html.gz"
+    variant.write_bytes(gzip.compress(PAGE))
+    os.utime(variant, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    response, body = request(httpd, "/", {"Accept-Encoding": "br, gzip"})
+    assert response.getheader("Content-Encoding") == "gzip"
+    assert gzip.decompress(body) == PAGE
+    response, body = request(httpd, "/")
+    assert response.getheader("Content-Encoding") is None and body == PAGE
+
+
+def test_stale_variant_is_ignored(site):
+    root, httpd = site
+    variant = root / "index.html.gz"
+    variant.write_bytes(gzip.compress(b"alt"))
+    old = (root / "index.html").stat().st_mtime_ns - 10 ** 9
+    os.utime(variant, ns=(old, old))
+    response, body = request(httpd, "/", {"Accept-Encoding": "gzip"})
+    assert response.getheader("Content-Encoding") is None and body == PAGE
+
+
+def test_range_requests(site):
+    _, httpd = site
+    response, body = request(httpd, "/index.html", {"Range": "bytes=0-14"})
+    assert response.status == 206 and body == PAGE[:15]
+    assert response.getheader("Content-Range") == f"bytes 0-14/{len(PAGE)}"
+    response, _ = request(httpd, "/index.html", {"Range": f"bytes={len(PAGE)}-"})
+    assert response.status == 416
+
+
+def test_cache_headers_and_traversal(site):
+    _, httpd = site
+    response, _ = request(httpd, "/assets/site.abc.css")
+    assert "immutable" in response.getheader("Cache-Control")
+    response, _ = request(httpd, "/../README.md")
+    assert response.status == 404
+    response, _ = request(httpd, "/gibt-es-nicht.html")
+    assert response.status == 404
+
+
+def test_on_demand_renderer_serves_concurrently(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    for i in range(6):
+        write_article(articles_dir, make_article(i))
+    httpd = start(site_dir, renderer=site_builder.OnDemandSite(config))
+    try:
+        paths = ["/", "/sitemap.xml"] + [f"/artikel/testartikel-{i}.html" for i in range(6)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda path: request(httpd, path), paths * 3))
+        assert all(response.status == 200 for response, _ in results)
+        assert not site_dir.exists()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+import textwrap
+import time
+import types
+
+import pytest
+
+import profiling
+from conftest import PROJECT_DIR
+
+
+@pytest.fixture
+def events(monkeypatch):
+    monkeypatch.setattr(profiling, "_events", [])
+    return lambda: profiling._events
+
+
+def fake_module():
+    module = types.ModuleType("fake")
+
+    def inner(path):
+        time.sleep(0.01)
+
+    def outer(article):
+        time.sleep(0.01)
+        module.inner(PROJECT_DIR / "x.json")
+
+    module.inner, module.outer = inner, outer
+    return module
+
+
+def test_wrappers_record_nested_spans_with_self_time(events):
+    module = fake_module()
+    profiling.instrument(module, ["outer", "inner", "fehlt"], "test")
+    module.outer({"title": "Islay"})
+
+    inner, outer = events()
+    assert (inner["name"], outer["name"]) == ("inner", "outer")
+    assert inner["args"]["file"] == "x.json" and outer["args"]["title"] == "Islay"
+    assert outer["dur"] >= inner["dur"]
+    # Eigenzeit ohne den verschachtelten Abschnitt
+    assert outer["args"]["self_ms"] == pytest.approx((outer["dur"] - inner["dur"]) / 1000, abs=0.5)
+
+
+def test_instrument_is_idempotent_and_shares_wrappers():
+    module, other = fake_module(), types.ModuleType("other")
+    profiling.instrument(module, ["inner"])
+    wrapped = module.inner
+    profiling.instrument(module, ["inner"])
+    assert module.inner is wrapped
+    other.inner = wrapped.__wrapped__
+    profiling.instrument(other, ["inner"])
+    assert other.inner is wrapped
+
+
+def test_summarize_orders_by_self_time():
+    events = [
+        {"name": "a", "dur": 5000, "args": {"self_ms": 1.0}},
+        {"name": "b", "dur": 3000, "args": {"self_ms": 3.0}},
+        {"name": "a", "dur": 2000, "args": {"self_ms": 2.0}},
+    ]
+    assert profiling.summarize(events) == [("a", 2, 7.0, 3.0, 5.0), ("b", 1, 3.0, 3.0, 3.0)]
+
+
+def test_profiled_parallel_build_writes_trace(tmp_path):
+    script = textwrap.dedent(f"""
+        import json, sys
+        from pathlib import Path
+        sys.path.insert(0, {str(PROJECT_DIR)!r})
+        sys.path.insert(0, {str(PROJECT_DIR / "tests")!r})
+        import article_db, profiling, site_builder
+        from conftest import make_article, write_article
+
+        profiling.PROFILE_DIR = Path({str(tmp_path / "profile")!r})
+        site_builder.ARTICLES_DIR = Path({str(tmp_path / "articles")!r})
+        site_builder.SITE_DIR = Path({str(tmp_path / "site")!r})
+        article_db.DB_PATH = Path({str(tmp_path / "articles.db")!r})
+        site_builder.ARTICLES_DIR.mkdir()
+        for i in range(12):
+            write_article(site_builder.ARTICLES_DIR, make_article(i))
+        with open({str(PROJECT_DIR / "config.example.json")!r}, encoding="utf-8") as f:
+            config = json.load(f)
+        profiling.enable()
+        site_builder.build_site(config, jobs=2)
+        profiling.finish()
+    """)
+    proc = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=120)
+    assert proc.returncode == 0, proc.stderr
+    assert "Profil (teuerste Abschnitte" in proc.stdout
+
+    [trace_file] = (tmp_path / "profile").glob("trace-*.json")
+    trace = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+    spans = [event for event in trace if event["ph"] == "X"]
+    names = {event["name"] for event in spans}
+    assert {"build_site", "_plan_outputs", "build_article_page"} <= names
+    # Artikelseiten aus den Render-Prozessen sind eingesammelt
+    main_pid = next(event["pid"] for event in spans if event["name"] == "build_site")
+    pages = [event for event in spans if event["name"] == "build_article_page"]
+    assert len(pages) == 12 and all(event["pid"] != main_pid for event in pages)
+    assert not list((tmp_path / "profile").glob(".parts-*"))
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+import rate_limiter
+from rate_limiter import RateLimiter, TokenBucket, estimate_tokens
+
+
+class FakeTime:
+    """monotonic() und sleep() ohne echte Wartezeit."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_bucket_refills_at_rate(fake_time):
+    bucket = TokenBucket(60)
+    bucket.take(60)
+    assert bucket.wait_time(1, 0.0) == pytest.approx(1.0)
+    assert bucket.wait_time(1, 1.0) == 0.0
+    # Groesser als die Kapazitaet: wartet nur auf einen vollen Bucket
+    assert bucket.wait_time(1000, 1.0) == pytest.approx(59.0)
+
+
+def test_requests_per_minute_are_enforced(fake_time):
+    limiter = RateLimiter(requests_per_minute=30, tokens_per_minute=None)
+    for _ in range(30):
+        limiter.acquire()
+    assert fake_time.sleeps == []
+    limiter.acquire()
+    assert fake_time.now == pytest.approx(2.0)
+
+
+def test_tokens_per_minute_are_enforced(fake_time):
+    limiter = RateLimiter(requests_per_minute=None, tokens_per_minute=6000)
+    limiter.acquire(6000)
+    limiter.acquire(3000)
+    assert fake_time.now == pytest.approx(30.0)
+
+
+def test_shared_limiter_across_threads(fake_time):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=None)
+    threads = [threading.Thread(target=lambda: [limiter.acquire() for _ in range(20)]) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # 120 Anfragen, 60 sofort, der Rest mit 1 pro Sekunde
+    assert fake_time.now >= 60.0 - 1e-6
+
+
+def test_from_config_and_estimate():
+    limiter = RateLimiter.from_config({"openai": {"requests_per_minute": 10, "tokens_per_minute": 0}})
+    assert limiter.requests.capacity == 10 and limiter.tokens is None
+    request = {"max_tokens": 100, "messages": [{"role": "user", "content": "x" * 400}]}
+    assert estimate_tokens(request) == 200
@@ -0,0 +1,93 @@
+import os
+from types import SimpleNamespace
+
+from content_generator import _call_openai_with_retry
+from response_cache import ResponseCache
+from usage_ledger import UsageMeter
+
+REQUEST = {"model": "gpt-4o", "temperature": 0.7, "max_tokens": 100, "messages": [{"role": "user", "content": "Hallo"}]}
+
+
+def completion(text):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=2, total_tokens=3),
+    )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_hit_until_ttl_expires(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path, ttl=3600, clock=clock)
+    key = ResponseCache.key(REQUEST)
+    cache.put(key, completion("Text"))
+
+    clock.now += 3599
+    assert cache.get(key).choices[0].message.content == "Text"
+    clock.now += 2
+    assert cache.get(key) is None
+
+
+def test_no_ttl_never_expires(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path, ttl=None, clock=clock)
+    key = ResponseCache.key(REQUEST)
+    cache.put(key, completion("Text"))
+    clock.now += 10 ** 9
+    assert cache.get(key).usage.total_tokens == 3
+
+
+def test_entries_without_timestamp_are_ignored(tmp_path):
+    cache = ResponseCache(tmp_path)
+    key = ResponseCache.key(REQUEST)
+    (tmp_path / f"{key}.json").write_text('{"choices": []}', encoding="utf-8")
+    assert cache.get(key) is None
+
+
+def test_key_ignores_unrelated_fields():
+    assert ResponseCache.key(REQUEST) == ResponseCache.key(dict(REQUEST, stream=True))
+    assert ResponseCache.key(REQUEST) != ResponseCache.key(dict(REQUEST, temperature=0.2))
+
+
+def request(text):
+    return dict(REQUEST, messages=[{"role": "user", "content": text}])
+
+
+def test_eviction_drops_least_recently_used(tmp_path):
+    probe = ResponseCache(tmp_path / "probe")
+    probe.put("x", completion("Text a"))
+    size = (tmp_path / "probe" / "x.json").stat().st_size
+
+    cache = ResponseCache(tmp_path / "cache", max_bytes=int(size * 3.5))
+    keys = {name: ResponseCache.key(request(name)) for name in "abcd"}
+    for mtime, name in enumerate("abc", start=1):
+        cache.put(keys[name], completion(f"Text {name}"))
+        os.utime(tmp_path / "cache" / f"{keys[name]}.json", (mtime, mtime))
+    # Ein Treffer macht "a" zum zuletzt benutzten Eintrag
+    assert cache.get(keys["a"]) is not None
+    cache.put(keys["d"], completion("Text d"))
+
+    assert cache.get(keys["b"]) is None
+    assert all(cache.get(keys[name]) is not None for name in "acd")
+
+
+def test_cache_hit_skips_the_api_and_costs_nothing(tmp_path):
+    cache = ResponseCache(tmp_path)
+    calls = []
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(
+        create=lambda **kwargs: calls.append(kwargs) or completion("Frisch"),
+    )))
+    meter = UsageMeter({})
+    first = _call_openai_with_retry(client, cache=cache, meter=meter, **REQUEST)
+    second = _call_openai_with_retry(client, cache=cache, meter=meter, **REQUEST)
+    assert len(calls) == 1
+    assert second.choices[0].message.content == first.choices[0].message.content == "Frisch"
+    totals = meter.totals()
+    assert totals["cached_calls"] == 1 and totals["total_tokens"] == 3
@@ -0,0 +1,221 @@
+import threading
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from content_generator import _call_openai_with_retry
+from retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy, classify, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def api_error(status, headers=None, code=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status, headers=headers or {}, request=request)
+    body = {"code": code} if code else None
+    return openai.APIStatusError(f"HTTP {status}", response=response, body=body)
+
+
+def completion(text="Text"):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=text))],
+        usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2),
+    )
+
+
+class FakeClient:
+    """Wirft die vorgegebenen Fehler der Reihe nach, danach kommt eine Antwort."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else completion()
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_policy(clock, threshold=3, cooldown=10.0, max_attempts=4):
+    sleeps = []
+    policy = RetryPolicy(
+        max_attempts=max_attempts, base_delay=1.0, max_delay=8.0,
+        breaker=CircuitBreaker(threshold, cooldown, clock=clock),
+        sleep=sleeps.append, random=lambda: 0.5,
+    )
+    return policy, sleeps
+
+
+def call(client, policy):
+    return _call_openai_with_retry(client, policy=policy, model="gpt-4o", messages=[])
+
+
+# ============================================================
+# Fehler einordnen
+# ============================================================
+
+@pytest.mark.parametrize("error, expected", [
+    (api_error(500), (True, True)),
+    (api_error(503), (True, True)),
+    (api_error(429), (True, False)),
+    (api_error(429, code="insufficient_quota"), (False, False)),
+    (api_error(400), (False, False)),
+    (api_error(408), (True, False)),
+    (ConnectionError("weg"), (True, True)),
+    (ValueError("kaputt"), (False, False)),
+])
+def test_classify(error, expected):
+    assert classify(error) == expected
+
+
+def test_retry_after_seconds_and_ms():
+    assert retry_after(api_error(429, {"retry-after": "7"})) == 7.0
+    assert retry_after(api_error(429, {"retry-after-ms": "1500"})) == 1.5
+    assert retry_after(api_error(429)) is None
+
+
+# ============================================================
+# RetryPolicy
+# ============================================================
+
+def test_retries_transient_errors_with_backoff():
+    policy, sleeps = make_policy(FakeClock())
+    client = FakeClient([api_error(500), api_error(502)])
+    assert call(client, policy).choices[0].message.content == "Text"
+    assert client.calls == 3
+    # Voller Jitter mit random() = 0.5: 0.5 * 1, 0.5 * 2
+    assert sleeps == [0.5, 1.0]
+    assert policy.breaker.failures == 0
+
+
+def test_non_retryable_error_is_raised_immediately():
+    policy, sleeps = make_policy(FakeClock())
+    client = FakeClient([api_error(400)])
+    with pytest.raises(openai.APIStatusError):
+        call(client, policy)
+    assert client.calls == 1 and sleeps == []
+
+
+def test_gives_up_after_max_attempts():
+    policy, _ = make_policy(FakeClock(), threshold=10, max_attempts=3)
+    client = FakeClient([api_error(500)] * 5)
+    with pytest.raises(openai.APIStatusError):
+        call(client, policy)
+    assert client.calls == 3
+
+
+def test_retry_after_is_honoured_but_clamped():
+    policy, sleeps = make_policy(FakeClock())
+    client = FakeClient([api_error(429, {"retry-after": "3"}), api_error(429, {"retry-after": "86400"})])
+    call(client, policy)
+    assert sleeps == [3.5, 8.5]
+
+
+def test_rate_limits_do_not_open_the_breaker():
+    policy, _ = make_policy(FakeClock(), threshold=2, max_attempts=5)
+    call(FakeClient([api_error(429)] * 4), policy)
+    assert not policy.breaker.is_open()
+
+
+# ============================================================
+# CircuitBreaker
+# ============================================================
+
+def test_breaker_opens_after_threshold_and_stops_calls():
+    clock = FakeClock()
+    policy, _ = make_policy(clock, threshold=2)
+    client = FakeClient([api_error(500)] * 10)
+    with pytest.raises(CircuitOpenError):
+        call(client, policy)
+    assert client.calls == 2
+    assert policy.breaker.is_open()
+    with pytest.raises(CircuitOpenError, match="10 Sekunden"):
+        call(client, policy)
+    assert client.calls == 2
+
+
+def test_half_open_lets_exactly_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert not breaker.is_open()
+
+    breaker.check()
+    assert breaker.is_open()
+    with pytest.raises(CircuitOpenError, match="Testanfrage"):
+        breaker.check()
+
+    breaker.record_success()
+    assert not breaker.is_open()
+    breaker.check()
+
+
+def test_failed_probe_reopens_immediately():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=3, cooldown=10, clock=clock)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 10
+    breaker.check()
+    breaker.record_failure()
+    clock.now = 15
+    with pytest.raises(CircuitOpenError, match="5 Sekunden"):
+        breaker.check()
+
+
+def test_probe_ended_by_non_failure_response():
+    clock = FakeClock()
+    policy, _ = make_policy(clock, threshold=1, max_attempts=1)
+    policy.breaker.record_failure()
+    clock.now = 10
+    with pytest.raises(openai.APIStatusError):
+        call(FakeClient([api_error(400)]), policy)
+    assert not policy.breaker.is_open()
+
+
+def test_lost_probe_is_replaced_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    breaker.check()
+    # Die Probe meldet sich nie zurueck
+    clock.now = 20
+    breaker.check()
+    assert breaker.is_open()
+
+
+def test_concurrent_callers_get_a_single_probe():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    passed, blocked = [], []
+    barrier = threading.Barrier(16)
+
+    def worker():
+        barrier.wait()
+        try:
+            breaker.check()
+            passed.append(1)
+        except CircuitOpenError:
+            blocked.append(1)
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(passed) == 1 and len(blocked) == 15
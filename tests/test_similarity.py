@@ -0,0 +1,65 @@
+import pytest
+
+import main
+import similarity
+from conftest import make_article, write_article
+from similarity import SimilarityIndex, TopicGuard, minhash, topic_shingles
+
+
+@pytest.fixture(autouse=True)
+def signature_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(similarity, "SIGNATURE_CACHE", tmp_path / "minhash.json")
+
+
+def test_shingles_normalise_umlauts_stems_and_generic_words():
+    assert topic_shingles("Die besten Destillerien auf Islay", ["Whisky"]) == topic_shingles("Destillerie Islay")
+    assert topic_shingles("Über Brennereien") == topic_shingles("Ueber Brennerei")
+
+
+def test_index_finds_similar_but_not_unrelated_topics():
+    index = SimilarityIndex()
+    for key, title in enumerate(["Islay Destillerien mit dem Rad", "Speyside Wanderung im Herbst"]):
+        index.add(key, minhash(topic_shingles(title), cached=True))
+    matches = index.query(minhash(topic_shingles("Islay Destillerien per Rad")), 0.4)
+    assert [key for _, key in matches] == [0]
+    assert index.pairs(0.4) == []
+
+
+def test_topic_guard_refresh_is_incremental():
+    guard = TopicGuard(threshold=0.5)
+    guard.refresh([{"file": "a.json", "title": "Islay Destillerien mit dem Rad", "tags": ["Islay"]}])
+    assert guard.check({"title": "Islay Destillerien per Rad", "tags": ["Islay"]})[0][1] == "Islay Destillerien mit dem Rad"
+    assert guard.check({"title": "Speyside Wanderung im Herbst"}) == []
+    guard.refresh([{"file": "a.json", "title": "Anderer Titel"}])
+    assert len(guard.index) == 1
+
+
+def test_duplicate_articles_skip_missing_rows_and_reuse_signatures():
+    text = "<p>" + " ".join(f"wort{i}" for i in range(60)) + "</p>"
+    entries = [{"file": f"{name}.json", "hash": name} for name in ("a", "b", "weg")]
+    bodies = {"a.json": {"html_content": text}, "b.json": {"html_content": text + "<p>Nachsatz</p>"}}
+    loaded = []
+
+    def load(entry):
+        loaded.append(entry["file"])
+        return bodies.get(entry["file"])
+
+    pairs = similarity.duplicate_articles(entries, load)
+    assert [(a, b) for _, a, b in pairs] == [("a.json", "b.json")]
+    loaded.clear()
+    assert similarity.duplicate_articles(entries, load) == pairs
+    assert loaded == ["weg.json"]
+
+
+def test_topic_guard_follows_article_source(site_dirs, tmp_path, monkeypatch):
+    articles_dir, _ = site_dirs
+    write_article(articles_dir, make_article(1))
+    guard = main._topic_guard()
+    assert len(guard.index) == 1
+
+    other = tmp_path / "andere"
+    other.mkdir()
+    monkeypatch.setattr(main.site_builder, "ARTICLES_DIR", other)
+    assert len(main._topic_guard().index) == 0
+    main.reset_topic_guard()
+    assert main._guard is None
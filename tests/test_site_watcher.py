@@ -0,0 +1,91 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import main
+from conftest import make_article, write_article
+from preview_server import PreviewServer, _inject_live_reload
+from site_watcher import PollingWatcher, changed_paths, scan
+
+
+def test_scan_and_changed_paths(tmp_path):
+    (tmp_path / "a.json").write_text("1", encoding="utf-8")
+    (tmp_path / ".versteckt").write_text("x", encoding="utf-8")
+    single = tmp_path / "config.json"
+    old = scan([tmp_path, single, tmp_path / "fehlt.json"])
+    assert set(old) == {str(tmp_path / "a.json")}
+
+    (tmp_path / "a.json").write_text("22", encoding="utf-8")
+    (tmp_path / "b.json").write_text("3", encoding="utf-8")
+    single.write_text("{}", encoding="utf-8")
+    new = scan([tmp_path, single])
+    assert changed_paths(old, new) == {str(tmp_path / name) for name in ("a.json", "b.json", "config.json")}
+    assert changed_paths(new, {}) == set(new)
+
+
+def test_burst_of_writes_triggers_one_callback(tmp_path):
+    calls = []
+    done = threading.Event()
+
+    def callback(changed):
+        calls.append(changed)
+        done.set()
+
+    watcher = PollingWatcher([tmp_path], callback, interval=0.02, debounce=0.3).start()
+    try:
+        time.sleep(0.05)
+        # Ein Editor, der in mehreren Schritten speichert
+        for i in range(5):
+            (tmp_path / f"artikel-{i % 2}.json").write_text("x" * (i + 1), encoding="utf-8")
+            time.sleep(0.03)
+        assert done.wait(5)
+        time.sleep(0.4)
+    finally:
+        watcher.stop()
+    assert calls == [[str(tmp_path / "artikel-0.json"), str(tmp_path / "artikel-1.json")]]
+
+
+def test_callback_errors_do_not_stop_the_watcher(tmp_path, capsys):
+    calls = []
+
+    def callback(changed):
+        calls.append(changed)
+        raise RuntimeError("kaputt")
+
+    watcher = PollingWatcher([tmp_path], callback, interval=0.02, debounce=0.02).start()
+    try:
+        for i in range(2):
+            time.sleep(0.1)
+            (tmp_path / f"{i}.json").write_text("x", encoding="utf-8")
+            deadline = time.monotonic() + 5
+            while len(calls) <= i and time.monotonic() < deadline:
+                time.sleep(0.01)
+    finally:
+        watcher.stop()
+    assert len(calls) == 2
+    assert "kaputt" in capsys.readouterr().out
+
+
+def test_rebuild_on_change_builds_and_reloads(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    for i in range(3):
+        write_article(articles_dir, make_article(i))
+    reloads = []
+    httpd = SimpleNamespace(renderer=None, live_reload=True, notify_reload=lambda: reloads.append(1))
+    path = write_article(articles_dir, make_article(3))
+    main._rebuild_on_change({"config": config}, [str(path)], httpd)
+    assert (site_dir / "artikel" / "testartikel-3.html").exists()
+    assert reloads == [1]
+
+
+def test_live_reload_script_and_notification(tmp_path):
+    html = _inject_live_reload(b"<html><body><p>Hallo</p></body></html>")
+    assert b"/__livereload" in html and html.endswith(b"</body></html>")
+
+    httpd = PreviewServer(tmp_path, host="127.0.0.1", port=0, live_reload=True)
+    try:
+        assert httpd.wait_for_reload(0, 0.01) == (0, False)
+        threading.Timer(0.05, httpd.notify_reload).start()
+        assert httpd.wait_for_reload(0, 5) == (1, True)
+    finally:
+        httpd.server_close()
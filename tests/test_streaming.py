@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import pytest
+
+import content_generator
+from content_generator import MAX_CONTINUATIONS, _stream_with_checkpoint
+from retry_policy import CircuitBreaker, RetryPolicy
+
+TOPIC = {"title": "Streaming-Test", "category": "Whisky"}
+
+
+def chunk(text, finish_reason=None):
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=text), finish_reason=finish_reason)],
+        usage=None,
+    )
+
+
+def usage_chunk():
+    return SimpleNamespace(choices=[], usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15))
+
+
+class FakeStreamClient:
+    """Jeder Aufruf liefert die naechste Antwort: Liste von Chunks oder ein Fehler."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return iter(response)
+
+
+@pytest.fixture(autouse=True)
+def partial_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_generator, "PARTIAL_DIR", tmp_path / ".partial")
+
+
+def policy():
+    return RetryPolicy(max_attempts=2, breaker=CircuitBreaker(), sleep=lambda _: None, random=lambda: 0.0)
+
+
+def stream(client):
+    return _stream_with_checkpoint(client, TOPIC, policy=policy(), model="gpt-4o", max_tokens=4000, messages=[])
+
+
+def test_continuations_do_not_use_up_retries():
+    # Mehr Fortsetzungen als Versuche - trotzdem kein Abbruch
+    parts = [[chunk(f"Teil {i} "), chunk("", "length"), usage_chunk()] for i in range(3)]
+    client = FakeStreamClient(parts + [[chunk("Ende", "stop"), usage_chunk()]])
+    response = stream(client)
+    assert response.choices[0].message.content == "Teil 0 Teil 1 Teil 2 Ende"
+    assert response.usage.total_tokens == 60
+    assert client.requests[-1]["messages"][-2]["content"] == "Teil 0 Teil 1 Teil 2 "
+
+
+def test_errors_and_continuations_are_counted_separately():
+    client = FakeStreamClient([
+        [chunk("A"), chunk("", "length")],
+        ConnectionError("weg"),
+        [chunk("B"), chunk("", "length")],
+        [chunk("C", "stop")],
+    ])
+    assert stream(client).choices[0].message.content == "ABC"
+
+
+def test_continuations_are_bounded_and_checkpoint_is_kept():
+    client = FakeStreamClient([[chunk("x"), chunk("", "length")]] * (MAX_CONTINUATIONS + 1))
+    with pytest.raises(Exception, match="Fortsetzungen"):
+        stream(client)
+    assert content_generator.partial_topics() == [TOPIC]
@@ -0,0 +1,34 @@
+import hashlib
+import json
+
+import site_builder
+from conftest import PROJECT_DIR, make_article, write_article
+
+
+def test_stylesheet_name_follows_content(monkeypatch):
+    path = site_builder._stylesheet_path()
+    digest = hashlib.sha256(site_builder.STYLESHEET.encode("utf-8")).hexdigest()[:10]
+    assert path == f"assets/site.{digest}.css"
+    monkeypatch.setattr(site_builder, "STYLESHEET", site_builder.STYLESHEET + "a{}")
+    assert site_builder._stylesheet_path() != path
+
+
+def test_pages_link_the_hashed_stylesheet_instead_of_inlining_it(site_dirs, config):
+    articles_dir, site_dir = site_dirs
+    write_article(articles_dir, make_article(0))
+    site_builder.build_site(config)
+
+    stylesheet = site_dir / site_builder._stylesheet_path()
+    assert stylesheet.read_text(encoding="utf-8") == site_builder.STYLESHEET
+    for page in [site_dir / "index.html", site_dir / "artikel" / "testartikel-0.html"]:
+        html = page.read_text(encoding="utf-8")
+        assert f'href="/{site_builder._stylesheet_path()}"' in html
+        assert "<style>" not in html
+    assert "immutable" in (site_dir / "_headers").read_text(encoding="utf-8")
+
+
+def test_vercel_caches_only_assets_immutably():
+    with open(PROJECT_DIR / "vercel.json", "r", encoding="utf-8") as f:
+        rules = {rule["source"]: rule["headers"][0]["value"] for rule in json.load(f)["headers"]}
+    assert "immutable" in rules["/assets/(.*)"]
+    assert "must-revalidate" in rules["/(.*)"]
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from topic_ledger import TopicLedger, TopicPicker
+
+TOPICS = (
+    [{"title": f"Whisky {i}", "category": "Whisky"} for i in range(3)]
+    + [{"title": f"Reise {i}", "category": "Reise"} for i in range(4)]
+)
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return TopicLedger(tmp_path / "used_topics.jsonl", tmp_path / "used_topics.json")
+
+
+def free_titles(picker, category):
+    return set(picker.available[category])
+
+
+def test_pick_marks_topics_until_category_is_exhausted(ledger):
+    picker = TopicPicker(TOPICS, ledger)
+    seen = set()
+    for _ in range(len(TOPICS)):
+        topic = picker.pick()
+        assert topic["title"] not in seen
+        seen.add(topic["title"])
+        picker.mark_used(topic["title"])
+    assert seen == {topic["title"] for topic in TOPICS}
+
+
+def test_duplicate_entry_does_not_start_new_cycle(ledger):
+    picker = TopicPicker(TOPICS, ledger)
+    picker.mark_used("Whisky 0")
+    picker.mark_used("Whisky 1")
+    # Ein Wiederanlauf protokolliert denselben Titel erneut
+    picker.mark_used("Whisky 0")
+    assert free_titles(picker, "Whisky") == {"Whisky 2"}
+    assert free_titles(picker, "Reise") == {f"Reise {i}" for i in range(4)}
+
+
+def test_new_cycle_starts_only_when_all_topics_are_used(ledger):
+    picker = TopicPicker(TOPICS, ledger)
+    for i in range(3):
+        picker.mark_used(f"Whisky {i}")
+    # Whisky ist leer, Reise nicht: ein erneuter Whisky-Titel ist ein Duplikat
+    picker.mark_used("Whisky 1")
+    assert free_titles(picker, "Whisky") == set()
+    for i in range(4):
+        picker.mark_used(f"Reise {i}")
+    picker.mark_used("Whisky 1")
+    assert free_titles(picker, "Whisky") == {"Whisky 0", "Whisky 2"}
+    assert free_titles(picker, "Reise") == {f"Reise {i}" for i in range(4)}
+
+
+def test_pick_starts_new_cycle_when_exhausted(ledger, capsys):
+    picker = TopicPicker(TOPICS, ledger)
+    for topic in TOPICS:
+        picker.mark_used(topic["title"])
+    topic = picker.pick()
+    picker.mark_used(topic["title"])
+    assert "Starte von vorne" in capsys.readouterr().out
+    assert sum(len(titles) for titles in picker.available.values()) == len(TOPICS) - 1
+
+
+def test_replay_matches_live_state(ledger, tmp_path):
+    picker = TopicPicker(TOPICS, ledger)
+    for title in ["Whisky 0", "Whisky 1", "Whisky 0", "Whisky 2", "Whisky 1", "Reise 3"]:
+        picker.mark_used(title)
+    replayed = TopicPicker(TOPICS, TopicLedger(ledger.path, tmp_path / "used_topics.json"))
+    for category in ("Whisky", "Reise"):
+        assert free_titles(replayed, category) == free_titles(picker, category)
+
+
+def test_pick_respects_excluded_and_other_processes(ledger, tmp_path):
+    picker = TopicPicker(TOPICS, ledger)
+    other = TopicLedger(ledger.path, tmp_path / "used_topics.json")
+    for i in range(3):
+        other.append(f"Reise {i}", "Reise")
+    excluded = {"Whisky 0", "Whisky 1", "Reise 3"}
+    assert picker.pick(excluded)["title"] == "Whisky 2"
+    assert picker.is_used("Reise 2")
+
+
+def test_legacy_list_is_migrated(tmp_path):
+    legacy = tmp_path / "used_topics.json"
+    legacy.write_text(json.dumps([{"title": "Reise 1", "category": "Reise"}]), encoding="utf-8")
+    picker = TopicPicker(TOPICS, TopicLedger(tmp_path / "used_topics.jsonl", legacy))
+    assert picker.is_used("Reise 1")
+    assert "Reise 1" not in free_titles(picker, "Reise")
+
+
+def test_pick_returns_none_when_every_free_topic_is_excluded(ledger):
+    picker = TopicPicker(TOPICS, ledger)
+    picker.mark_used("Whisky 0")
+    excluded = {topic["title"] for topic in TOPICS} - {"Whisky 0"}
+    assert picker.pick(excluded) is None
+    # Kein neuer Durchgang, solange noch Themen frei (nur vergeben) sind
+    assert "Whisky 0" not in free_titles(picker, "Whisky")
+
+
+def test_reserve_never_hands_out_a_topic_twice(ledger, tmp_path, monkeypatch):
+    import content_generator
+    import main
+
+    monkeypatch.setattr(content_generator, "PARTIAL_DIR", tmp_path / ".partial")
+    monkeypatch.setattr(main, "_picker", TopicPicker(TOPICS, ledger))
+    monkeypatch.setattr(main, "_reserved_topics", {})
+    monkeypatch.setattr(main, "_busy_topics", lambda: ())
+    config = {"content_settings": {"similar_topics": "allow"}}
+
+    topics = main.reserve_topics(config, len(TOPICS) + 3)
+    titles = [topic["title"] for topic in topics]
+    assert sorted(titles) == sorted(topic["title"] for topic in TOPICS)
+    assert main.reserve_next_topic(config) is None
+    main.release_topic("Reise 2")
+    assert main.reserve_next_topic(config)["title"] == "Reise 2"
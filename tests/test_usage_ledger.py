@@ -0,0 +1,66 @@
+from types import SimpleNamespace
+
+import pytest
+
+import usage_ledger
+from usage_ledger import TokenBudget, UsageMeter, read_ledger, record_usage, summarize
+
+
+def response(prompt, completion):
+    return SimpleNamespace(usage=SimpleNamespace(prompt_tokens=prompt, completion_tokens=completion))
+
+
+def totals(tokens, cost=0.0):
+    return {"total_tokens": tokens, "cost_usd": cost}
+
+
+def test_meter_prices_known_and_dated_models():
+    meter = UsageMeter({})
+    meter.add(response(1_000_000, 100_000), "gpt-4o-2024-08-06")
+    meter.add(response(5, 5), "gpt-4o", cached=True)
+    result = meter.totals()
+    assert result["calls"] == 2 and result["cached_calls"] == 1
+    assert result["total_tokens"] == 1_100_000
+    assert result["cost_usd"] == pytest.approx(2.50 + 1.00)
+
+
+def test_unknown_model_has_no_cost_unless_configured():
+    meter = UsageMeter({})
+    meter.add(response(10, 10), "eigenes-modell")
+    assert meter.totals()["cost_usd"] is None
+    meter = UsageMeter({"openai": {"prices": {"eigenes-modell": [1.0, 2.0]}}})
+    meter.add(response(1_000_000, 1_000_000), "eigenes-modell")
+    assert meter.totals()["cost_usd"] == pytest.approx(3.0)
+
+
+def test_budget_reserves_estimate_and_settles_actual_usage():
+    budget = TokenBudget(max_run=10_000, initial_estimate=4_000)
+    first, second = budget.reserve(), budget.reserve()
+    assert first == second == 4_000
+    # 8000 reserviert: ein drittes Thema passt nicht mehr
+    assert budget.reserve() is None and "Laufbudget" in budget.reason
+
+    budget.settle(first, totals(2_000, 0.02))
+    budget.settle(second, totals(2_000, 0.02))
+    assert budget.reserved == 0 and budget.spent == 4_000
+    assert budget.cost_usd == pytest.approx(0.04)
+    # Ab jetzt zaehlt der Schnitt der fertigen Artikel (2000)
+    assert budget.reserve() == 2_000
+
+
+def test_failed_articles_do_not_lower_the_estimate():
+    budget = TokenBudget(max_run=None, initial_estimate=3_000)
+    budget.settle(budget.reserve(), totals(0))
+    assert budget.finished == 0 and budget.reserve() == 3_000
+
+
+def test_daily_budget_counts_the_ledger(usage_ledger_file):
+    record_usage("article", "Heute", {"total_tokens": 9_000, "cost_usd": 0.1}, "gpt-4o")
+    assert summarize(read_ledger())[0] == 9_000
+    config = {"openai": {"daily_token_budget": 12_000, "max_tokens": 1_000}}
+    budget = TokenBudget.from_config(config)
+    assert budget.spent_today == 9_000
+    # Schaetzung 1500 + 1000 + 500 = 3000 passt genau, ein zweites Thema nicht
+    assert budget.reserve() == 3_000
+    assert budget.reserve() is None and "Tagesbudget" in budget.reason
+    assert usage_ledger.LEDGER_FILE == usage_ledger_file
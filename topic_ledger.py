@@ -0,0 +1,248 @@
+"""
+Verwendete Themen als Anhaenge-Protokoll (used_topics.jsonl, eine Zeile pro
+Artikel) plus ein Themen-Picker mit konstanter Laufzeit.
+
+Statt bei jedem Artikel die ganze Liste neu zu lesen und zu schreiben, wird
+eine Zeile per atomarem Anhaengen (unter Datei-Sperre) geschrieben. Der
+Picker haelt pro Kategorie die noch freien Themen in einer Menge mit
+O(1)-Zufallsauswahl und liest von anderen Prozessen angehaengte Zeilen
+inkrementell nach.
+
+Eine alte used_topics.json wird beim ersten Laden uebernommen.
+"""
+
+import json
+import os
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+from file_lock import file_lock
+
+PROJECT_DIR = Path(__file__).parent
+LEDGER_FILE = PROJECT_DIR / "used_topics.jsonl"
+LEGACY_FILE = PROJECT_DIR / "used_topics.json"
+
+RECENT_COUNT = 5
+
+
+class _IndexedSet:
+    """Menge mit O(1) fuer add, discard und random.choice."""
+
+    def __init__(self, items=()):
+        self._items = []
+        self._positions = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self._positions:
+            self._positions[item] = len(self._items)
+            self._items.append(item)
+
+    def discard(self, item):
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._positions[last] = position
+
+    def choice(self, rng=random):
+        return self._items[rng.randrange(len(self._items))]
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(list(self._items))
+
+
+class TopicLedger:
+    """
+    Liest und schreibt used_topics.jsonl. Merkt sich die gelesene Position,
+    refresh() verarbeitet nur neu angehaengte Zeilen (auch aus anderen Prozessen).
+    """
+
+    def __init__(self, path=None, legacy_path=None):
+        self.path = Path(path or LEDGER_FILE)
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self.legacy_path = Path(legacy_path or LEGACY_FILE)
+        self._offset = 0
+        self._listeners = []
+        self._migrate()
+
+    def _migrate(self):
+        """Uebernimmt used_topics.json einmalig in das Protokoll."""
+        if self.path.exists() or not self.legacy_path.exists():
+            return
+        with file_lock(self.lock_path):
+            if self.path.exists():
+                return
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(tmp, self.path)
+
+    def subscribe(self, listener):
+        """listener(entry) wird fuer jede (auch spaeter nachgelesene) Zeile aufgerufen."""
+        self._listeners.append(listener)
+
+    def refresh(self):
+        """Liest die seit dem letzten Aufruf angehaengten Zeilen."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Nur vollstaendige Zeilen - eine gerade geschriebene kommt beim naechsten Mal
+        end = data.rfind(b"\n") + 1
+        self._offset += end
+        for line in data[:end].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            for listener in self._listeners:
+                listener(entry)
+
+    def append(self, title, category=None):
+        """Haengt einen verwendeten Titel atomar an (eine Zeile, ein write)."""
+        entry = {"title": title, "date": datetime.now().isoformat(), "category": category}
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+        with file_lock(self.lock_path):
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        return entry
+
+    def entries(self):
+        """Alle Eintraege (fuer Statistiken)."""
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+
+class TopicPicker:
+    """
+    Freie Themen je Kategorie. Ein Thema ist frei, bis es im laufenden
+    Durchgang verwendet wurde; erst wenn alle Themen verwendet sind,
+    beginnt ein neuer Durchgang. Ein doppelt protokollierter Titel (z.B.
+    nach einem Wiederanlauf) aendert vorher nichts. Die Auswahl meidet die
+    Kategorien der letzten Artikel und ist - bis auf die Zahl der
+    Kategorien - unabhaengig von der Groesse der Bibliothek und der Historie.
+    """
+
+    def __init__(self, topics, ledger):
+        self.topics = {topic["title"]: topic for topic in topics}
+        self.ledger = ledger
+        self.used = set()
+        self.recent = deque(maxlen=RECENT_COUNT)
+        self._lock = threading.RLock()
+        self._reset_cycle()
+        ledger.subscribe(self._apply)
+        ledger.refresh()
+
+    def _reset_cycle(self):
+        self.available = {}
+        for title, topic in self.topics.items():
+            self.available.setdefault(topic.get("category", ""), _IndexedSet()).add(title)
+
+    def _exhausted(self):
+        return not any(len(titles) for titles in self.available.values())
+
+    def _category(self, entry):
+        topic = self.topics.get(entry["title"])
+        return topic.get("category", "") if topic else entry.get("category") or ""
+
+    def _apply(self, entry):
+        title = entry["title"]
+        with self._lock:
+            self.used.add(title)
+            self.recent.append(self._category(entry))
+            topic = self.topics.get(title)
+            if topic is None:
+                return
+            if title not in self.available[topic.get("category", "")]:
+                if not self._exhausted():
+                    # Im laufenden Durchgang schon verwendet - doppelter Eintrag
+                    return
+                # Alle Themen verwendet: hier begann (wie in pick()) ein neuer Durchgang
+                self._reset_cycle()
+            self.available[topic.get("category", "")].discard(title)
+
+    def is_used(self, title):
+        with self._lock:
+            self.ledger.refresh()
+            return title in self.used
+
+    def mark_used(self, title):
+        topic = self.topics.get(title)
+        with self._lock:
+            self.ledger.append(title, topic.get("category") if topic else None)
+            self.ledger.refresh()
+
+    def pick(self, excluded=(), extra_recent=()):
+        """
+        Waehlt ein freies Thema, das nicht in `excluded` (reserviert, in
+        Batch oder Queue) ist. Kategorien der letzten Artikel und
+        `extra_recent` werden gemieden, solange es Alternativen gibt.
+        Sind alle freien Themen ausgeschlossen, kommt None zurueck.
+        """
+        with self._lock:
+            self.ledger.refresh()
+            topic = self._pick(excluded, extra_recent)
+            if topic is None and self._exhausted():
+                print("  HINWEIS: Alle Themen verwendet! Starte von vorne...")
+                self._reset_cycle()
+                topic = self._pick(excluded, extra_recent)
+            # None: alles Freie ist reserviert oder in Arbeit - nie doppelt vergeben
+            return topic
+
+    def _pick(self, excluded, extra_recent):
+        recent = set(self.recent) | set(extra_recent)
+        candidates = [(cat, titles) for cat, titles in self.available.items() if len(titles)]
+        total = sum(len(titles) for _, titles in candidates)
+        # Abwechslung bei Kategorien (wie bisher erst ab mehr als 5 freien Themen)
+        if total > RECENT_COUNT:
+            preferred = [(cat, titles) for cat, titles in candidates if cat not in recent]
+            topic = self._pick_from(preferred, excluded)
+            if topic is not None:
+                return topic
+        return self._pick_from(candidates, excluded)
+
+    def _pick_from(self, candidates, excluded):
+        """Zufaellig, gewichtet nach Zahl der freien Themen je Kategorie."""
+        candidates = list(candidates)
+        while candidates:
+            weights = [len(titles) for _, titles in candidates]
+            index = random.choices(range(len(candidates)), weights=weights)[0]
+            titles = candidates[index][1]
+            # Ein paar Zufallsgriffe; sind fast alle ausgeschlossen, wird gefiltert
+            for _ in range(8):
+                title = titles.choice()
+                if title not in excluded:
+                    return self.topics[title]
+            free = [title for title in titles if title not in excluded]
+            if free:
+                return self.topics[random.choice(free)]
+            candidates.pop(index)
+        return None
@@ -0,0 +1,211 @@
+"""
+Token- und Kostenabrechnung: Jeder API-Aufruf meldet seinen `usage`-Block an
+einen UsageMeter, die Summe landet im Artikel ("usage") und als Zeile im
+laufenden Protokoll usage_ledger.jsonl. Ein TokenBudget prueft vor jedem
+neuen Thema, ob Lauf- und Tagesbudget noch reichen.
+"""
+
+import json
+import threading
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+LEDGER_FILE = PROJECT_DIR / "usage_ledger.jsonl"
+
+# USD pro 1 Mio. Tokens (Eingabe, Ausgabe); in config.json unter openai.prices anpassbar
+PRICES = {
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+}
+
+# Die Batch API berechnet die Haelfte des normalen Preises
+BATCH_PRICE_FACTOR = 0.5
+
+_ledger_lock = threading.Lock()
+
+
+def usage_of(response):
+    """Der usage-Block einer Completion als Dict (oder None, wenn keiner da ist)."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    if not isinstance(usage, dict):
+        usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+    return {
+        "prompt_tokens": usage.get("prompt_tokens") or 0,
+        "completion_tokens": usage.get("completion_tokens") or 0,
+    }
+
+
+def _price(model, config):
+    prices = dict(PRICES)
+    prices.update({name: tuple(p) for name, p in config.get("openai", {}).get("prices", {}).items()})
+    if model in prices:
+        return prices[model]
+    # Datierte Modellnamen (gpt-4o-2024-08-06) zum Basismodell
+    for name in sorted(prices, key=len, reverse=True):
+        if model and model.startswith(name):
+            return prices[name]
+    return None
+
+
+class UsageMeter:
+    """
+    Summiert die Aufrufe eines Artikels (thread-sicher: Meta laeuft parallel).
+    price_factor skaliert die Listenpreise (BATCH_PRICE_FACTOR fuer Batches).
+    """
+
+    def __init__(self, config, price_factor=1.0):
+        self.config = config
+        self.price_factor = price_factor
+        self.calls = 0
+        self.cached_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.unpriced = False
+        self._lock = threading.Lock()
+
+    def add(self, response, model, cached=False):
+        """Verbucht eine Antwort. Antworten aus dem Cache kosten nichts."""
+        self.add_usage(None if cached else usage_of(response), model, cached=cached)
+
+    def add_usage(self, usage, model, cached=False):
+        """Verbucht einen usage-Block direkt (z.B. einer abgebrochenen Hedge-Anfrage)."""
+        with self._lock:
+            self.calls += 1
+            if cached:
+                self.cached_calls += 1
+                return
+            if usage is None:
+                return
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+            price = _price(model, self.config)
+            if price is None:
+                self.unpriced = True
+            else:
+                cost = (usage["prompt_tokens"] * price[0] + usage["completion_tokens"] * price[1]) / 1e6
+                self.cost_usd += cost * self.price_factor
+
+    @property
+    def total_tokens(self):
+        return self.prompt_tokens + self.completion_tokens
+
+    def totals(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "cached_calls": self.cached_calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.total_tokens,
+                "cost_usd": None if self.unpriced else round(self.cost_usd, 6),
+            }
+
+
+# ============================================================
+# Protokoll
+# ============================================================
+
+def record_usage(kind, title, totals, model=None):
+    """Haengt eine Zeile an usage_ledger.jsonl an."""
+    entry = {"time": datetime.now().isoformat(timespec="seconds"), "kind": kind, "title": title, "model": model}
+    entry.update(totals)
+    line = json.dumps(entry, ensure_ascii=False) + "\n"
+    with _ledger_lock:
+        with open(LEDGER_FILE, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def read_ledger():
+    """Alle Eintraege des Protokolls (kaputte Zeilen werden uebersprungen)."""
+    if not LEDGER_FILE.exists():
+        return []
+    entries = []
+    with open(LEDGER_FILE, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def summarize(entries, day=None):
+    """(Tokens, Kosten in USD) ueber die Eintraege - optional nur eines Tages (YYYY-MM-DD)."""
+    tokens, cost = 0, 0.0
+    for entry in entries:
+        if day is not None and not entry.get("time", "").startswith(day):
+            continue
+        tokens += entry.get("total_tokens") or 0
+        cost += entry.get("cost_usd") or 0.0
+    return tokens, cost
+
+
+# ============================================================
+# Budget
+# ============================================================
+
+class TokenBudget:
+    """
+    Laufbudget (max_tokens_per_run) und Tagesbudget (daily_token_budget).
+    Vor jedem Thema wird die erwartete Menge reserviert: der Schnitt der
+    bisherigen Artikel, anfangs eine Schaetzung aus max_tokens. Reicht das
+    Budget nicht mehr, startet kein neues Thema - laufende duerfen fertig werden.
+    """
+
+    def __init__(self, max_run=None, daily=None, spent_today=0, initial_estimate=6000):
+        self.max_run = max_run
+        self.daily = daily
+        self.spent_today = spent_today
+        self.initial_estimate = initial_estimate
+        self.spent = 0
+        self.cost_usd = 0.0
+        self.reserved = 0
+        self.finished = 0
+        self.reason = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        openai_cfg = config.get("openai", {})
+        daily = openai_cfg.get("daily_token_budget")
+        spent_today = summarize(read_ledger(), datetime.now().strftime("%Y-%m-%d"))[0] if daily else 0
+        # Prompt (ca. 1500) + Artikel (max_tokens) + Meta-Daten (500)
+        initial = 1500 + openai_cfg.get("max_tokens", 4000) + 500
+        return cls(openai_cfg.get("max_tokens_per_run"), daily, spent_today, initial)
+
+    def _estimate(self):
+        if self.finished:
+            return max(1, self.spent // self.finished)
+        return self.initial_estimate
+
+    def reserve(self):
+        """
+        Reserviert Tokens fuer das naechste Thema und gibt die Menge zurueck -
+        oder None mit Begruendung in self.reason, wenn das Budget nicht reicht.
+        """
+        with self._lock:
+            estimate = self._estimate()
+            committed = self.spent + self.reserved + estimate
+            if self.max_run is not None and committed > self.max_run:
+                self.reason = f"Laufbudget {self.max_run} Tokens erreicht ({self.spent} verbraucht)"
+                return None
+            if self.daily is not None and self.spent_today + committed > self.daily:
+                self.reason = f"Tagesbudget {self.daily} Tokens erreicht ({self.spent_today + self.spent} verbraucht)"
+                return None
+            self.reserved += estimate
+            return estimate
+
+    def settle(self, estimate, totals):
+        """Ersetzt die Reservierung durch den tatsaechlichen Verbrauch."""
+        with self._lock:
+            self.reserved -= estimate
+            self.spent += totals["total_tokens"]
+            self.cost_usd += totals["cost_usd"] or 0.0
+            if totals["total_tokens"]:
+                self.finished += 1